@@ -1,9 +1,9 @@
-import logging
 from flask import Flask, jsonify
 from flask_swagger_ui import get_swaggerui_blueprint
 
 from .config import load_config
 from .routes import register_routes
+from .cli import register_commands
 from .utils.errors import (
     BaseError,
     NotFoundError,
@@ -14,6 +14,12 @@ from .utils.errors import (
     UnprocessableEntityError,
 )
 from .utils.api_responses import error_response
+from .utils.logging_config import init_logging
+from .utils.metrics import init_metrics
+from .utils.profiling import init_profiling
+from .utils.query_watch import init_query_watch
+from .utils.request_stats import init_request_stats
+from .utils.tracing import init_tracing
 from .extensions import db, migrate
 
 
@@ -23,6 +29,7 @@ def create_app(env_name=None):
     - Loads configuration from environment
     - Initializes Flask extensions
     - Registers blueprints
+    - Registers CLI commands
     """
     app = Flask(__name__)
     config_obj = load_config(env_name)
@@ -32,14 +39,17 @@ def create_app(env_name=None):
     db.init_app(app)
     migrate.init_app(app, db)
 
-    # Configure global logging
-    logging.basicConfig(
-        level=app.config["LOG_LEVEL"].upper(),
-        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
-    )
+    # Configure global logging (JSON through a background queue listener)
+    init_logging(app)
 
     # Register all routes
     register_routes(app)
+    register_commands(app)
+    init_request_stats(app)
+    init_metrics(app)
+    init_query_watch(app)
+    init_tracing(app)
+    init_profiling(app)
 
     SWAGGER_URL = "/api/docs"
     API_URL = "/static/openapi.yaml"
@@ -54,7 +64,11 @@ def create_app(env_name=None):
         Catch any custom BaseError and return a standard error response.
         """
         app.logger.error(
-            f"BaseError: {error.message} (type={error.errorType}, http={error.httpCode})"
+            "BaseError: %s (type=%s, http=%s)",
+            error.message,
+            error.errorType,
+            error.httpCode,
+            extra={"error_type": error.errorType, "status": error.httpCode},
         )
         resp = error_response(
             error=error.message,
@@ -0,0 +1,344 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.models import db
+from app.services.bulk_export_service import HubSpotBulkExportService
+from app.services.import_service import HubSpotImportService
+from app.services.partition_service import CRMObjectPartitionService
+from app.services.reconcile_service import CRMReconcileService
+from app.services.sync_service import HubSpotSyncService
+from app.services.webhook_service import WebhookService
+from app.utils.constants import (
+    BULK_EXPORT_FORMATS,
+    CRM_OBJECT_TYPES,
+    HUBSPOT_BATCH_LIMIT,
+    IMPORT_FORMATS,
+    RECONCILE_ACTIONS,
+)
+
+hubspot_cli = AppGroup("hubspot", help="HubSpot CRM integration maintenance jobs.")
+
+
+@hubspot_cli.command("create-partitions")
+@click.option(
+    "--months-ahead",
+    type=int,
+    default=None,
+    help="Months past the current one to pre-create (default: config).",
+)
+def create_partitions(months_ahead):
+    """
+    Pre-create monthly partitions of created_crm_objects.
+    """
+    created = CRMObjectPartitionService().ensure_partitions(months_ahead)
+    click.echo(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+
+
+@hubspot_cli.command("retention")
+@click.option(
+    "--older-than-months",
+    type=int,
+    default=None,
+    help="Archive partitions that ended before this many months ago (default: config).",
+)
+@click.option(
+    "--archive-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Where compressed partition archives are written (default: config).",
+)
+@click.option(
+    "--detach-only",
+    is_flag=True,
+    help="Detach expired partitions but keep them as standalone tables.",
+)
+@click.option("--dry-run", is_flag=True, help="List expired partitions only.")
+def retention(older_than_months, archive_dir, detach_only, dry_run):
+    """
+    Archive or detach expired created_crm_objects partitions, then make sure
+    upcoming months have partitions.
+    """
+    service = CRMObjectPartitionService()
+    results = service.apply_retention(
+        older_than_months=older_than_months,
+        archive_dir=archive_dir,
+        detach_only=detach_only,
+        dry_run=dry_run,
+    )
+    for result in results:
+        if result.get("dry_run"):
+            click.echo(f"Would archive {result['partition']}")
+        elif "archive" in result:
+            click.echo(
+                f"Archived {result['partition']} ({result['rows']} rows) "
+                f"to {result['archive']}"
+            )
+        else:
+            click.echo(f"Detached {result['partition']} ({result['rows']} rows)")
+    if not results:
+        click.echo("No expired partitions.")
+
+    if not dry_run:
+        created = service.ensure_partitions()
+        if created:
+            click.echo(f"Created partition(s): {', '.join(created)}")
+
+
+@hubspot_cli.command("sync")
+@click.option(
+    "--object-type",
+    "object_types",
+    type=click.Choice(CRM_OBJECT_TYPES),
+    multiple=True,
+    help="Object type(s) to sync (default: all).",
+)
+@click.option(
+    "--full", is_flag=True, help="Ignore the high-water mark and resync everything."
+)
+def sync(object_types, full):
+    """
+    Incrementally mirror HubSpot contacts, deals and tickets into the local DB.
+    """
+    results = HubSpotSyncService().sync_all(object_types or None, full=full)
+    for object_type, stats in results.items():
+        click.echo(
+            f"{object_type}: {stats['fetched']} fetched in {stats['pages']} page(s), "
+            f"high-water mark {stats['high_water_mark']}"
+        )
+
+
+@hubspot_cli.command("process-webhooks")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Events claimed per transaction (default: config).",
+)
+@click.option(
+    "--loop", is_flag=True, help="Keep running, polling the queue for new events."
+)
+@click.option(
+    "--interval",
+    type=float,
+    default=5.0,
+    show_default=True,
+    help="Seconds to sleep between polls when the queue is empty (with --loop).",
+)
+def process_webhooks(batch_size, loop, interval):
+    """
+    Apply queued HubSpot webhook events to the local tables. Several
+    processes can run side by side; each claims different events. With
+    --loop, a failed batch stays queued and is retried after --interval.
+    """
+    service = WebhookService()
+    while True:
+        try:
+            stats = service.process_all(batch_size)
+        except Exception as e:
+            if not loop:
+                raise
+            # The failed batch was rolled back and is still queued.
+            db.session.rollback()
+            current_app.logger.warning(
+                "Webhook processing failed, retrying in %ss: %s", interval, e
+            )
+            time.sleep(interval)
+            continue
+        if stats.get("events"):
+            click.echo(
+                f"Processed {stats['events']} event(s): {stats['fetched']} fetched, "
+                f"{stats['archived']} archived, {stats['renamed']} renamed"
+            )
+        if not loop:
+            if not stats.get("events"):
+                click.echo("No pending webhook events.")
+            break
+        time.sleep(interval)
+
+
+@hubspot_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--object-type",
+    type=click.Choice(CRM_OBJECT_TYPES),
+    required=True,
+    help="What each row describes.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(IMPORT_FORMATS),
+    default=None,
+    help="Input format (default: from the file extension, .ndjson/.jsonl or CSV).",
+)
+@click.option(
+    "--concurrency",
+    type=int,
+    default=None,
+    help="Chunks sent to HubSpot at once (default: config).",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(1, HUBSPOT_BATCH_LIMIT),
+    default=HUBSPOT_BATCH_LIMIT,
+    show_default=True,
+    help="Valid rows per batch call.",
+)
+@click.option(
+    "--results",
+    "results_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Per-row result CSV (default: <path>.results.csv).",
+)
+@click.option(
+    "--restart", is_flag=True, help="Ignore the saved checkpoint and start over."
+)
+def import_file(path, object_type, fmt, concurrency, chunk_size, results_path, restart):
+    """
+    Stream a CSV or NDJSON file of contacts, deals or tickets into HubSpot
+    through the batch endpoints. Rerunning after a crash resumes from the
+    last checkpoint.
+
+    Resuming is at-least-once: chunks sent but not yet checkpointed are sent
+    again. Contacts are upserted on email; deals and tickets from those
+    chunks may be created twice.
+    """
+    service = HubSpotImportService(concurrency=concurrency, chunk_size=chunk_size)
+    stats = service.run(
+        path, object_type, fmt=fmt, results_path=results_path, restart=restart
+    )
+    click.echo(
+        f"Imported {stats['rows']} row(s): {stats['succeeded']} succeeded, "
+        f"{stats['failed']} failed, {stats['invalid']} invalid. "
+        f"Results in {stats['results']}"
+    )
+
+
+@hubspot_cli.command("export")
+@click.option("--object-type", type=click.Choice(CRM_OBJECT_TYPES), required=True)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    required=True,
+    help="Directory for the part files and _manifest.json; reuse it to resume.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(BULK_EXPORT_FORMATS),
+    default="ndjson",
+    show_default=True,
+    help="parquet requires pyarrow.",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    default=None,
+    help="Earliest createdate, UTC (default: the oldest object).",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(),
+    default=None,
+    help="End of range, UTC (default: now).",
+)
+@click.option(
+    "--slices",
+    type=click.IntRange(min=1),
+    default=None,
+    help="createdate ranges to start from (default: twice the concurrency).",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Ranges paged at once (default: config).",
+)
+@click.option(
+    "--property",
+    "properties",
+    multiple=True,
+    help="Property to export (repeatable; default: the mirrored properties).",
+)
+def export(object_type, output_dir, fmt, since, until, slices, concurrency, properties):
+    """
+    Export all HubSpot objects of a type to NDJSON or Parquet part files,
+    paging createdate ranges in parallel. Rerun with the same --output-dir
+    to resume after an interruption.
+    """
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise click.UsageError("--format parquet requires pyarrow to be installed.")
+    stats = HubSpotBulkExportService(concurrency=concurrency).run(
+        object_type,
+        output_dir,
+        fmt=fmt,
+        since=since,
+        until=until,
+        slices=slices,
+        properties=list(properties) or None,
+    )
+    click.echo(
+        f"Exported {stats['rows']} {object_type} in {stats['ranges']} range(s) "
+        f"to {output_dir}"
+    )
+
+
+@hubspot_cli.command("reconcile")
+@click.option(
+    "--object-type",
+    "object_types",
+    type=click.Choice(CRM_OBJECT_TYPES),
+    multiple=True,
+    help="Object type(s) to check (default: all).",
+)
+@click.option(
+    "--action",
+    type=click.Choice(RECONCILE_ACTIONS),
+    default="report",
+    show_default=True,
+    help="report only, mark stale rows, repair renames/merges, or remove deleted rows.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Batch reads in flight (default: config).",
+)
+def reconcile(object_types, action, concurrency):
+    """
+    Check tracked objects against HubSpot with batch reads and report drift:
+    objects renamed, merged or deleted in HubSpot.
+    """
+    started = time.monotonic()
+    results = CRMReconcileService(concurrency=concurrency).run(
+        object_types or None, action=action
+    )
+    elapsed = time.monotonic() - started
+    checked = sum(stats["checked"] for stats in results.values())
+    for object_type, stats in results.items():
+        drift = stats["renamed"] + stats["merged"] + stats["missing"]
+        share = drift / stats["checked"] if stats["checked"] else 0.0
+        click.echo(
+            f"{object_type}: {stats['checked']} checked, {drift} drifted ({share:.2%}): "
+            f"{stats['renamed']} renamed, {stats['merged']} merged, "
+            f"{stats['missing']} missing; {stats['updated']} updated, "
+            f"{stats['removed']} removed"
+        )
+    click.echo(
+        f"Checked {checked} object(s) in {elapsed:.1f}s "
+        f"({checked / elapsed if elapsed else 0:.0f}/s)."
+    )
+
+
+def register_commands(app):
+    """
+    Register `flask hubspot ...` CLI commands.
+    """
+    app.cli.add_command(hubspot_cli)
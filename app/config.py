@@ -11,6 +11,11 @@ class BaseConfig:
     DEBUG = False
     TESTING = False
     LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+    # json (one object per line) or text
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+    # Per window, let this many identical warnings through; 0 = no sampling
+    LOG_SAMPLE_BURST = int(os.environ.get("LOG_SAMPLE_BURST", 5))
+    LOG_SAMPLE_WINDOW = float(os.environ.get("LOG_SAMPLE_WINDOW", 10))
 
     # Database
     DB_HOST = os.environ.get("DB_HOST", "localhost")
@@ -29,19 +34,141 @@ class BaseConfig:
     HUBSPOT_BACKOFF_MULTIPLIER = float(
         os.environ.get("HUBSPOT_BACKOFF_MULTIPLIER", 1.0)
     )
+    # Process-wide token bucket shared by every HubSpot call (0 disables it)
+    HUBSPOT_RATE_LIMIT_PER_SECOND = float(
+        os.environ.get("HUBSPOT_RATE_LIMIT_PER_SECOND", 10)
+    )
+    HUBSPOT_RATE_LIMIT_BURST = int(os.environ.get("HUBSPOT_RATE_LIMIT_BURST", 10))
+    # AIMD limit on in-flight HubSpot calls: off, process or shared (all
+    # workers on the host, through HUBSPOT_ADAPTIVE_STATE_FILE)
+    HUBSPOT_ADAPTIVE_CONCURRENCY = os.environ.get(
+        "HUBSPOT_ADAPTIVE_CONCURRENCY", "off"
+    ).lower()
+    HUBSPOT_ADAPTIVE_MIN = int(os.environ.get("HUBSPOT_ADAPTIVE_MIN", 1))
+    HUBSPOT_ADAPTIVE_MAX = int(os.environ.get("HUBSPOT_ADAPTIVE_MAX", 50))
+    HUBSPOT_ADAPTIVE_INITIAL = int(os.environ.get("HUBSPOT_ADAPTIVE_INITIAL", 10))
+    # Calls slower than this (ms) also cut the limit; 0 = only errors do
+    HUBSPOT_ADAPTIVE_LATENCY_MS = float(
+        os.environ.get("HUBSPOT_ADAPTIVE_LATENCY_MS", 0)
+    )
+    HUBSPOT_ADAPTIVE_STATE_FILE = os.environ.get(
+        "HUBSPOT_ADAPTIVE_STATE_FILE", "/tmp/hubspot_adaptive_concurrency.json"
+    )
+
+    # Connection handling for HubSpot calls: http1 | http1-pooled | http2
+    # (see app/utils/http_transport.py); pool size per host for the last two
+    HUBSPOT_HTTP_TRANSPORT = os.environ.get("HUBSPOT_HTTP_TRANSPORT", "http1")
+    HUBSPOT_HTTP_POOL_SIZE = int(os.environ.get("HUBSPOT_HTTP_POOL_SIZE", 10))
+
+    # Items of a bulk request sent to HubSpot at once (1 = one after another)
+    HUBSPOT_BULK_CONCURRENCY = int(os.environ.get("HUBSPOT_BULK_CONCURRENCY", 1))
+
+    # /api/async/*: HubSpot calls in flight per bulk request, and the pool size
+    # of each request's httpx client
+    HUBSPOT_ASYNC_CONCURRENCY = int(os.environ.get("HUBSPOT_ASYNC_CONCURRENCY", 50))
+    HUBSPOT_ASYNC_MAX_CONNECTIONS = int(
+        os.environ.get("HUBSPOT_ASYNC_MAX_CONNECTIONS", 100)
+    )
+
+    # `flask hubspot export`: createdate ranges paged at once, and page size
+    HUBSPOT_EXPORT_CONCURRENCY = int(os.environ.get("HUBSPOT_EXPORT_CONCURRENCY", 4))
+    HUBSPOT_EXPORT_PAGE_SIZE = int(os.environ.get("HUBSPOT_EXPORT_PAGE_SIZE", 200))
+
+    # Batch reads in flight during `flask hubspot reconcile`
+    HUBSPOT_RECONCILE_CONCURRENCY = int(
+        os.environ.get("HUBSPOT_RECONCILE_CONCURRENCY", 4)
+    )
+
+    # Chunks sent to HubSpot at once by `flask hubspot import`
+    HUBSPOT_IMPORT_CONCURRENCY = int(os.environ.get("HUBSPOT_IMPORT_CONCURRENCY", 4))
 
     # HubSpot OAuth
     HUBSPOT_CLIENT_ID = os.environ.get("HUBSPOT_CLIENT_ID", "")
     HUBSPOT_CLIENT_SECRET = os.environ.get("HUBSPOT_CLIENT_SECRET", "")
     HUBSPOT_REFRESH_TOKEN = os.environ.get("HUBSPOT_REFRESH_TOKEN", "")
-    HUBSPOT_OAUTH_TOKEN_URL = "https://api.hubapi.com/oauth/v1/token"
-    HUBSPOT_API_BASE_URL = "https://api.hubapi.com"
+    # Overridable to point the app at a stand-in (benchmarks/hubspot_standin.py)
+    HUBSPOT_OAUTH_TOKEN_URL = os.environ.get(
+        "HUBSPOT_OAUTH_TOKEN_URL", "https://api.hubapi.com/oauth/v1/token"
+    )
+    HUBSPOT_API_BASE_URL = os.environ.get(
+        "HUBSPOT_API_BASE_URL", "https://api.hubapi.com"
+    )
+
+    # Server-Timing header with each request's span breakdown
+    SERVER_TIMING_HEADER = os.environ.get("SERVER_TIMING_HEADER", "1").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    # Add X-DB-Queries / X-HubSpot-Calls headers to every response (benchmarks)
+    REQUEST_STATS_HEADERS = os.environ.get("REQUEST_STATS_HEADERS", "0").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    # Log statements slower than this (ms) with their EXPLAIN plan; 0 = off
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+    # Flag a statement shape repeated this often in one request (N+1); 0 = off
+    N_PLUS_ONE_THRESHOLD = int(os.environ.get("N_PLUS_ONE_THRESHOLD", 10))
+
+    # OpenTelemetry tracing (needs opentelemetry-sdk): "" (off), console or file
+    TRACING_EXPORTER = os.environ.get("TRACING_EXPORTER", "")
+    TRACING_FILE = os.environ.get("TRACING_FILE", "traces.jsonl")
+    # Share of new traces kept; traces started by a caller keep its decision
+    TRACING_SAMPLE_RATIO = float(os.environ.get("TRACING_SAMPLE_RATIO", 1.0))
+    TRACING_SERVICE_NAME = os.environ.get(
+        "TRACING_SERVICE_NAME", "hubspot-crm-integration"
+    )
+
+    # Bearer token for /api/admin/* (admin endpoints are refused while unset)
+    ADMIN_API_TOKEN = os.environ.get("ADMIN_API_TOKEN", "")
+    # Request profiling (needs pyinstrument): admins opt in with X-Profile: 1,
+    # and this share of all requests is profiled regardless
+    PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0.0))
+    PROFILING_INTERVAL = float(os.environ.get("PROFILING_INTERVAL", 0.001))
+    PROFILE_DIR = os.environ.get("PROFILE_DIR", "/tmp/hubspot_crm_profiles")
+    PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 50))
 
     # Local in-memory store of the currently valid access token
     HUBSPOT_ACCESS_TOKEN = None
     HUBSPOT_TOKEN_EXPIRES_AT = float(os.environ.get("HUBSPOT_TOKEN_EXPIRES_AT", 0))
     TOKEN_REFRESH_BUFFER = float(os.environ.get("TOKEN_REFRESH_BUFFER", 60))
 
+    # Rows fetched per round trip when streaming exports from the local DB
+    CRM_EXPORT_BATCH_SIZE = int(os.environ.get("CRM_EXPORT_BATCH_SIZE", 1000))
+
+    # Incremental HubSpot -> local mirror sync
+    HUBSPOT_SYNC_PAGE_SIZE = int(os.environ.get("HUBSPOT_SYNC_PAGE_SIZE", 100))
+
+    # HubSpot webhooks: signature max age and events processed per batch
+    HUBSPOT_WEBHOOK_MAX_AGE_SECONDS = int(
+        os.environ.get("HUBSPOT_WEBHOOK_MAX_AGE_SECONDS", 300)
+    )
+    HUBSPOT_WEBHOOK_BATCH_SIZE = int(os.environ.get("HUBSPOT_WEBHOOK_BATCH_SIZE", 500))
+    # Public URL HubSpot posts to, if it differs from what Flask sees (proxies)
+    HUBSPOT_WEBHOOK_PUBLIC_URL = os.environ.get("HUBSPOT_WEBHOOK_PUBLIC_URL")
+
+    # Monthly partitions of created_crm_objects and their retention
+    CRM_OBJECTS_PARTITIONS_AHEAD = int(
+        os.environ.get("CRM_OBJECTS_PARTITIONS_AHEAD", 3)
+    )
+    CRM_OBJECTS_RETENTION_MONTHS = int(
+        os.environ.get("CRM_OBJECTS_RETENTION_MONTHS", 24)
+    )
+    CRM_OBJECTS_ARCHIVE_DIR = os.environ.get(
+        "CRM_OBJECTS_ARCHIVE_DIR", os.path.join(BASE_DIR, "archive")
+    )
+
+    # Change feed (LISTEN/NOTIFY) for GET /api/new-crm-objects/changes and /stream
+    CRM_CHANGE_FEED_CHANNEL = os.environ.get(
+        "CRM_CHANGE_FEED_CHANNEL", "crm_object_changes"
+    )
+    CRM_CHANGE_FEED_MAX_WAIT = float(os.environ.get("CRM_CHANGE_FEED_MAX_WAIT", 25))
+    CRM_CHANGE_FEED_STREAM_SECONDS = float(
+        os.environ.get("CRM_CHANGE_FEED_STREAM_SECONDS", 300)
+    )
+    CRM_CHANGE_FEED_HEARTBEAT = float(os.environ.get("CRM_CHANGE_FEED_HEARTBEAT", 15))
+
 
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
@@ -0,0 +1,37 @@
+from flask import Blueprint, current_app, jsonify, request, send_file
+
+from app.utils.admin_auth import require_admin
+from app.utils.api_responses import success_response
+from app.utils.errors import NotFoundError
+from app.utils.profiling import list_profiles, profile_file
+
+admin_bp = Blueprint("admin", __name__)
+
+
+@admin_bp.route("/profiles", methods=["GET"])
+@require_admin
+def get_profiles():
+    """
+    Recent request profiles, newest first (?limit=50). See
+    app/utils/profiling.py for how requests get profiled.
+    """
+    limit = request.args.get("limit", 50, type=int)
+    profiles = list_profiles(current_app.config["PROFILE_DIR"], limit=limit)
+    return jsonify(success_response(profiles)), 200
+
+
+@admin_bp.route("/profiles/<request_id>", methods=["GET"])
+@require_admin
+def get_profile(request_id):
+    """
+    The speedscope profile of one request, to load into speedscope.app.
+    """
+    path = profile_file(current_app.config["PROFILE_DIR"], request_id)
+    if path is None:
+        raise NotFoundError(message=f"No profile for request {request_id}.")
+    return send_file(
+        path,
+        mimetype="application/json",
+        as_attachment=True,
+        download_name=f"{request_id}.speedscope.json",
+    )
@@ -0,0 +1,152 @@
+from flask import Blueprint, request, jsonify, current_app
+from marshmallow import ValidationError
+
+from app.controllers.hubspot_controller import _partial_response
+from app.services.async_hubspot_service import AsyncHubSpotService
+from app.schemas.hubspot_schema import ContactSchema, DealSchema, TicketSchema
+from app.utils.api_responses import success_response, error_response
+from app.utils.errors import BadRequestError, BulkOperationError
+
+# Same request/response contract as the matching /api routes, served by
+# async views: HubSpot calls are awaited on a pooled httpx client, so bulk
+# requests keep many calls in flight at once. Flask runs each async view on
+# a fresh event loop (and so a fresh client) inside the WSGI thread serving
+# it; that thread is busy until the view returns. The gain is the fan-out
+# within one bulk request, not serving other requests meanwhile (gthread
+# workers do that, see gunicorn.conf.py).
+async_hubspot_bp = Blueprint("async_hubspot", __name__)
+
+
+@async_hubspot_bp.route("/contacts", methods=["POST", "PUT"])
+async def upsert_contact():
+    """
+    Async variant of POST/PUT /api/contacts.
+    """
+    try:
+        validated = ContactSchema().load(request.get_json() or {})
+        contact = await AsyncHubSpotService().upsert_contact(validated)
+
+        current_app.logger.info("Upserted contact for email=%s", validated["email"])
+        return jsonify(success_response({"contact": contact})), 200
+
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in async upsert_contact: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Contact validation failed.", verboseMessage=str(ve.messages)
+        )
+    except Exception as e:
+        current_app.logger.exception("Error upserting contact.")
+        return jsonify(error_response(str(e), "Failed to upsert contact", 500)), 500
+
+
+@async_hubspot_bp.route("/deals", methods=["POST", "PUT"])
+async def upsert_deal():
+    """
+    Async variant of POST/PUT /api/deals.
+    """
+    try:
+        validated = DealSchema().load(request.get_json() or {})
+        deal = await AsyncHubSpotService().upsert_deal(validated)
+
+        current_app.logger.info("Upserted deal for dealname=%s", validated["dealname"])
+        return jsonify(success_response({"deal": deal})), 200
+
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in async upsert_deal: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Deal validation failed.", verboseMessage=str(ve.messages)
+        )
+    except Exception as e:
+        current_app.logger.exception("Error upserting deal.")
+        return jsonify(error_response(str(e), "Failed to upsert deal", 500)), 500
+
+
+@async_hubspot_bp.route("/tickets", methods=["POST"])
+async def create_ticket():
+    """
+    Async variant of POST /api/tickets.
+    """
+    try:
+        validated = TicketSchema().load(request.get_json() or {})
+        ticket = await AsyncHubSpotService().create_ticket(validated)
+
+        current_app.logger.info("Created ticket subject=%s", validated["subject"])
+        return jsonify(success_response({"ticket": ticket}, status_code=201)), 201
+
+    except ValidationError as ve:
+        current_app.logger.warning("Validation error creating ticket: %s", ve.messages)
+        raise BadRequestError(
+            message="Ticket validation failed.", verboseMessage=str(ve.messages)
+        )
+    except Exception as e:
+        current_app.logger.exception("Error creating ticket.")
+        return jsonify(error_response(str(e), "Failed to create ticket", 500)), 500
+
+
+@async_hubspot_bp.route("/deals/bulk", methods=["POST", "PUT"])
+async def upsert_bulk_deals():
+    """
+    Async variant of /api/deals/bulk: every deal is in flight at once, up to
+    HUBSPOT_ASYNC_CONCURRENCY.
+    """
+    try:
+        data = request.get_json() or {}
+        validated_deals = DealSchema(many=True).load(data.get("deals", []))
+        results = await AsyncHubSpotService().upsert_deals(validated_deals)
+
+        current_app.logger.info("Bulk upserted %d deals.", len(results))
+        return jsonify(success_response({"deals": results})), 200
+
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in async upsert_bulk_deals: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Bulk deals validation failed.", verboseMessage=str(ve.messages)
+        )
+    except BulkOperationError as be:
+        current_app.logger.warning("Bulk deal upsert partly failed: %s", be.message)
+        return _partial_response("deals", be)
+    except Exception as e:
+        current_app.logger.exception("Error bulk-upserting deals.")
+        return (
+            jsonify(error_response(str(e), "Failed to bulk upsert deals", 500)),
+            500,
+        )
+
+
+@async_hubspot_bp.route("/tickets/bulk", methods=["POST"])
+async def create_bulk_tickets():
+    """
+    Async variant of /api/tickets/bulk: every ticket is in flight at once, up
+    to HUBSPOT_ASYNC_CONCURRENCY.
+    """
+    try:
+        data = request.get_json() or {}
+        validated_tickets = TicketSchema(many=True).load(data.get("tickets", []))
+        results = await AsyncHubSpotService().create_tickets(validated_tickets)
+
+        current_app.logger.info("Bulk created %d tickets.", len(results))
+        return jsonify(success_response({"tickets": results}, status_code=201)), 201
+
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in async create_bulk_tickets: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Bulk tickets validation failed.",
+            verboseMessage=str(ve.messages),
+        )
+    except BulkOperationError as be:
+        current_app.logger.warning("Bulk ticket create partly failed: %s", be.message)
+        return _partial_response("tickets", be)
+    except Exception as e:
+        current_app.logger.exception("Error bulk-creating tickets.")
+        return (
+            jsonify(error_response(str(e), "Failed to bulk create tickets", 500)),
+            500,
+        )
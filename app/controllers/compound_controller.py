@@ -0,0 +1,58 @@
+from flask import Blueprint, request, jsonify, current_app
+from marshmallow import ValidationError
+
+from app.services.async_hubspot_service import AsyncHubSpotService
+from app.schemas.hubspot_schema import CompoundSchema
+from app.utils.api_responses import success_response, error_response
+from app.utils.errors import BadRequestError, BulkOperationError
+
+compound_bp = Blueprint("compound", __name__)
+
+
+@compound_bp.route("/compound", methods=["POST"])
+async def run_compound():
+    """
+    Upsert a contact, upsert a deal and create a ticket in one request.
+    Expects JSON like: { "contact": {...}, "deal": {...}, "ticket": {...} }
+    (any subset). The deal and ticket are linked to the contact and deal of
+    the same request unless they name contact_id/deal_id themselves.
+    Independent steps run concurrently; a step only waits for the IDs it
+    needs. Returns 207 with per-step errors if only some steps succeed, 502
+    if none do.
+    """
+    try:
+        graph = CompoundSchema().load(request.get_json() or {})
+        results = await AsyncHubSpotService().compound(graph)
+
+        current_app.logger.info("Ran compound upsert: %s", ", ".join(results))
+        return jsonify(success_response(results)), 200
+
+    except ValidationError as ve:
+        current_app.logger.warning("Validation error in compound: %s", ve.messages)
+        raise BadRequestError(
+            message="Compound request validation failed.",
+            verboseMessage=str(ve.messages),
+        )
+    except BulkOperationError as be:
+        current_app.logger.warning("Compound request partly failed: %s", be.message)
+        if be.all_failed:
+            return (
+                jsonify(error_response(be.errors, be.message, be.httpCode)),
+                be.httpCode,
+            )
+        return (
+            jsonify(
+                success_response(
+                    {**be.results, "errors": be.errors},
+                    message=be.message,
+                    status_code=be.httpCode,
+                )
+            ),
+            be.httpCode,
+        )
+    except Exception as e:
+        current_app.logger.exception("Error running compound request.")
+        return (
+            jsonify(error_response(str(e), "Failed to run compound request", 500)),
+            500,
+        )
@@ -1,10 +1,32 @@
-from flask import Blueprint, request, jsonify, current_app
+import json
+import time
+
+from flask import (
+    Blueprint,
+    Response,
+    request,
+    jsonify,
+    current_app,
+    stream_with_context,
+)
 from marshmallow import ValidationError
 
 from app.services.hubspot_service import HubSpotService
-from app.schemas.hubspot_schema import ContactSchema, DealSchema, TicketSchema
+from app.schemas.hubspot_schema import (
+    ContactSchema,
+    DealSchema,
+    TicketSchema,
+    NewCRMObjectsQuerySchema,
+    CRMObjectExportQuerySchema,
+    CRMObjectChangesQuerySchema,
+)
+from app.extensions import db
 from app.utils.api_responses import success_response, error_response
-from app.utils.errors import BadRequestError
+from app.utils.change_feed import current_generation, wait_for_change
+from app.utils.constants import CRM_OBJECT_FIELDS
+from app.utils.errors import BadRequestError, BulkOperationError
+from app.utils.request_stats import span
+from app.utils.streaming import MIMETYPES, csv_stream, ndjson_stream
 
 hubspot_bp = Blueprint("hubspot", __name__)
 
@@ -17,7 +39,8 @@ def upsert_contact():
     try:
         data = request.get_json() or {}
         schema = ContactSchema()
-        validated = schema.load(data)
+        with span("validate"):
+            validated = schema.load(data)
 
         service = HubSpotService()
         contact = service.upsert_contact(validated)
@@ -45,7 +68,8 @@ def upsert_deal():
     try:
         data = request.get_json() or {}
         schema = DealSchema()
-        validated = schema.load(data)
+        with span("validate"):
+            validated = schema.load(data)
 
         service = HubSpotService()
         deal = service.upsert_deal(validated)
@@ -71,7 +95,8 @@ def create_ticket():
     try:
         data = request.get_json() or {}
         schema = TicketSchema()
-        validated = schema.load(data)
+        with span("validate"):
+            validated = schema.load(data)
 
         service = HubSpotService()
         ticket = service.create_ticket(validated)
@@ -89,6 +114,179 @@ def create_ticket():
         return jsonify(error_response(str(e), "Failed to create ticket", 500)), 500
 
 
+@hubspot_bp.route("/new-crm-objects/stats", methods=["GET"])
+def get_new_crm_object_stats():
+    """
+    Per-objectType counts of tracked CRM objects, served from the maintained
+    crm_object_counts table rather than a count(*) over created_crm_objects.
+    """
+    try:
+        service = HubSpotService()
+        counts = service.get_object_counts()
+
+        response_data = {"counts": counts, "total": sum(counts.values())}
+        return jsonify(success_response(response_data)), 200
+
+    except Exception as e:
+        current_app.logger.exception("Error retrieving CRM object stats.")
+        return (
+            jsonify(error_response(str(e), "Failed to retrieve CRM object stats", 500)),
+            500,
+        )
+
+
+@hubspot_bp.route("/new-crm-objects/export", methods=["GET"])
+def export_new_crm_objects():
+    """
+    Stream every tracked CRM object matching the filters as NDJSON or CSV:
+      ?objectType=contacts|deals|tickets
+      &format=ndjson|csv
+      plus the same filters as GET /api/new-crm-objects
+    Rows are read from a server-side cursor in batches, so memory use does
+    not grow with the number of rows exported.
+    """
+    try:
+        schema = CRMObjectExportQuerySchema()
+        params = schema.load(request.args)
+        export_format = params["format"]
+
+        service = HubSpotService()
+        rows = service.iter_objects_from_db(
+            object_type=params["object_type"], filters=schema.filters(params)
+        )
+        if export_format == "csv":
+            body = csv_stream(rows, CRM_OBJECT_FIELDS)
+        else:
+            body = ndjson_stream(rows)
+
+        current_app.logger.info(
+            "Streaming CRM object export type=%s format=%s",
+            params["object_type"],
+            export_format,
+        )
+        return Response(
+            stream_with_context(body),
+            mimetype=MIMETYPES[export_format],
+            headers={
+                "Content-Disposition": (
+                    f"attachment; filename=crm-objects.{export_format}"
+                )
+            },
+        )
+
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in export_new_crm_objects: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Invalid query parameters.", verboseMessage=str(ve.messages)
+        )
+    except Exception as e:
+        current_app.logger.exception("Error exporting CRM objects.")
+        return (
+            jsonify(error_response(str(e), "Failed to export CRM objects", 500)),
+            500,
+        )
+
+
+@hubspot_bp.route("/new-crm-objects/changes", methods=["GET"])
+def get_crm_object_changes():
+    """
+    Long-poll change feed of tracked CRM objects:
+      ?after=<change_seq cursor>&objectType=...&limit=100&wait=25
+    Returns objects written after the cursor. If there are none, blocks for
+    up to `wait` seconds until a NOTIFY from a committed write arrives,
+    without polling the database in the meantime.
+    """
+    try:
+        params = CRMObjectChangesQuerySchema().load(request.args)
+        after = params["after"]
+        wait = min(params["wait"], current_app.config["CRM_CHANGE_FEED_MAX_WAIT"])
+        deadline = time.monotonic() + wait
+
+        service = HubSpotService()
+        while True:
+            generation = current_generation()
+            changes = service.get_changes_after(
+                after, params["object_type"], params["limit"]
+            )
+            # Hand the connection back to the pool while we wait.
+            db.session.close()
+            remaining = deadline - time.monotonic()
+            if changes or not wait_for_change(generation, remaining):
+                break
+
+        cursor = changes[-1]["change_seq"] if changes else after
+        return jsonify(success_response({"cursor": cursor, "results": changes})), 200
+
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in get_crm_object_changes: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Invalid query parameters.", verboseMessage=str(ve.messages)
+        )
+    except Exception as e:
+        current_app.logger.exception("Error retrieving CRM object changes.")
+        return (
+            jsonify(
+                error_response(str(e), "Failed to retrieve CRM object changes", 500)
+            ),
+            500,
+        )
+
+
+@hubspot_bp.route("/new-crm-objects/stream", methods=["GET"])
+def stream_crm_object_changes():
+    """
+    Server-Sent Events version of the change feed. Each event's id is the
+    object's change_seq, so a reconnecting EventSource resumes from
+    Last-Event-ID. The stream ends after CRM_CHANGE_FEED_STREAM_SECONDS and
+    sends a comment heartbeat while idle.
+    """
+    try:
+        params = CRMObjectChangesQuerySchema().load(request.args)
+        last_event_id = request.headers.get("Last-Event-ID", "")
+        after = int(last_event_id) if last_event_id.isdigit() else params["after"]
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in stream_crm_object_changes: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Invalid query parameters.", verboseMessage=str(ve.messages)
+        )
+
+    config = current_app.config
+    service = HubSpotService()
+
+    def generate(cursor):
+        deadline = time.monotonic() + config["CRM_CHANGE_FEED_STREAM_SECONDS"]
+        yield "retry: 2000\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            generation = current_generation()
+            changes = service.get_changes_after(
+                cursor, params["object_type"], params["limit"]
+            )
+            db.session.close()
+            for change in changes:
+                cursor = change["change_seq"]
+                yield f"id: {cursor}\nevent: crm_object\ndata: {json.dumps(change)}\n\n"
+            if len(changes) == params["limit"]:
+                continue
+            heartbeat = min(config["CRM_CHANGE_FEED_HEARTBEAT"], remaining)
+            if not wait_for_change(generation, heartbeat):
+                yield ": keep-alive\n\n"
+
+    return Response(
+        stream_with_context(generate(after)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @hubspot_bp.route("/new-crm-objects", methods=["GET"])
 def get_new_crm_objects():
     """
@@ -97,14 +295,26 @@ def get_new_crm_objects():
       ?objectType=contacts|deals|tickets
       &page=1
       &limit=10
+      &total=exact|estimated|none
+    Optional filters, each backed by an index:
+      &created_since=&created_until=&updated_since=<ISO 8601>
+      &name_prefix=<prefix>&email_domain=<domain>&external_id=<id,id,...>
     """
     try:
-        object_type = request.args.get("objectType", "").lower() or None
-        page = int(request.args.get("page", 1))
-        limit = int(request.args.get("limit", 10))
+        schema = NewCRMObjectsQuerySchema()
+        params = schema.load(request.args)
+        object_type = params["object_type"]
+        page = params["page"]
+        limit = params["limit"]
 
         service = HubSpotService()
-        results, total = service.get_new_objects_from_db(object_type, page, limit)
+        results, total = service.get_new_objects_from_db(
+            object_type,
+            page,
+            limit,
+            total_mode=params["total"],
+            filters=schema.filters(params),
+        )
 
         response_data = {
             "page": page,
@@ -120,6 +330,13 @@ def get_new_crm_objects():
         )
         return jsonify(success_response(response_data)), 200
 
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in get_new_crm_objects: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Invalid query parameters.", verboseMessage=str(ve.messages)
+        )
     except Exception as e:
         current_app.logger.exception("Error retrieving new CRM objects.")
         return (
@@ -127,68 +344,105 @@ def get_new_crm_objects():
             500,
         )
 
-    @hubspot_bp.route("/deals/bulk", methods=["POST", "PUT"])
-    def upsert_bulk_deals():
-        """
-        Create or update multiple deals in a single request.
-        Expects JSON like: { "deals": [ {deal1}, {deal2}, ... ] }
-        """
-        try:
-            data = request.get_json() or {}
-            deals_data = data.get("deals", [])
-            # Validate an array of deals
-            schema = DealSchema(many=True)
+
+@hubspot_bp.route("/deals/bulk", methods=["POST", "PUT"])
+def upsert_bulk_deals():
+    """
+    Create or update multiple deals in a single request.
+    Expects JSON like: { "deals": [ {deal1}, {deal2}, ... ] }
+    Returns 207 with per-item errors if only some of the deals succeed, 502
+    if none do.
+    """
+    try:
+        data = request.get_json() or {}
+        deals_data = data.get("deals", [])
+        # Validate an array of deals
+        schema = DealSchema(many=True)
+        with span("validate"):
             validated_deals = schema.load(deals_data)
 
-            service = HubSpotService()
-            results = service.upsert_deals(validated_deals)
+        service = HubSpotService()
+        results = service.upsert_deals(validated_deals)
 
-            current_app.logger.info("Bulk upserted %d deals.", len(results))
-            return jsonify(success_response({"deals": results})), 200
+        current_app.logger.info("Bulk upserted %d deals.", len(results))
+        return jsonify(success_response({"deals": results})), 200
+
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in upsert_bulk_deals: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Bulk deals validation failed.", verboseMessage=str(ve.messages)
+        )
+    except BulkOperationError as be:
+        current_app.logger.warning("Bulk deal upsert partly failed: %s", be.message)
+        return _partial_response("deals", be)
+    except Exception as e:
+        current_app.logger.exception("Error bulk-upserting deals.")
+        return (
+            jsonify(error_response(str(e), "Failed to bulk upsert deals", 500)),
+            500,
+        )
 
-        except ValidationError as ve:
-            current_app.logger.warning(
-                "Validation error in upsert_bulk_deals: %s", ve.messages
-            )
-            raise BadRequestError(
-                message="Bulk deals validation failed.", verboseMessage=str(ve.messages)
-            )
-        except Exception as e:
-            current_app.logger.exception("Error bulk-upserting deals.")
-            return (
-                jsonify(error_response(str(e), "Failed to bulk upsert deals", 500)),
-                500,
-            )
 
-    @hubspot_bp.route("/tickets/bulk", methods=["POST"])
-    def create_bulk_tickets():
-        """
-        Create multiple tickets in a single request.
-        Expects JSON like: { "tickets": [ {ticket1}, {ticket2}, ... ] }
-        """
-        try:
-            data = request.get_json() or {}
-            tickets_data = data.get("tickets", [])
-            schema = TicketSchema(many=True)
+@hubspot_bp.route("/tickets/bulk", methods=["POST"])
+def create_bulk_tickets():
+    """
+    Create multiple tickets in a single request.
+    Expects JSON like: { "tickets": [ {ticket1}, {ticket2}, ... ] }
+    Returns 207 with per-item errors if only some of the tickets succeed, 502
+    if none do.
+    """
+    try:
+        data = request.get_json() or {}
+        tickets_data = data.get("tickets", [])
+        schema = TicketSchema(many=True)
+        with span("validate"):
             validated_tickets = schema.load(tickets_data)
 
-            service = HubSpotService()
-            results = service.create_tickets(validated_tickets)
+        service = HubSpotService()
+        results = service.create_tickets(validated_tickets)
 
-            current_app.logger.info("Bulk created %d tickets.", len(results))
-            return jsonify(success_response({"tickets": results}, status_code=201)), 201
+        current_app.logger.info("Bulk created %d tickets.", len(results))
+        return jsonify(success_response({"tickets": results}, status_code=201)), 201
 
-        except ValidationError as ve:
-            current_app.logger.warning(
-                "Validation error in create_bulk_tickets: %s", ve.messages
-            )
-            raise BadRequestError(
-                message="Bulk tickets validation failed.",
-                verboseMessage=str(ve.messages),
-            )
-        except Exception as e:
-            current_app.logger.exception("Error bulk-creating tickets.")
-            return (
-                jsonify(error_response(str(e), "Failed to bulk create tickets", 500)),
-                500,
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in create_bulk_tickets: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Bulk tickets validation failed.",
+            verboseMessage=str(ve.messages),
+        )
+    except BulkOperationError as be:
+        current_app.logger.warning("Bulk ticket create partly failed: %s", be.message)
+        return _partial_response("tickets", be)
+    except Exception as e:
+        current_app.logger.exception("Error bulk-creating tickets.")
+        return (
+            jsonify(error_response(str(e), "Failed to bulk create tickets", 500)),
+            500,
+        )
+
+
+def _partial_response(key: str, error: BulkOperationError):
+    """
+    207 body for a bulk request where some items failed: results in input
+    order (null where an item failed) plus the per-item errors. When every
+    item failed it is an error body with the per-item errors instead.
+    """
+    if error.all_failed:
+        return (
+            jsonify(error_response(error.errors, error.message, error.httpCode)),
+            error.httpCode,
+        )
+    return (
+        jsonify(
+            success_response(
+                {key: error.results, "errors": error.errors},
+                message=error.message,
+                status_code=error.httpCode,
             )
+        ),
+        error.httpCode,
+    )
@@ -0,0 +1,14 @@
+from flask import Blueprint, Response
+
+from app.utils.metrics import render_metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Prometheus scrape endpoint (see app/utils/metrics.py).
+    """
+    body, content_type = render_metrics()
+    return Response(body, headers={"Content-Type": content_type})
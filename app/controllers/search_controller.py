@@ -0,0 +1,48 @@
+from flask import Blueprint, request, jsonify, current_app
+from marshmallow import ValidationError
+
+from app.schemas.hubspot_schema import SearchQuerySchema
+from app.services.search_service import CRMSearchService
+from app.utils.api_responses import success_response, error_response
+from app.utils.errors import BadRequestError
+
+search_bp = Blueprint("search", __name__)
+
+
+@search_bp.route("/search", methods=["GET"])
+def search_crm_objects():
+    """
+    Look up mirrored contacts, deals and tickets without calling HubSpot:
+      ?q=<query>
+      &mode=auto|email|prefix|fulltext|fuzzy
+      &objectType=contacts|deals|tickets
+      &limit=20
+      &include_archived=false
+    """
+    try:
+        params = SearchQuerySchema().load(request.args)
+        mode, results = CRMSearchService().search(
+            params["q"],
+            object_type=params["object_type"],
+            mode=params["mode"],
+            limit=params["limit"],
+            include_archived=params["include_archived"],
+        )
+        current_app.logger.info(
+            "Search mode=%s type=%s returned %d result(s)",
+            mode,
+            params["object_type"],
+            len(results),
+        )
+        return jsonify(success_response({"mode": mode, "results": results})), 200
+
+    except ValidationError as ve:
+        current_app.logger.warning(
+            "Validation error in search_crm_objects: %s", ve.messages
+        )
+        raise BadRequestError(
+            message="Invalid query parameters.", verboseMessage=str(ve.messages)
+        )
+    except Exception as e:
+        current_app.logger.exception("Error searching CRM objects.")
+        return jsonify(error_response(str(e), "Failed to search CRM objects", 500)), 500
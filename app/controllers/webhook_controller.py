@@ -0,0 +1,41 @@
+from flask import Blueprint, request, jsonify, current_app
+
+from app.services.webhook_service import WebhookService
+from app.utils.api_responses import success_response
+from app.utils.errors import BadRequestError
+from app.utils.webhook_signature import verify_hubspot_signature
+
+webhook_bp = Blueprint("webhooks", __name__)
+
+
+@webhook_bp.route("/webhooks/hubspot", methods=["POST"])
+def receive_hubspot_webhook():
+    """
+    Verify the HubSpot signature, queue the delivered events and acknowledge
+    straight away. The events are applied later by `flask hubspot
+    process-webhooks`, so HubSpot never waits on our own API calls.
+    """
+    body = request.get_data()
+    verify_hubspot_signature(
+        method=request.method,
+        uri=current_app.config.get("HUBSPOT_WEBHOOK_PUBLIC_URL") or request.url,
+        body=body,
+        headers=request.headers,
+        client_secret=current_app.config["HUBSPOT_CLIENT_SECRET"],
+        max_age_seconds=current_app.config["HUBSPOT_WEBHOOK_MAX_AGE_SECONDS"],
+    )
+
+    events = request.get_json(silent=True)
+    if not isinstance(events, list) or not all(
+        isinstance(event, dict) for event in events
+    ):
+        raise BadRequestError(
+            message="Webhook body must be a JSON array of event objects."
+        )
+
+    queued = WebhookService.enqueue(events)
+    current_app.logger.info("Queued %d of %d webhook event(s).", queued, len(events))
+    return (
+        jsonify(success_response({"queued": queued}, "Events accepted", 202)),
+        202,
+    )
@@ -200,6 +200,100 @@ class HubSpotAPI:
             current_app.logger.error("associate_ticket_with_deal error: %s", str(e))
             raise
 
+    def search_objects(
+        self,
+        object_type: str,
+        filter_groups: list,
+        properties: list,
+        sorts: list = None,
+        after: str = None,
+        limit: int = 100,
+    ) -> dict:
+        """
+        Generic CRM search. Returns the raw response (results, total, paging)
+        so callers can follow paging.next.after themselves.
+        """
+        url = f"{self.base_url}/crm/v3/objects/{object_type}/search"
+        payload = {
+            "filterGroups": filter_groups,
+            "properties": properties,
+            "limit": limit,
+        }
+        if sorts:
+            payload["sorts"] = sorts
+        if after:
+            payload["after"] = after
+        try:
+            resp = request_with_tenacity(
+                "POST", url, headers=self._headers(), json=payload, timeout=20
+            )
+            resp.raise_for_status()
+            return resp.json()
+        except RequestException as e:
+            current_app.logger.error("search_objects error: %s", str(e))
+            raise
+
+    def batch_read(self, object_type: str, ids: list, properties: list) -> dict:
+        """
+        Read up to 100 objects by ID in one call. IDs that no longer exist are
+        reported under "errors" (HTTP 207) rather than failing the request.
+        """
+        url = f"{self.base_url}/crm/v3/objects/{object_type}/batch/read"
+        payload = {
+            "inputs": [{"id": str(object_id)} for object_id in ids],
+            "properties": properties,
+        }
+        try:
+            resp = request_with_tenacity(
+                "POST", url, headers=self._headers(), json=payload, timeout=20
+            )
+            resp.raise_for_status()
+            return resp.json()
+        except RequestException as e:
+            current_app.logger.error("batch_read error: %s", str(e))
+            raise
+
+    def batch_create(self, object_type: str, inputs: list) -> dict:
+        """
+        Create up to 100 objects in one call. Each input is
+        {"properties": {...}, "associations": [...]}; associations are
+        created inline with the object.
+        """
+        url = f"{self.base_url}/crm/v3/objects/{object_type}/batch/create"
+        try:
+            resp = request_with_tenacity(
+                "POST",
+                url,
+                headers=self._headers(),
+                json={"inputs": inputs},
+                timeout=30,
+            )
+            resp.raise_for_status()
+            return resp.json()
+        except RequestException as e:
+            current_app.logger.error("batch_create error: %s", str(e))
+            raise
+
+    def batch_upsert(self, object_type: str, inputs: list) -> dict:
+        """
+        Create or update up to 100 objects in one call, matched on a unique
+        property: each input is {"idProperty": ..., "id": ..., "properties": {...}}.
+        """
+        url = f"{self.base_url}/crm/v3/objects/{object_type}/batch/upsert"
+        try:
+            resp = request_with_tenacity(
+                "POST",
+                url,
+                headers=self._headers(),
+                json={"inputs": inputs},
+                timeout=30,
+            )
+            resp.raise_for_status()
+            return resp.json()
+        except RequestException as e:
+            current_app.logger.error("batch_upsert error: %s", str(e))
+            raise
+
     def get_new_objects(self, object_type: str, limit: int = 10, after: str = None):
         """
         Original logic for fetching new objects from HubSpot directly, if needed.
@@ -0,0 +1,271 @@
+import httpx
+from flask import current_app
+from app.utils.rate_limit_handler import async_request_with_tenacity
+
+
+class AsyncHubSpotAPI:
+    """
+    asyncio counterpart of HubSpotAPI: the same methods, as coroutines, on a
+    pooled httpx.AsyncClient. Use it as an async context manager so the
+    client's connections are closed:
+
+        async with AsyncHubSpotAPI(token) as api:
+            contact = await api.find_contact_by_email(email)
+
+    An httpx client is bound to the event loop it is used on, so create one
+    AsyncHubSpotAPI per loop (in a Flask async view, per request).
+    """
+
+    def __init__(self, token: str, client: httpx.AsyncClient = None):
+        self.token = token
+        self.base_url = current_app.config.get(
+            "HUBSPOT_API_BASE_URL", "https://api.hubapi.com"
+        )
+        max_connections = current_app.config.get("HUBSPOT_ASYNC_MAX_CONNECTIONS", 100)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            http2=current_app.config.get("HUBSPOT_HTTP_TRANSPORT") == "http2",
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json",
+        }
+
+    async def _request(self, operation: str, method: str, url: str, **kwargs):
+        try:
+            resp = await async_request_with_tenacity(
+                self.client, method, url, headers=self._headers(), **kwargs
+            )
+            resp.raise_for_status()
+            return resp
+        except httpx.HTTPError as e:
+            current_app.logger.error("%s error: %s", operation, str(e))
+            raise
+
+    async def find_contact_by_email(self, email: str):
+        payload = {
+            "filterGroups": [
+                {
+                    "filters": [
+                        {"propertyName": "email", "operator": "EQ", "value": email}
+                    ]
+                }
+            ],
+            "properties": ["email", "firstname", "lastname", "phone"],
+        }
+        resp = await self._request(
+            "find_contact_by_email",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/contacts/search",
+            json=payload,
+            timeout=20,
+        )
+        data = resp.json()
+        if data.get("total", 0) > 0:
+            return data["results"][0]
+        return None
+
+    async def create_contact(self, properties: dict):
+        resp = await self._request(
+            "create_contact",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/contacts",
+            json={"properties": properties},
+            timeout=20,
+        )
+        return resp.json()
+
+    async def update_contact(self, contact_id: str, properties: dict):
+        resp = await self._request(
+            "update_contact",
+            "PATCH",
+            f"{self.base_url}/crm/v3/objects/contacts/{contact_id}",
+            json={"properties": properties},
+            timeout=20,
+        )
+        return resp.json()
+
+    async def find_deal_by_name(self, deal_name: str):
+        payload = {
+            "filterGroups": [
+                {
+                    "filters": [
+                        {
+                            "propertyName": "dealname",
+                            "operator": "EQ",
+                            "value": deal_name,
+                        }
+                    ]
+                }
+            ],
+            "properties": ["dealname", "amount", "dealstage"],
+        }
+        resp = await self._request(
+            "find_deal_by_name",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/deals/search",
+            json=payload,
+            timeout=20,
+        )
+        data = resp.json()
+        if data.get("total", 0) > 0:
+            return data["results"][0]
+        return None
+
+    async def create_deal(self, properties: dict, associations: list = None):
+        """
+        associations, if given, are created inline with the deal:
+        [{"to": {"id": ...}, "types": [{...}]}].
+        """
+        body = {"properties": properties}
+        if associations:
+            body["associations"] = associations
+        resp = await self._request(
+            "create_deal",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/deals",
+            json=body,
+            timeout=20,
+        )
+        return resp.json()
+
+    async def update_deal(self, deal_id: str, properties: dict):
+        resp = await self._request(
+            "update_deal",
+            "PATCH",
+            f"{self.base_url}/crm/v3/objects/deals/{deal_id}",
+            json={"properties": properties},
+            timeout=20,
+        )
+        return resp.json()
+
+    async def create_ticket(self, properties: dict, associations: list = None):
+        body = {"properties": properties}
+        if associations:
+            body["associations"] = associations
+        resp = await self._request(
+            "create_ticket",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/tickets",
+            json=body,
+            timeout=10,
+        )
+        return resp.json()
+
+    async def _associate(self, operation: str, path: str, from_id: str, to_id: str):
+        body = {"inputs": [{"from": {"id": str(from_id)}, "to": {"id": str(to_id)}}]}
+        await self._request(
+            operation,
+            "POST",
+            f"{self.base_url}/crm/v3/associations/{path}/batch/create",
+            json=body,
+            timeout=10,
+        )
+        return True
+
+    async def associate_contact_and_deal(self, contact_id: str, deal_id: str):
+        return await self._associate(
+            "associate_contact_and_deal", "Deals/Contacts", deal_id, contact_id
+        )
+
+    async def associate_ticket_with_contact(self, ticket_id: str, contact_id: str):
+        return await self._associate(
+            "associate_ticket_with_contact", "Tickets/Contacts", ticket_id, contact_id
+        )
+
+    async def associate_ticket_with_deal(self, ticket_id: str, deal_id: str):
+        return await self._associate(
+            "associate_ticket_with_deal", "Tickets/Deals", ticket_id, deal_id
+        )
+
+    async def search_objects(
+        self,
+        object_type: str,
+        filter_groups: list,
+        properties: list,
+        sorts: list = None,
+        after: str = None,
+        limit: int = 100,
+    ) -> dict:
+        payload = {
+            "filterGroups": filter_groups,
+            "properties": properties,
+            "limit": limit,
+        }
+        if sorts:
+            payload["sorts"] = sorts
+        if after:
+            payload["after"] = after
+        resp = await self._request(
+            "search_objects",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/{object_type}/search",
+            json=payload,
+            timeout=20,
+        )
+        return resp.json()
+
+    async def batch_read(self, object_type: str, ids: list, properties: list) -> dict:
+        payload = {
+            "inputs": [{"id": str(object_id)} for object_id in ids],
+            "properties": properties,
+        }
+        resp = await self._request(
+            "batch_read",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/{object_type}/batch/read",
+            json=payload,
+            timeout=20,
+        )
+        return resp.json()
+
+    async def batch_create(self, object_type: str, inputs: list) -> dict:
+        resp = await self._request(
+            "batch_create",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/{object_type}/batch/create",
+            json={"inputs": inputs},
+            timeout=30,
+        )
+        return resp.json()
+
+    async def batch_upsert(self, object_type: str, inputs: list) -> dict:
+        resp = await self._request(
+            "batch_upsert",
+            "POST",
+            f"{self.base_url}/crm/v3/objects/{object_type}/batch/upsert",
+            json={"inputs": inputs},
+            timeout=30,
+        )
+        return resp.json()
+
+    async def get_new_objects(
+        self, object_type: str, limit: int = 10, after: str = None
+    ):
+        params = {"limit": limit, "sort": "-createdate"}
+        if after:
+            params["after"] = after
+        resp = await self._request(
+            "get_new_objects",
+            "GET",
+            f"{self.base_url}/crm/v3/objects/{object_type}",
+            params=params,
+            timeout=10,
+        )
+        return resp.json()
@@ -1,4 +1,5 @@
 import datetime
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, insert as pg_insert
 from app.extensions import db
 
 
@@ -22,16 +23,45 @@ class HubspotAuth(db.Model):
         return f"<HubspotAuth id={self.id} token_expires_at={self.token_expires_at}>"
 
 
+change_seq_sequence = db.Sequence("created_crm_objects_change_seq")
+
+
 class CreatedCRMObject(db.Model):
     """
     Stores newly created or updated CRM objects (contacts, deals, tickets) in local DB.
     This table helps track new objects so that they can be retrieved
     via local endpoints (e.g. GET /api/new-crm-objects).
+    change_seq is drawn from a sequence on every insert and update, and is
+    the cursor for the change feed endpoints. A deferred trigger draws it
+    again while the writing transaction commits (under an advisory lock),
+    so change_seq order is commit order and a cursor never skips a row
+    that commits late.
+
+    The table is range-partitioned by month on created_date (see
+    CRMObjectPartitionService), so the primary key includes created_date.
     """
 
     __tablename__ = "created_crm_objects"
+    __table_args__ = (
+        db.Index(
+            "ix_created_crm_objects_type_external_id", "object_type", "external_id"
+        ),
+        db.Index("ix_created_crm_objects_type_created", "object_type", "created_date"),
+        db.Index("ix_created_crm_objects_type_updated", "object_type", "updated_date"),
+        # LIKE 'prefix%' on lower(name), e.g. deal name or email prefixes
+        db.Index(
+            "ix_created_crm_objects_name_prefix",
+            db.text("lower(name) text_pattern_ops"),
+        ),
+        # LIKE on the reversed name turns "ends with @domain" into a prefix match
+        db.Index(
+            "ix_created_crm_objects_name_suffix",
+            db.text("reverse(lower(name)) text_pattern_ops"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_date)"},
+    )
 
-    id = db.Column(db.Integer, primary_key=True)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     external_id = db.Column(db.String(128), nullable=False)  # e.g., HubSpot object ID
     object_type = db.Column(
         db.String(32), nullable=False
@@ -40,7 +70,10 @@ class CreatedCRMObject(db.Model):
         db.String(255), nullable=True
     )  # e.g., email or dealname or subject
     created_date = db.Column(
-        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+        db.DateTime,
+        primary_key=True,
+        nullable=False,
+        default=datetime.datetime.utcnow,
     )
     updated_date = db.Column(
         db.DateTime,
@@ -48,6 +81,195 @@ class CreatedCRMObject(db.Model):
         default=datetime.datetime.utcnow,
         onupdate=datetime.datetime.utcnow,
     )
+    change_seq = db.Column(
+        db.BigInteger,
+        change_seq_sequence,
+        server_default=change_seq_sequence.next_value(),
+        nullable=False,
+        index=True,
+    )
+    # Set by `flask hubspot reconcile` when HubSpot no longer has the object.
+    stale_date = db.Column(db.DateTime, nullable=True)
 
     def __repr__(self):
         return f"<CreatedCRMObject id={self.id}, type={self.object_type}, external_id={self.external_id}>"
+
+
+class CRMObjectCount(db.Model):
+    """
+    Maintained per-object_type row counts for created_crm_objects.
+    Updated in the same transaction as inserts into CreatedCRMObject so that
+    listing totals and stats can be served without a full count(*).
+    """
+
+    __tablename__ = "crm_object_counts"
+
+    object_type = db.Column(db.String(32), primary_key=True)
+    total = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_date = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+    )
+
+    def __repr__(self):
+        return f"<CRMObjectCount type={self.object_type} total={self.total}>"
+
+    @classmethod
+    def adjust(cls, object_type: str, delta: int):
+        """
+        Add delta to the counter for object_type, creating it if needed.
+        Runs in the caller's transaction, so it commits (or rolls back)
+        together with the row changes it accounts for.
+        """
+        stmt = pg_insert(cls).values(
+            object_type=object_type,
+            total=delta,
+            updated_date=datetime.datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.object_type],
+            set_={
+                "total": cls.total + stmt.excluded.total,
+                "updated_date": stmt.excluded.updated_date,
+            },
+        )
+        db.session.execute(stmt)
+
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || "
+    "translate(coalesce(name, ''), '@._-', '    ') || ' ' || "
+    "coalesce(properties->>'firstname', '') || ' ' || "
+    "coalesce(properties->>'lastname', '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(properties->>'content', '')), 'B')"
+)
+
+
+class CRMMirrorObject(db.Model):
+    """
+    Local copy of a HubSpot contact, deal or ticket, kept current by the
+    incremental sync (and webhook processing). Serves lookups and reporting
+    without a HubSpot round trip.
+    """
+
+    __tablename__ = "crm_mirror_objects"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "object_type", "hubspot_id", name="uq_crm_mirror_objects_type_hubspot_id"
+        ),
+        db.Index("ix_crm_mirror_objects_type_updated", "object_type", "hs_updated_at"),
+        db.Index(
+            "ix_crm_mirror_objects_name_prefix",
+            db.text("lower(name) text_pattern_ops"),
+        ),
+        db.Index(
+            "ix_crm_mirror_objects_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        # ix_crm_mirror_objects_name_trgm (gin_trgm_ops) is only created by the
+        # migration when the pg_trgm extension is available.
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    object_type = db.Column(db.String(32), nullable=False)
+    hubspot_id = db.Column(db.String(128), nullable=False)
+    name = db.Column(db.String(255), nullable=True)  # email, dealname or subject
+    properties = db.Column(JSONB, nullable=False, default=dict)
+    hs_created_at = db.Column(db.DateTime, nullable=True)
+    hs_updated_at = db.Column(db.DateTime, nullable=True)
+    archived = db.Column(db.Boolean, nullable=False, default=False)
+    synced_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+    )
+    # Name words (emails split on punctuation too) weigh more than ticket text.
+    search_vector = db.Column(
+        TSVECTOR,
+        db.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+    )
+
+    def __repr__(self):
+        return f"<CRMMirrorObject type={self.object_type} hubspot_id={self.hubspot_id}>"
+
+
+class SyncState(db.Model):
+    """
+    Per-object_type high-water mark of the incremental HubSpot sync:
+    the latest last-modified timestamp already applied to the mirror.
+    """
+
+    __tablename__ = "sync_states"
+
+    object_type = db.Column(db.String(32), primary_key=True)
+    high_water_mark = db.Column(db.DateTime, nullable=True)
+    last_run_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<SyncState type={self.object_type} hwm={self.high_water_mark}>"
+
+
+class WebhookEvent(db.Model):
+    """
+    Queue of received HubSpot webhook events. Rows are inserted as soon as a
+    delivery is verified and marked processed by the batch processor.
+    """
+
+    __tablename__ = "webhook_events"
+    __table_args__ = (
+        db.Index(
+            "ix_webhook_events_pending",
+            "id",
+            postgresql_where=db.text("processed_at IS NULL"),
+        ),
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    event_id = db.Column(db.BigInteger, nullable=True, unique=True)  # HubSpot eventId
+    subscription_type = db.Column(db.String(64), nullable=False)
+    object_type = db.Column(db.String(32), nullable=True)
+    object_id = db.Column(db.String(128), nullable=True)
+    occurred_at = db.Column(db.DateTime, nullable=True)
+    payload = db.Column(JSONB, nullable=False)
+    received_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<WebhookEvent id={self.id} type={self.subscription_type} object_id={self.object_id}>"
+
+
+class ImportCheckpoint(db.Model):
+    """
+    Progress of a `flask hubspot import` run. rows_done only advances over
+    chunks that finished in order, so a resumed run skips exactly the rows
+    already in the result file.
+    """
+
+    __tablename__ = "import_checkpoints"
+
+    job_id = db.Column(db.String(64), primary_key=True)  # file + type fingerprint
+    source = db.Column(db.String(1024), nullable=False)
+    object_type = db.Column(db.String(32), nullable=False)
+    rows_done = db.Column(db.BigInteger, nullable=False, default=0)
+    succeeded = db.Column(db.BigInteger, nullable=False, default=0)
+    failed = db.Column(db.BigInteger, nullable=False, default=0)
+    invalid = db.Column(db.BigInteger, nullable=False, default=0)
+    started_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+    )
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ImportCheckpoint job_id={self.job_id} rows_done={self.rows_done}>"
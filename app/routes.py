@@ -1,5 +1,11 @@
 from flask import Blueprint
+from .controllers.admin_controller import admin_bp
+from .controllers.async_hubspot_controller import async_hubspot_bp
+from .controllers.compound_controller import compound_bp
 from .controllers.hubspot_controller import hubspot_bp
+from .controllers.metrics_controller import metrics_bp
+from .controllers.search_controller import search_bp
+from .controllers.webhook_controller import webhook_bp
 
 
 def register_routes(app):
@@ -7,3 +13,9 @@ def register_routes(app):
     Register application Blueprints here.
     """
     app.register_blueprint(hubspot_bp, url_prefix="/api")
+    app.register_blueprint(search_bp, url_prefix="/api")
+    app.register_blueprint(webhook_bp, url_prefix="/api")
+    app.register_blueprint(async_hubspot_bp, url_prefix="/api/async")
+    app.register_blueprint(compound_bp, url_prefix="/api")
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(admin_bp, url_prefix="/api/admin")
@@ -1,5 +1,24 @@
-from marshmallow import Schema, fields, validate
-from app.utils.constants import VALID_CATEGORIES
+import datetime
+from marshmallow import (
+    Schema,
+    fields,
+    validate,
+    validates_schema,
+    pre_load,
+    post_load,
+    ValidationError,
+    EXCLUDE,
+)
+from app.utils.constants import (
+    VALID_CATEGORIES,
+    CRM_OBJECT_TYPES,
+    TOTAL_COUNT_MODES,
+    EXPORT_FORMATS,
+    CRM_OBJECT_FILTERS,
+    MAX_EXTERNAL_ID_FILTER,
+    SEARCH_MODES,
+    MAX_SEARCH_LIMIT,
+)
 
 
 class ContactSchema(Schema):
@@ -42,3 +61,150 @@ class TicketSchema(Schema):
     hs_pipeline_stage = fields.Str(required=True)
     contact_id = fields.Str(required=False)
     deal_id = fields.Str(required=False)
+
+
+class CompoundSchema(Schema):
+    """
+    Body of POST /api/compound: any of contact, deal and ticket.
+    A deal without contact_id is linked to the request's contact, and a
+    ticket without contact_id/deal_id to the request's contact and deal.
+    """
+
+    contact = fields.Nested(ContactSchema, load_default=None)
+    deal = fields.Nested(DealSchema, load_default=None)
+    ticket = fields.Nested(TicketSchema, load_default=None)
+
+    @validates_schema
+    def require_a_step(self, data, **kwargs):
+        if not any(data.get(step) for step in ("contact", "deal", "ticket")):
+            raise ValidationError("Provide at least one of contact, deal, ticket.")
+
+
+class CRMObjectTypeSchema(Schema):
+    """
+    objectType parameter shared by the local CRM object endpoints.
+    objectType is case-insensitive; unknown parameters are ignored.
+    """
+
+    class Meta:
+        unknown = EXCLUDE
+
+    object_type = fields.Str(
+        data_key="objectType",
+        load_default=None,
+        validate=validate.OneOf(CRM_OBJECT_TYPES),
+    )
+
+    @pre_load
+    def normalize_object_type(self, data, **kwargs):
+        data = dict(data)
+        object_type = (data.get("objectType") or "").lower()
+        if object_type:
+            data["objectType"] = object_type
+        else:
+            data.pop("objectType", None)
+        return data
+
+
+class CRMObjectFilterSchema(CRMObjectTypeSchema):
+    """
+    Filters for listing and exporting local CRM objects.
+    created_since/updated_since are inclusive, created_until exclusive.
+    external_id accepts a comma-separated list and/or repeated parameters.
+    Timestamps are normalized to naive UTC to match the stored columns.
+    """
+
+    created_since = fields.DateTime(load_default=None)
+    created_until = fields.DateTime(load_default=None)
+    updated_since = fields.DateTime(load_default=None)
+    name_prefix = fields.Str(load_default=None, validate=validate.Length(min=1))
+    email_domain = fields.Str(load_default=None, validate=validate.Length(min=1))
+    external_ids = fields.List(
+        fields.Str(validate=validate.Length(min=1, max=128)),
+        data_key="external_id",
+        load_default=None,
+        validate=validate.Length(max=MAX_EXTERNAL_ID_FILTER),
+    )
+
+    @pre_load
+    def normalize_object_type(self, data, **kwargs):
+        # Read repeated external_id parameters before the base hook flattens
+        # the MultiDict.
+        external_ids = (
+            data.getlist("external_id")
+            if hasattr(data, "getlist")
+            else data.get("external_id")
+        )
+        data = super().normalize_object_type(data, **kwargs)
+        if isinstance(external_ids, str):
+            external_ids = [external_ids]
+        if external_ids:
+            data["external_id"] = [
+                part.strip()
+                for value in external_ids
+                for part in value.split(",")
+                if part.strip()
+            ]
+        else:
+            data.pop("external_id", None)
+        return data
+
+    @post_load
+    def to_naive_utc(self, data, **kwargs):
+        for key, value in data.items():
+            if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+                data[key] = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return data
+
+    def filters(self, params: dict) -> dict:
+        """
+        The non-empty filter values from loaded params, minus object_type.
+        """
+        return {
+            key: params[key]
+            for key in CRM_OBJECT_FILTERS
+            if params.get(key) not in (None, [])
+        }
+
+
+class NewCRMObjectsQuerySchema(CRMObjectFilterSchema):
+    """
+    Query parameters for GET /api/new-crm-objects.
+    """
+
+    page = fields.Int(load_default=1, validate=validate.Range(min=1))
+    limit = fields.Int(load_default=10, validate=validate.Range(min=1))
+    total = fields.Str(load_default="exact", validate=validate.OneOf(TOTAL_COUNT_MODES))
+
+
+class CRMObjectExportQuerySchema(CRMObjectFilterSchema):
+    """
+    Query parameters for GET /api/new-crm-objects/export.
+    """
+
+    format = fields.Str(load_default="ndjson", validate=validate.OneOf(EXPORT_FORMATS))
+
+
+class CRMObjectChangesQuerySchema(CRMObjectTypeSchema):
+    """
+    Query parameters for the change feed endpoints.
+    after is the change_seq cursor returned by the previous call;
+    wait is how long a long-poll may block when nothing is new yet.
+    """
+
+    after = fields.Int(load_default=0, validate=validate.Range(min=0))
+    limit = fields.Int(load_default=100, validate=validate.Range(min=1, max=1000))
+    wait = fields.Float(load_default=0, validate=validate.Range(min=0))
+
+
+class SearchQuerySchema(CRMObjectTypeSchema):
+    """
+    Query parameters for GET /api/search over the local mirror.
+    """
+
+    q = fields.Str(required=True, validate=validate.Length(min=1, max=255))
+    mode = fields.Str(load_default="auto", validate=validate.OneOf(SEARCH_MODES))
+    limit = fields.Int(
+        load_default=20, validate=validate.Range(min=1, max=MAX_SEARCH_LIMIT)
+    )
+    include_archived = fields.Bool(load_default=False)
@@ -0,0 +1,325 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from flask import current_app
+
+from app.utils.constants import INLINE_ASSOCIATIONS, NAME_PROPERTY
+from app.utils.errors import BulkOperationError
+from .hubspot_service import HubSpotService
+from ..integrations.hubspot_async_api import AsyncHubSpotAPI
+
+
+COMPOUND_STEPS = {"contact": "contacts", "deal": "deals", "ticket": "tickets"}
+
+
+class DependencyFailedError(Exception):
+    """
+    A compound step could not run because a step it needs failed.
+    """
+
+
+class AssociationFailedError(Exception):
+    """
+    A compound step wrote its object to HubSpot but could not associate it.
+    .result is the written object, which is still reported and tracked.
+    """
+
+    def __init__(self, result: dict, cause: Exception):
+        super().__init__(f"association failed: {cause}")
+        self.result = result
+
+
+def _inline_associations(object_type: str, ids: Dict[str, str]) -> list:
+    """
+    Association inputs for creating object_type together with its links,
+    from {"contact_id": ..., "deal_id": ...} (missing IDs are skipped).
+    """
+    return [
+        {
+            "to": {"id": str(ids[field])},
+            "types": [
+                {
+                    "associationCategory": "HUBSPOT_DEFINED",
+                    "associationTypeId": type_id,
+                }
+            ],
+        }
+        for field, type_id in INLINE_ASSOCIATIONS[object_type].items()
+        if ids.get(field)
+    ]
+
+
+async def _result_id(step: str, task: asyncio.Task):
+    """
+    The HubSpot ID produced by an earlier compound step (None without one).
+    A step that wrote its object but failed to associate it still has one.
+    """
+    if task is None:
+        return None
+    try:
+        return (await task)["id"]
+    except AssociationFailedError as e:
+        return e.result["id"]
+    except Exception as e:
+        raise DependencyFailedError(f"{step} step failed: {e}") from e
+
+
+class AsyncHubSpotService:
+    """
+    asyncio counterpart of HubSpotService's write paths: the HubSpot calls of
+    upsert_contact, upsert_deal and create_ticket are awaited on one pooled
+    AsyncHubSpotAPI, so a bulk request keeps up to HUBSPOT_ASYNC_CONCURRENCY
+    items in flight on a single thread.
+
+    Token refresh and the local created_crm_objects bookkeeping stay
+    synchronous and go through HubSpotService; a bulk call records all of
+    its objects in one commit once HubSpot has answered.
+    """
+
+    def __init__(self):
+        self.hubspot_service = HubSpotService()
+
+    def _api_client(self) -> AsyncHubSpotAPI:
+        token = self.hubspot_service.oauth_service.get_access_token()
+        return AsyncHubSpotAPI(token)
+
+    async def upsert_contact(self, contact_data: dict) -> dict:
+        async with self._api_client() as api:
+            result = await self._upsert_contact(api, contact_data)
+        self._track("contacts", [(result, "email")])
+        return result
+
+    async def upsert_deal(self, deal_data: dict) -> dict:
+        async with self._api_client() as api:
+            result = await self._upsert_deal(api, deal_data)
+        self._track("deals", [(result, "dealname")])
+        return result
+
+    async def create_ticket(self, ticket_data: dict) -> dict:
+        async with self._api_client() as api:
+            result = await self._create_ticket(api, ticket_data)
+        self._track("tickets", [(result, "subject")])
+        return result
+
+    async def upsert_deals(
+        self, deals_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Concurrent upsert_deal for every deal; same result/error contract as
+        HubSpotService.upsert_deals.
+        """
+        return await self._run_bulk(self._upsert_deal, "deals", "dealname", deals_data)
+
+    async def create_tickets(
+        self, tickets_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Concurrent create_ticket for every ticket; same result/error contract
+        as HubSpotService.create_tickets.
+        """
+        return await self._run_bulk(
+            self._create_ticket, "tickets", "subject", tickets_data
+        )
+
+    async def _run_bulk(
+        self, operation, object_type: str, name_property: str, items: list
+    ) -> list:
+        semaphore = asyncio.Semaphore(
+            current_app.config.get("HUBSPOT_ASYNC_CONCURRENCY", 50)
+        )
+
+        async def run_one(api, item):
+            async with semaphore:
+                return await operation(api, item)
+
+        async with self._api_client() as api:
+            outcomes = await asyncio.gather(
+                *(run_one(api, item) for item in items), return_exceptions=True
+            )
+
+        results, errors = [], []
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                current_app.logger.warning("Bulk item failed: %s", outcome)
+                results.append(None)
+                errors.append({"index": index, "error": str(outcome)})
+            else:
+                results.append(outcome)
+        self._track(
+            object_type, [(result, name_property) for result in results if result]
+        )
+        if errors:
+            raise BulkOperationError(results=results, errors=errors)
+        return results
+
+    async def compound(self, graph: Dict[str, dict]) -> Dict[str, Any]:
+        """
+        Upsert a contact, upsert a deal and create a ticket in one go
+        (any subset, see CompoundSchema), running each step as soon as
+        the steps it depends on are done:
+
+          contact: lookup -> create/update
+          deal:    lookup (alongside the contact's) -> update, or create
+                   with the contact association inline once the contact
+                   exists
+          ticket:  create with contact and deal associations inline, once
+                   both exist
+
+        Returns {"contact": ..., "deal": ..., "ticket": ...}. If any step
+        fails the others still finish; BulkOperationError then carries
+        those results (None for failed steps) and {"step", "error"} per
+        failure.
+        """
+        async with self._api_client() as api:
+            tasks = {}
+            if graph.get("contact"):
+                tasks["contact"] = asyncio.create_task(
+                    self._upsert_contact(api, graph["contact"])
+                )
+            if graph.get("deal"):
+                tasks["deal"] = asyncio.create_task(
+                    self._compound_deal(api, graph["deal"], tasks.get("contact"))
+                )
+            if graph.get("ticket"):
+                tasks["ticket"] = asyncio.create_task(
+                    self._compound_ticket(
+                        api, graph["ticket"], tasks.get("contact"), tasks.get("deal")
+                    )
+                )
+            outcomes = dict(
+                zip(
+                    tasks,
+                    await asyncio.gather(*tasks.values(), return_exceptions=True),
+                )
+            )
+
+        results, errors = {}, []
+        for step, outcome in outcomes.items():
+            if isinstance(outcome, AssociationFailedError):
+                current_app.logger.warning("Compound %s step failed: %s", step, outcome)
+                results[step] = outcome.result
+                errors.append({"step": step, "error": str(outcome)})
+                self._track(
+                    COMPOUND_STEPS[step],
+                    [(outcome.result, NAME_PROPERTY[COMPOUND_STEPS[step]])],
+                )
+            elif isinstance(outcome, Exception):
+                current_app.logger.warning("Compound %s step failed: %s", step, outcome)
+                results[step] = None
+                errors.append({"step": step, "error": str(outcome)})
+            else:
+                results[step] = outcome
+                self._track(
+                    COMPOUND_STEPS[step],
+                    [(outcome, NAME_PROPERTY[COMPOUND_STEPS[step]])],
+                )
+        if errors:
+            raise BulkOperationError(results=results, errors=errors)
+        return results
+
+    @staticmethod
+    async def _compound_deal(api, deal_data: dict, contact_task) -> dict:
+        properties = {
+            k: v for k, v in deal_data.items() if k not in INLINE_ASSOCIATIONS["deals"]
+        }
+        existing = await api.find_deal_by_name(deal_data["dealname"])
+        if existing:
+            # The update does not need the contact; only the association does.
+            # Once the update has gone out, a failed contact step or link
+            # still leaves the deal updated, so it is reported as such.
+            result, contact_id = await asyncio.gather(
+                api.update_deal(existing["id"], properties),
+                _result_id(
+                    "contact", None if "contact_id" in deal_data else contact_task
+                ),
+                return_exceptions=True,
+            )
+            if isinstance(result, BaseException):
+                raise result
+            try:
+                if isinstance(contact_id, BaseException):
+                    raise contact_id
+                contact_id = deal_data.get("contact_id") or contact_id
+                if contact_id:
+                    await api.associate_contact_and_deal(contact_id, result["id"])
+            except Exception as e:
+                raise AssociationFailedError(result, e) from e
+            return result
+
+        contact_id = deal_data.get("contact_id") or await _result_id(
+            "contact", contact_task
+        )
+        return await api.create_deal(
+            properties, _inline_associations("deals", {"contact_id": contact_id})
+        )
+
+    @staticmethod
+    async def _compound_ticket(api, ticket_data: dict, contact_task, deal_task):
+        properties = {
+            k: v
+            for k, v in ticket_data.items()
+            if k not in INLINE_ASSOCIATIONS["tickets"]
+        }
+        contact_id, deal_id = await asyncio.gather(
+            _result_id(
+                "contact", None if "contact_id" in ticket_data else contact_task
+            ),
+            _result_id("deal", None if "deal_id" in ticket_data else deal_task),
+        )
+        ids = {
+            "contact_id": ticket_data.get("contact_id") or contact_id,
+            "deal_id": ticket_data.get("deal_id") or deal_id,
+        }
+        return await api.create_ticket(properties, _inline_associations("tickets", ids))
+
+    def _track(self, object_type: str, results: List[Tuple[dict, str]]):
+        self.hubspot_service._store_created_crm_objects(
+            object_type,
+            {
+                str(result["id"]): result["properties"].get(name_property, "")
+                for result, name_property in results
+            },
+        )
+
+    @staticmethod
+    async def _upsert_contact(api: AsyncHubSpotAPI, contact_data: dict) -> dict:
+        existing = await api.find_contact_by_email(contact_data["email"])
+        if existing:
+            return await api.update_contact(existing["id"], contact_data)
+        return await api.create_contact(contact_data)
+
+    @staticmethod
+    async def _upsert_deal(api: AsyncHubSpotAPI, deal_data: dict) -> dict:
+        existing = await api.find_deal_by_name(deal_data["dealname"])
+        if existing:
+            result = await api.update_deal(existing["id"], deal_data)
+        else:
+            result = await api.create_deal(deal_data)
+        if "contact_id" in deal_data:
+            await api.associate_contact_and_deal(deal_data["contact_id"], result["id"])
+        return result
+
+    @staticmethod
+    async def _create_ticket(api: AsyncHubSpotAPI, ticket_data: dict) -> dict:
+        created = await api.create_ticket(ticket_data)
+        associations = []
+        if "contact_id" in ticket_data:
+            associations.append(
+                api.associate_ticket_with_contact(
+                    created["id"], ticket_data["contact_id"]
+                )
+            )
+        if "deal_id" in ticket_data:
+            associations.append(
+                api.associate_ticket_with_deal(created["id"], ticket_data["deal_id"])
+            )
+        # The two associations are independent, so they go out together.
+        for outcome in await asyncio.gather(*associations, return_exceptions=True):
+            if isinstance(outcome, httpx.HTTPError):
+                current_app.logger.warning(
+                    "Failed to associate ticket: %s", str(outcome)
+                )
+            elif isinstance(outcome, Exception):
+                raise outcome
+        return created
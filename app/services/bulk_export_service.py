@@ -0,0 +1,330 @@
+import datetime
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List
+
+from flask import current_app
+
+from app.utils.constants import HUBSPOT_SEARCH_MAX_RESULTS, MIRROR_PROPERTIES
+from .oauth_service import HubspotOAuthService
+from .sync_service import _epoch_millis, _parse_timestamp
+from ..integrations.hubspot_api import HubSpotAPI
+
+MANIFEST_NAME = "_manifest.json"
+CREATED_PROPERTY = "createdate"
+
+# Records buffered per Parquet row group.
+_PARQUET_ROW_GROUP = 5000
+
+
+def _millis(value: datetime.datetime) -> int:
+    return int(_epoch_millis(value))
+
+
+def _range_key(start: int, end: int) -> str:
+    return f"{start}-{end}"
+
+
+class _NDJSONWriter:
+    def __init__(self, path: str, properties: List[str]):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]):
+        for record in records:
+            self._file.write(json.dumps(record, default=str))
+            self._file.write("\n")
+
+    def close(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+class _ParquetWriter:
+    """
+    One flat column per requested property (strings, as HubSpot returns
+    them), plus id/createdAt/updatedAt/archived. Rows are buffered into row
+    groups so memory stays bounded.
+    """
+
+    def __init__(self, path: str, properties: List[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export needs the optional pyarrow package "
+                "(pip install pyarrow)."
+            ) from e
+        self._pa = pa
+        self._properties = properties
+        self._schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("createdAt", pa.string()),
+                ("updatedAt", pa.string()),
+                ("archived", pa.bool_()),
+            ]
+            + [(name, pa.string()) for name in properties]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+        self._buffer = []
+
+    def write(self, records: List[Dict[str, Any]]):
+        self._buffer.extend(records)
+        if len(self._buffer) >= _PARQUET_ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        columns = {
+            "id": [str(r["id"]) for r in self._buffer],
+            "createdAt": [r.get("createdAt") for r in self._buffer],
+            "updatedAt": [r.get("updatedAt") for r in self._buffer],
+            "archived": [bool(r.get("archived", False)) for r in self._buffer],
+        }
+        for name in self._properties:
+            columns[name] = [
+                (r.get("properties") or {}).get(name) for r in self._buffer
+            ]
+        self._writer.write_table(
+            self._pa.Table.from_pydict(columns, schema=self._schema)
+        )
+        self._buffer = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+_WRITERS = {"ndjson": (_NDJSONWriter, "ndjson"), "parquet": (_ParquetWriter, "parquet")}
+
+
+class HubSpotBulkExportService:
+    """
+    Exports every contact, deal or ticket from HubSpot into part files.
+
+    The createdate range is cut into slices that are paged concurrently
+    (each HubSpot call still draws from the shared rate limiter). HubSpot
+    search stops at 10,000 results per query, so a slice whose first page
+    reports more than that is halved until each half fits.
+
+    Each finished slice is recorded in <output_dir>/_manifest.json, and its
+    file only appears under its final name once complete. A rerun with the
+    same arguments skips the slices already recorded.
+    """
+
+    def __init__(self, concurrency: int = None, page_size: int = None):
+        self.concurrency = (
+            concurrency or current_app.config["HUBSPOT_EXPORT_CONCURRENCY"]
+        )
+        self.page_size = page_size or current_app.config["HUBSPOT_EXPORT_PAGE_SIZE"]
+
+    @staticmethod
+    def _api_client() -> HubSpotAPI:
+        token = HubspotOAuthService().get_access_token()
+        return HubSpotAPI(token)
+
+    def run(
+        self,
+        object_type: str,
+        output_dir: str,
+        fmt: str = "ndjson",
+        since: datetime.datetime = None,
+        until: datetime.datetime = None,
+        slices: int = None,
+        properties: List[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Export objects created in [since, until) and return summary stats.
+        since defaults to the oldest object's createdate, until to now.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        properties = list(properties or MIRROR_PROPERTIES[object_type])
+        manifest = self._load_manifest(output_dir)
+
+        if manifest is None:
+            if since is None:
+                since = self._oldest_createdate(object_type)
+            until = until or datetime.datetime.utcnow()
+            manifest = {
+                "object_type": object_type,
+                "format": fmt,
+                "properties": properties,
+                "since": _millis(since) if since else None,
+                "until": _millis(until),
+                "slices": slices or self.concurrency * 2,
+                "completed": {},
+            }
+            self._save_manifest(output_dir, manifest)
+        elif (manifest["object_type"], manifest["format"]) != (object_type, fmt):
+            raise ValueError(
+                f"{output_dir} holds a {manifest['format']} export of "
+                f"{manifest['object_type']}; use another directory."
+            )
+        else:
+            current_app.logger.info(
+                "Resuming export into %s: %d range(s) already done.",
+                output_dir,
+                len(manifest["completed"]),
+            )
+
+        if manifest["since"] is None:
+            return self._summary(manifest)
+
+        # Slice boundaries come from the manifest so a resumed run produces
+        # the same range keys.
+        start, end = manifest["since"], manifest["until"]
+        step = max(1, -(-(end - start) // manifest["slices"]))
+        pending = [(lo, min(lo + step, end)) for lo in range(start, end, step)]
+
+        app = current_app._get_current_object()
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="hubspot-export"
+        ) as pool:
+            in_flight = {}
+            while pending or in_flight:
+                while pending and len(in_flight) < self.concurrency:
+                    lo, hi = pending.pop(0)
+                    if _range_key(lo, hi) in manifest["completed"]:
+                        continue
+                    future = pool.submit(
+                        self._export_range, app, manifest, output_dir, lo, hi
+                    )
+                    in_flight[future] = (lo, hi)
+                if not in_flight:
+                    continue
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lo, hi = in_flight.pop(future)
+                    result = future.result()
+                    if "split" in result:
+                        pending = result["split"] + pending
+                        continue
+                    manifest["completed"][_range_key(lo, hi)] = result
+                    self._save_manifest(output_dir, manifest)
+
+        return self._summary(manifest)
+
+    def _export_range(
+        self, app, manifest: Dict[str, Any], output_dir: str, start: int, end: int
+    ) -> Dict[str, Any]:
+        """
+        Worker: page through one createdate slice into its own file.
+        Returns {"split": [...]} instead when the slice is too big for one
+        search query.
+        """
+        object_type = manifest["object_type"]
+        writer_cls, extension = _WRITERS[manifest["format"]]
+        name = f"{object_type}-{start}-{end}.{extension}"
+        path = os.path.join(output_dir, name)
+        partial = f"{path}.partial"
+
+        with app.app_context():
+            api = self._api_client()
+            filter_groups = [
+                {
+                    "filters": [
+                        {
+                            "propertyName": CREATED_PROPERTY,
+                            "operator": "GTE",
+                            "value": str(start),
+                        },
+                        {
+                            "propertyName": CREATED_PROPERTY,
+                            "operator": "LT",
+                            "value": str(end),
+                        },
+                    ]
+                }
+            ]
+            sorts = [{"propertyName": CREATED_PROPERTY, "direction": "ASCENDING"}]
+
+            writer, rows, after = None, 0, None
+            try:
+                while True:
+                    data = api.search_objects(
+                        object_type,
+                        filter_groups=filter_groups,
+                        properties=manifest["properties"],
+                        sorts=sorts,
+                        after=after,
+                        limit=self.page_size,
+                    )
+                    if writer is None:
+                        total = data.get("total", 0)
+                        if total > HUBSPOT_SEARCH_MAX_RESULTS and end - start > 1:
+                            mid = start + (end - start) // 2
+                            return {"split": [(start, mid), (mid, end)]}
+                        writer = writer_cls(partial, manifest["properties"])
+                    results = data.get("results", [])
+                    writer.write(results)
+                    rows += len(results)
+
+                    after = data.get("paging", {}).get("next", {}).get("after")
+                    if not after or int(after) >= HUBSPOT_SEARCH_MAX_RESULTS:
+                        if after:
+                            current_app.logger.error(
+                                "Export range %s of %s truncated at %d objects.",
+                                _range_key(start, end),
+                                object_type,
+                                rows,
+                            )
+                        break
+            except BaseException:
+                if writer is not None:
+                    writer.close()
+                    os.remove(partial)
+                raise
+
+            writer.close()
+            os.replace(partial, path)
+            current_app.logger.info(
+                "Exported %d %s created in range %s.",
+                rows,
+                object_type,
+                _range_key(start, end),
+            )
+            return {"file": name, "rows": rows}
+
+    def _oldest_createdate(self, object_type: str):
+        data = self._api_client().search_objects(
+            object_type,
+            filter_groups=[],
+            properties=[CREATED_PROPERTY],
+            sorts=[{"propertyName": CREATED_PROPERTY, "direction": "ASCENDING"}],
+            limit=1,
+        )
+        results = data.get("results", [])
+        return _parse_timestamp(results[0].get("createdAt")) if results else None
+
+    @staticmethod
+    def _load_manifest(output_dir: str):
+        path = os.path.join(output_dir, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _save_manifest(output_dir: str, manifest: Dict[str, Any]):
+        """
+        Write-then-rename, so a crash never leaves a torn manifest.
+        """
+        path = os.path.join(output_dir, MANIFEST_NAME)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def _summary(manifest: Dict[str, Any]) -> Dict[str, Any]:
+        completed = manifest["completed"].values()
+        return {
+            "ranges": len(manifest["completed"]),
+            "rows": sum(r["rows"] for r in completed),
+            "files": sorted(r["file"] for r in completed),
+        }
@@ -1,12 +1,23 @@
 from flask import current_app
 from requests.exceptions import RequestException
+from sqlalchemy import select, text
 import datetime
 
-from app.models import CreatedCRMObject, db
-from app.utils.errors import BaseError
+from app.models import CreatedCRMObject, CRMObjectCount, change_seq_sequence, db
+from app.utils.concurrency import map_in_app_context
+from app.utils.errors import BaseError, BulkOperationError
+from app.utils.request_stats import span
 from .oauth_service import HubspotOAuthService
 from ..integrations.hubspot_api import HubSpotAPI
-from typing import List, Dict
+from typing import Any, Dict, Iterator, List
+
+
+def _escape_like(value: str) -> str:
+    """
+    Escape LIKE wildcards so user input only ever matches literally.
+    Backslash is Postgres' default LIKE escape character.
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 class HubSpotService:
@@ -114,56 +125,214 @@ class HubSpotService:
 
     def upsert_deals(self, deals_data: List[Dict[str, any]]) -> List[Dict[str, any]]:
         """
-        Accepts a list of deals, upserts each one, returns a list of results.
+        Accepts a list of deals, upserts each one, returns a list of results
+        in input order. See _run_bulk for concurrency and error handling.
         """
-        results = []
-        for deal_data in deals_data:
-            single_result = self.upsert_deal(deal_data)
-            results.append(single_result)
-        return results
+        return self._run_bulk("upsert_deal", deals_data)
 
     def create_tickets(
         self, tickets_data: List[Dict[str, any]]
     ) -> List[Dict[str, any]]:
         """
-        Accepts a list of tickets, creates each one, returns a list of results.
+        Accepts a list of tickets, creates each one, returns a list of results
+        in input order. See _run_bulk for concurrency and error handling.
+        """
+        return self._run_bulk("create_ticket", tickets_data)
+
+    def _run_bulk(self, method_name: str, items: List[Dict[str, any]]) -> list:
+        """
+        Apply a single-item method to every item. With HUBSPOT_BULK_CONCURRENCY
+        above 1, items are spread over that many threads, each with its own
+        app context, DB session and HubSpotService; HubSpot calls still share
+        the process-wide rate limiter.
+
+        Every item is attempted. If any fail, BulkOperationError carries the
+        results (None for failures) and the per-item errors.
         """
-        results = []
-        for ticket_data in tickets_data:
-            single_ticket = self.create_ticket(ticket_data)
-            results.append(single_ticket)
+        concurrency = current_app.config.get("HUBSPOT_BULK_CONCURRENCY", 1)
+        if concurrency > 1 and len(items) > 1:
+            outcomes = map_in_app_context(
+                lambda item: getattr(HubSpotService(), method_name)(item),
+                items,
+                concurrency,
+                thread_name_prefix="hubspot-bulk",
+            )
+        else:
+            outcomes = []
+            for item in items:
+                try:
+                    outcomes.append((getattr(self, method_name)(item), None))
+                except Exception as e:
+                    # Leave the session usable for the next item.
+                    db.session.rollback()
+                    current_app.logger.warning("Bulk item failed: %s", e)
+                    outcomes.append((None, e))
+
+        results = [result for result, _ in outcomes]
+        errors = [
+            {"index": index, "error": str(error)}
+            for index, (_, error) in enumerate(outcomes)
+            if error is not None
+        ]
+        if errors:
+            raise BulkOperationError(results=results, errors=errors)
         return results
 
-    def get_new_objects_from_db(self, object_type: str, page: int = 1, limit: int = 10):
+    def get_new_objects_from_db(
+        self,
+        object_type: str,
+        page: int = 1,
+        limit: int = 10,
+        total_mode: str = "exact",
+        filters: Dict[str, Any] = None,
+    ):
         """
-        Retrieves newly created CRM objects from local DB, filtered by object_type if provided.
+        Retrieves newly created CRM objects from local DB, filtered by object_type
+        and any of the CRM_OBJECT_FILTERS if provided.
         Returns a list of local records and the total count.
         Pagination is offset-based: offset = (page-1)*limit
+
+        total_mode controls how the total is computed:
+          - "exact": read from the maintained crm_object_counts table (O(1)),
+            or count(*) when filters beyond object_type are applied
+          - "estimated": planner row estimate for the filtered query
+          - "none": skip counting, total is None
         """
-        query = CreatedCRMObject.query
-        if object_type:
-            query = query.filter_by(object_type=object_type)
+        query = self._apply_filters(CreatedCRMObject.query, object_type, filters)
+
+        if total_mode == "none":
+            total = None
+        elif total_mode == "estimated":
+            total = self._estimate_row_count(query)
+        elif filters:
+            total = query.count()
+        else:
+            total = self._counted_total(object_type)
 
-        total = query.count()
         offset = (page - 1) * limit
         results = query.offset(offset).limit(limit).all()
 
         # Convert each CreatedCRMObject to a dict
-        data = []
-        for obj in results:
-            data.append(
-                {
-                    "id": obj.id,
-                    "external_id": obj.external_id,
-                    "object_type": obj.object_type,
-                    "name": obj.name,
-                    "created_date": obj.created_date.isoformat(),
-                    "updated_date": obj.updated_date.isoformat(),
-                }
-            )
+        data = [self._serialize_crm_object(obj) for obj in results]
 
         return data, total
 
+    def iter_objects_from_db(
+        self,
+        object_type: str = None,
+        filters: Dict[str, Any] = None,
+        batch_size: int = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields every matching CreatedCRMObject as a dict, ordered by id.
+        Rows are read through a server-side cursor batch_size at a time,
+        so memory stays flat regardless of how many rows match.
+        """
+        batch_size = batch_size or current_app.config["CRM_EXPORT_BATCH_SIZE"]
+        stmt = self._apply_filters(
+            select(CreatedCRMObject).order_by(CreatedCRMObject.id),
+            object_type,
+            filters,
+        )
+
+        stmt = stmt.execution_options(yield_per=batch_size)
+        for obj in db.session.scalars(stmt):
+            yield self._serialize_crm_object(obj)
+
+    @staticmethod
+    def _apply_filters(stmt, object_type: str = None, filters: Dict[str, Any] = None):
+        """
+        Add WHERE clauses for object_type and CRM_OBJECT_FILTERS to a Query or
+        Select. Each filter matches one of the created_crm_objects indexes:
+        (object_type, created_date/updated_date/external_id), lower(name)
+        text_pattern_ops for name_prefix, and reverse(lower(name))
+        text_pattern_ops for email_domain.
+        """
+        filters = filters or {}
+        model = CreatedCRMObject
+        if object_type:
+            stmt = stmt.where(model.object_type == object_type)
+        if filters.get("created_since"):
+            stmt = stmt.where(model.created_date >= filters["created_since"])
+        if filters.get("created_until"):
+            stmt = stmt.where(model.created_date < filters["created_until"])
+        if filters.get("updated_since"):
+            stmt = stmt.where(model.updated_date >= filters["updated_since"])
+        if filters.get("name_prefix"):
+            pattern = _escape_like(filters["name_prefix"].lower()) + "%"
+            stmt = stmt.where(db.func.lower(model.name).like(pattern))
+        if filters.get("email_domain"):
+            domain = "@" + filters["email_domain"].lower().lstrip("@")
+            pattern = _escape_like(domain[::-1]) + "%"
+            stmt = stmt.where(db.func.reverse(db.func.lower(model.name)).like(pattern))
+        if filters.get("external_ids"):
+            stmt = stmt.where(model.external_id.in_(filters["external_ids"]))
+        return stmt
+
+    def get_changes_after(
+        self, after: int = 0, object_type: str = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Objects inserted or updated after the change_seq cursor `after`,
+        oldest first. Each dict carries its change_seq for the next cursor.
+        """
+        query = CreatedCRMObject.query.filter(CreatedCRMObject.change_seq > after)
+        if object_type:
+            query = query.filter_by(object_type=object_type)
+        results = query.order_by(CreatedCRMObject.change_seq).limit(limit).all()
+
+        changes = []
+        for obj in results:
+            change = self._serialize_crm_object(obj)
+            change["change_seq"] = obj.change_seq
+            changes.append(change)
+        return changes
+
+    @staticmethod
+    def _serialize_crm_object(obj: CreatedCRMObject) -> Dict[str, Any]:
+        return {
+            "id": obj.id,
+            "external_id": obj.external_id,
+            "object_type": obj.object_type,
+            "name": obj.name,
+            "created_date": obj.created_date.isoformat(),
+            "updated_date": obj.updated_date.isoformat(),
+        }
+
+    def get_object_counts(self) -> Dict[str, int]:
+        """
+        Returns the maintained per-object_type counts, e.g. {"contacts": 12, ...}.
+        One primary-key-sized table read; never scans created_crm_objects.
+        """
+        rows = CRMObjectCount.query.order_by(CRMObjectCount.object_type).all()
+        return {row.object_type: int(row.total) for row in rows}
+
+    def _counted_total(self, object_type: str = None) -> int:
+        """
+        Total tracked objects for object_type (or all types) from crm_object_counts.
+        """
+        query = db.session.query(db.func.coalesce(db.func.sum(CRMObjectCount.total), 0))
+        if object_type:
+            query = query.filter(CRMObjectCount.object_type == object_type)
+        return int(query.scalar())
+
+    def _estimate_row_count(self, query) -> int:
+        """
+        Ask the Postgres planner how many rows the query would return,
+        without executing it. Accuracy depends on ANALYZE statistics.
+        """
+        # render_postcompile expands IN-lists (e.g. external_ids) into one
+        # placeholder per value, which exec_driver_sql needs.
+        compiled = query.statement.compile(
+            dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        plan = (
+            db.session.connection()
+            .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            .scalar()
+        )
+        return int(plan[0]["Plan"]["Plan Rows"])
+
     # __OPTIONAL: STILL CALL HUBSPOT
     def get_new_objects(
         self, object_type: str, limit: int = 10, after: str = None
@@ -181,19 +350,69 @@ class HubSpotService:
         Insert or update a record in CreatedCRMObject for the newly
         created/updated CRM object. If it already exists by external_id,
         update the name/updated_date.
+        New rows also bump the crm_object_counts counter in the same commit.
+        Every write takes a fresh change_seq and publishes a NOTIFY, which
+        Postgres delivers to change feed listeners only once we commit.
         """
-        existing = CreatedCRMObject.query.filter_by(
-            external_id=external_id, object_type=object_type
-        ).first()
-        if existing:
-            existing.name = name
-            existing.updated_date = datetime.datetime.utcnow()
-        else:
-            new_obj = CreatedCRMObject(
-                external_id=external_id,
-                object_type=object_type,
-                name=name,
+        with span("store"):
+            existing = CreatedCRMObject.query.filter_by(
+                external_id=external_id, object_type=object_type
+            ).first()
+            if existing:
+                existing.name = name
+                existing.updated_date = datetime.datetime.utcnow()
+                existing.change_seq = change_seq_sequence.next_value()
+            else:
+                new_obj = CreatedCRMObject(
+                    external_id=external_id,
+                    object_type=object_type,
+                    name=name,
+                )
+                db.session.add(new_obj)
+                CRMObjectCount.adjust(object_type, 1)
+
+            db.session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {
+                    "channel": current_app.config["CRM_CHANGE_FEED_CHANNEL"],
+                    "payload": object_type,
+                },
             )
-            db.session.add(new_obj)
+            db.session.commit()
 
-        db.session.commit()
+    def _store_created_crm_objects(self, object_type: str, objects: Dict[str, str]):
+        """
+        Batch version of _store_created_crm_object for {external_id: name}:
+        one SELECT for the rows already tracked, one counter adjustment and
+        one NOTIFY for the whole batch, in a single commit.
+        """
+        if not objects:
+            return
+        with span("store"):
+            pending = dict(objects)
+            now = datetime.datetime.utcnow()
+            existing = CreatedCRMObject.query.filter(
+                CreatedCRMObject.object_type == object_type,
+                CreatedCRMObject.external_id.in_(list(pending)),
+            ).all()
+            for obj in existing:
+                obj.name = pending.pop(obj.external_id, obj.name)
+                obj.updated_date = now
+                obj.change_seq = change_seq_sequence.next_value()
+            db.session.add_all(
+                CreatedCRMObject(
+                    external_id=external_id, object_type=object_type, name=name
+                )
+                for external_id, name in pending.items()
+            )
+            if pending:
+                CRMObjectCount.adjust(object_type, len(pending))
+
+            db.session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {
+                    "channel": current_app.config["CRM_CHANGE_FEED_CHANNEL"],
+                    "payload": object_type,
+                },
+            )
+            db.session.commit()
@@ -0,0 +1,335 @@
+import csv
+import datetime
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Tuple
+
+from flask import current_app
+from marshmallow import ValidationError
+from requests.exceptions import RequestException
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models import ImportCheckpoint, db
+from app.schemas.hubspot_schema import ContactSchema, DealSchema, TicketSchema
+from app.utils.constants import HUBSPOT_BATCH_LIMIT, INLINE_ASSOCIATIONS, NAME_PROPERTY
+from app.utils.errors import BaseError
+from .hubspot_service import HubSpotService
+from .oauth_service import HubspotOAuthService
+from ..integrations.hubspot_api import HubSpotAPI
+
+IMPORT_SCHEMAS = {
+    "contacts": ContactSchema,
+    "deals": DealSchema,
+    "tickets": TicketSchema,
+}
+
+RESULT_FIELDS = ["row", "status", "hubspot_id", "error"]
+
+
+def _file_format(path: str, fmt: str = None) -> str:
+    if fmt:
+        return fmt
+    return "ndjson" if path.lower().endswith((".ndjson", ".jsonl")) else "csv"
+
+
+def _job_id(path: str, object_type: str) -> str:
+    """
+    Fingerprint of the input: the same unchanged file imported as the same
+    type resumes the same checkpoint; an edited file starts a new one.
+    """
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{object_type}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class HubSpotImportService:
+    """
+    Streams a CSV or NDJSON file of contacts, deals or tickets into HubSpot
+    through the batch endpoints.
+
+    Rows are read one at a time, validated with the same schemas as the API,
+    and grouped into chunks of up to 100 valid rows. Chunks are sent from a
+    bounded thread pool; every HubSpot call still goes through the shared
+    rate limiter. Results are written, and the checkpoint in
+    import_checkpoints advanced, strictly in file order, so after a crash the
+    run resumes right after the last chunk recorded in the result file.
+
+    Delivery on resume is at-least-once: chunks that reached HubSpot but were
+    not yet recorded are sent again. Contacts are upserted on email, so that
+    is harmless for them; deals and tickets have no unique key to upsert on
+    and can be created twice.
+    """
+
+    def __init__(self, concurrency: int = None, chunk_size: int = HUBSPOT_BATCH_LIMIT):
+        self.concurrency = (
+            concurrency or current_app.config["HUBSPOT_IMPORT_CONCURRENCY"]
+        )
+        self.chunk_size = max(1, min(chunk_size, HUBSPOT_BATCH_LIMIT))
+
+    @staticmethod
+    def _api_client() -> HubSpotAPI:
+        # Built per chunk inside the worker's app context, so the auth record
+        # belongs to that thread's session.
+        token = HubspotOAuthService().get_access_token()
+        return HubSpotAPI(token)
+
+    def run(
+        self,
+        path: str,
+        object_type: str,
+        fmt: str = None,
+        results_path: str = None,
+        restart: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Import `path` and return the final checkpoint counters.
+        """
+        fmt = _file_format(path, fmt)
+        results_path = results_path or f"{path}.results.csv"
+        checkpoint = self._checkpoint(path, object_type, restart)
+        skip_rows = checkpoint.rows_done
+        if skip_rows:
+            current_app.logger.info(
+                "Resuming import of %s after row %d.", path, skip_rows
+            )
+
+        app = current_app._get_current_object()
+        append = skip_rows > 0 and os.path.exists(results_path)
+        window = self.concurrency * 2
+        in_flight, finished = {}, {}
+        next_seq = 0
+
+        pool = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="hubspot-import"
+        )
+        with open(results_path, "a" if append else "w", newline="") as out, pool:
+            writer = csv.writer(out)
+            if not append:
+                writer.writerow(RESULT_FIELDS)
+
+            def collect():
+                nonlocal next_seq
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    seq, chunk = in_flight.pop(future)
+                    finished[seq] = (chunk, future.result())
+                next_seq = self._flush(writer, out, checkpoint, finished, next_seq)
+
+            chunks = self._chunks(self._read_rows(path, fmt, skip_rows), object_type)
+            for seq, chunk in enumerate(chunks):
+                # Out-of-order completions wait in `finished`, so bound both.
+                while len(in_flight) + len(finished) >= window:
+                    collect()
+                in_flight[pool.submit(self._send_chunk, app, object_type, chunk)] = (
+                    seq,
+                    chunk,
+                )
+            while in_flight:
+                collect()
+
+        checkpoint.completed_at = datetime.datetime.utcnow()
+        db.session.commit()
+        return {
+            "rows": checkpoint.rows_done,
+            "succeeded": checkpoint.succeeded,
+            "failed": checkpoint.failed,
+            "invalid": checkpoint.invalid,
+            "results": results_path,
+        }
+
+    @staticmethod
+    def _checkpoint(path: str, object_type: str, restart: bool) -> ImportCheckpoint:
+        job_id = _job_id(path, object_type)
+        checkpoint = db.session.get(ImportCheckpoint, job_id)
+        if checkpoint is not None and restart:
+            db.session.delete(checkpoint)
+            db.session.flush()
+            checkpoint = None
+        if checkpoint is None:
+            checkpoint = ImportCheckpoint(
+                job_id=job_id,
+                source=os.path.abspath(path),
+                object_type=object_type,
+                rows_done=0,
+                succeeded=0,
+                failed=0,
+                invalid=0,
+            )
+            db.session.add(checkpoint)
+        checkpoint.completed_at = None
+        db.session.commit()
+        return checkpoint
+
+    @staticmethod
+    def _read_rows(
+        path: str, fmt: str, skip_rows: int = 0
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Yield (row number, raw row) lazily, starting after skip_rows. Row
+        numbers count data records from 1 (the CSV header is not a row).
+        A line that is not valid JSON is yielded as the exception.
+        """
+        with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+            if fmt == "csv":
+                records = csv.DictReader(f)
+            else:
+                records = (line for line in f if line.strip())
+            for number, record in enumerate(records, start=1):
+                if number <= skip_rows:
+                    continue
+                if fmt == "ndjson":
+                    try:
+                        record = json.loads(record)
+                    except ValueError as e:
+                        record = e
+                yield number, record
+
+    def _chunks(
+        self, rows: Iterator[Tuple[int, Any]], object_type: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Validate rows and group them into chunks of up to chunk_size valid
+        rows. Invalid rows ride along with the chunk they were read in, so
+        each chunk covers a contiguous range of the file.
+        """
+        schema = IMPORT_SCHEMAS[object_type]()
+        chunk = {"last_row": 0, "items": [], "invalid": []}
+        for number, record in rows:
+            chunk["last_row"] = number
+            if not isinstance(record, dict):
+                chunk["invalid"].append((number, f"Malformed row: {record}"))
+                continue
+            # Empty CSV cells mean "not provided".
+            record = {k: v for k, v in record.items() if v not in ("", None)}
+            try:
+                chunk["items"].append((number, schema.load(record)))
+            except ValidationError as ve:
+                chunk["invalid"].append((number, json.dumps(ve.messages)))
+            if len(chunk["items"]) >= self.chunk_size:
+                yield chunk
+                chunk = {"last_row": number, "items": [], "invalid": []}
+        if chunk["items"] or chunk["invalid"]:
+            yield chunk
+
+    @staticmethod
+    def _flush(writer, out, checkpoint, finished, next_seq) -> int:
+        """
+        Write results of every chunk that is next in file order, fsync the
+        result file, then advance the checkpoint past them.
+        """
+        if next_seq not in finished:
+            return next_seq
+        while next_seq in finished:
+            chunk, results = finished.pop(next_seq)
+            rows = [(row, "invalid", "", error) for row, error in chunk["invalid"]]
+            rows.extend(results)
+            for row in sorted(rows):
+                writer.writerow(row)
+            checkpoint.rows_done = chunk["last_row"]
+            checkpoint.invalid += len(chunk["invalid"])
+            checkpoint.failed += sum(1 for r in results if r[1] == "failed")
+            checkpoint.succeeded += sum(1 for r in results if r[1] != "failed")
+            next_seq += 1
+        out.flush()
+        os.fsync(out.fileno())
+        db.session.commit()
+        return next_seq
+
+    def _send_chunk(self, app, object_type: str, chunk: Dict[str, Any]) -> List[tuple]:
+        """
+        Worker: send one chunk and record the objects locally. Runs in its
+        own app context, and so with its own DB session.
+        Returns one (row, status, hubspot_id, error) per valid row.
+        """
+        items = chunk["items"]
+        if not items:
+            return []
+        with app.app_context():
+            try:
+                return self._write_batch(object_type, items)
+            except (RequestException, BaseError, SQLAlchemyError) as e:
+                db.session.rollback()
+                current_app.logger.error(
+                    "Import chunk ending at row %d failed: %s", chunk["last_row"], e
+                )
+                return [(row, "failed", "", str(e)) for row, _ in items]
+
+    def _write_batch(
+        self, object_type: str, items: List[Tuple[int, dict]]
+    ) -> List[tuple]:
+        api = self._api_client()
+        name_property = NAME_PROPERTY[object_type]
+        associations = INLINE_ASSOCIATIONS.get(object_type, {})
+
+        inputs = []
+        for _, data in items:
+            properties = {k: v for k, v in data.items() if k not in associations}
+            if object_type == "contacts":
+                inputs.append(
+                    {
+                        "idProperty": "email",
+                        "id": data["email"],
+                        "properties": properties,
+                    }
+                )
+                continue
+            entry = {"properties": properties}
+            links = [
+                {
+                    "to": {"id": str(data[field])},
+                    "types": [
+                        {
+                            "associationCategory": "HUBSPOT_DEFINED",
+                            "associationTypeId": type_id,
+                        }
+                    ],
+                }
+                for field, type_id in associations.items()
+                if data.get(field)
+            ]
+            if links:
+                entry["associations"] = links
+            inputs.append(entry)
+
+        if object_type == "contacts":
+            response = api.batch_upsert(object_type, inputs)
+        else:
+            response = api.batch_create(object_type, inputs)
+
+        # Batch results are not guaranteed to come back in input order, so
+        # match them to rows on the name property (email/dealname/subject).
+        by_name = {}
+        for result in response.get("results", []):
+            name = str((result.get("properties") or {}).get(name_property, "")).lower()
+            by_name.setdefault(name, []).append(result)
+        errors = (
+            "; ".join(e.get("message", "") for e in response.get("errors", []))
+            or "No result returned for row."
+        )
+
+        outcomes, tracked = [], {}
+        for row, data in items:
+            matches = by_name.get(str(data.get(name_property, "")).lower())
+            if not matches:
+                outcomes.append((row, "failed", "", errors))
+                continue
+            result = matches.pop(0)
+            status = "updated" if result.get("new") is False else "created"
+            outcomes.append((row, status, result["id"], ""))
+            tracked[str(result["id"])] = data.get(name_property, "")
+
+        try:
+            HubSpotService()._store_created_crm_objects(object_type, tracked)
+        except SQLAlchemyError as e:
+            # The rows are in HubSpot already; report them as written, with
+            # the tracking failure as their error.
+            db.session.rollback()
+            current_app.logger.error("Could not track imported %s: %s", object_type, e)
+            error = f"Not tracked locally: {e}"
+            outcomes = [
+                (row, status, hubspot_id, error if hubspot_id else message)
+                for row, status, hubspot_id, message in outcomes
+            ]
+        return outcomes
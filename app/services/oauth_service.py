@@ -2,7 +2,9 @@ import datetime
 import requests
 from flask import current_app
 from requests.exceptions import RequestException
+from app.utils.metrics import time_token_refresh
 from app.utils.rate_limit_handler import request_with_tenacity
+from app.utils.request_stats import span
 
 from app.models import HubspotAuth, db
 from app.utils.errors import ServiceUnavailableError
@@ -15,15 +17,16 @@ class HubspotOAuthService:
 
     def __init__(self):
         # Ensure we have at least one record in the DB
-        self._auth_record = HubspotAuth.query.first()
-        if not self._auth_record:
-            self._auth_record = HubspotAuth(
-                access_token="",
-                refresh_token=current_app.config["HUBSPOT_REFRESH_TOKEN"],
-                token_expires_at=datetime.datetime.utcnow(),
-            )
-            db.session.add(self._auth_record)
-            db.session.commit()
+        with span("token"):
+            self._auth_record = HubspotAuth.query.first()
+            if not self._auth_record:
+                self._auth_record = HubspotAuth(
+                    access_token="",
+                    refresh_token=current_app.config["HUBSPOT_REFRESH_TOKEN"],
+                    token_expires_at=datetime.datetime.utcnow(),
+                )
+                db.session.add(self._auth_record)
+                db.session.commit()
 
     def get_access_token(self) -> str:
         """
@@ -32,7 +35,8 @@ class HubspotOAuthService:
         now = datetime.datetime.utcnow()
         if now >= self._auth_record.token_expires_at:
             current_app.logger.info("Token expired; refreshing HubSpot token.")
-            self.refresh_token()
+            with span("token.refresh"):
+                self.refresh_token()
 
         return self._auth_record.access_token
 
@@ -47,13 +51,14 @@ class HubspotOAuthService:
             "refresh_token": self._auth_record.refresh_token,
         }
         try:
-            resp = request_with_tenacity(
-                "POST",
-                current_app.config["HUBSPOT_OAUTH_TOKEN_URL"],
-                data=data,
-                timeout=10,
-            )
-            resp.raise_for_status()
+            with time_token_refresh():
+                resp = request_with_tenacity(
+                    "POST",
+                    current_app.config["HUBSPOT_OAUTH_TOKEN_URL"],
+                    data=data,
+                    timeout=10,
+                )
+                resp.raise_for_status()
 
             tokens = resp.json()
             self._auth_record.access_token = tokens["access_token"]
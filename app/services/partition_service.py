@@ -0,0 +1,228 @@
+import datetime
+import gzip
+import os
+import re
+from typing import Any, Dict, List
+
+from flask import current_app
+from sqlalchemy import text
+
+from app.models import CreatedCRMObject, CRMObjectCount, db
+
+_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def _month_start(value) -> datetime.date:
+    return datetime.date(value.year, value.month, 1)
+
+
+def _fsync_dir(path: str):
+    """
+    Make a rename inside path durable.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+class CRMObjectPartitionService:
+    """
+    Maintains the monthly range partitions of created_crm_objects and
+    archives partitions that fall outside the retention window.
+    """
+
+    TABLE = CreatedCRMObject.__tablename__
+
+    @classmethod
+    def partition_name(cls, month: datetime.date) -> str:
+        return f"{cls.TABLE}_p{month:%Y%m}"
+
+    def list_partitions(self) -> List[Dict[str, Any]]:
+        """
+        Attached range partitions, oldest first, as dicts with
+        name/start/end. The DEFAULT partition is not included.
+        """
+        rows = db.session.execute(
+            text(
+                """
+                SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = CAST(:table AS regclass)
+                """
+            ),
+            {"table": self.TABLE},
+        ).all()
+
+        partitions = []
+        for name, bound in rows:
+            match = _BOUND_PATTERN.search(bound or "")
+            if not match:
+                continue
+            partitions.append(
+                {
+                    "name": name,
+                    "start": datetime.datetime.fromisoformat(match.group(1)),
+                    "end": datetime.datetime.fromisoformat(match.group(2)),
+                }
+            )
+        return sorted(partitions, key=lambda p: p["start"])
+
+    def ensure_partitions(self, months_ahead: int = None) -> List[str]:
+        """
+        Make sure partitions exist from the current month through
+        months_ahead months from now. Returns the names created.
+        """
+        if months_ahead is None:
+            months_ahead = current_app.config["CRM_OBJECTS_PARTITIONS_AHEAD"]
+        this_month = _month_start(datetime.datetime.utcnow())
+        created = []
+        for offset in range(months_ahead + 1):
+            month = _add_months(this_month, offset)
+            if self.create_partition(month):
+                created.append(self.partition_name(month))
+        return created
+
+    def create_partition(self, month: datetime.date) -> bool:
+        """
+        Create the partition for the month containing `month`, if missing.
+        Rows that already landed in the DEFAULT partition for that range are
+        moved into the new partition in the same transaction.
+        """
+        month = _month_start(month)
+        name = self.partition_name(month)
+        if any(p["name"] == name for p in self.list_partitions()):
+            return False
+
+        bounds = {
+            "start": datetime.datetime.combine(month, datetime.time()),
+            "end": datetime.datetime.combine(_add_months(month, 1), datetime.time()),
+        }
+        default = f"{self.TABLE}_default"
+        db.session.execute(
+            text(
+                f"CREATE TABLE {name} "
+                f"(LIKE {self.TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        db.session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} "
+                f"WHERE created_date >= :start AND created_date < :end "
+                f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        db.session.execute(
+            text(
+                f"ALTER TABLE {self.TABLE} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{bounds['start'].isoformat()}') "
+                f"TO ('{bounds['end'].isoformat()}')"
+            )
+        )
+        db.session.commit()
+        current_app.logger.info("Created partition %s.", name)
+        return True
+
+    def expired_partitions(self, older_than_months: int) -> List[Dict[str, Any]]:
+        """
+        Partitions whose whole range ends before the start of the month
+        older_than_months months ago.
+        """
+        cutoff = _add_months(
+            _month_start(datetime.datetime.utcnow()), -older_than_months
+        )
+        cutoff = datetime.datetime.combine(cutoff, datetime.time())
+        return [p for p in self.list_partitions() if p["end"] <= cutoff]
+
+    def apply_retention(
+        self,
+        older_than_months: int = None,
+        archive_dir: str = None,
+        detach_only: bool = False,
+        dry_run: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Archive (or just detach) every expired partition.
+        Returns one result dict per partition handled.
+        """
+        if older_than_months is None:
+            older_than_months = current_app.config["CRM_OBJECTS_RETENTION_MONTHS"]
+        archive_dir = archive_dir or current_app.config["CRM_OBJECTS_ARCHIVE_DIR"]
+
+        results = []
+        for partition in self.expired_partitions(older_than_months):
+            if dry_run:
+                results.append({"partition": partition["name"], "dry_run": True})
+            elif detach_only:
+                results.append(self.detach_partition(partition["name"]))
+            else:
+                results.append(self.archive_partition(partition["name"], archive_dir))
+        return results
+
+    def archive_partition(self, name: str, archive_dir: str) -> Dict[str, Any]:
+        """
+        Write the partition to <archive_dir>/<name>.csv.gz, then detach and
+        drop it. The file is complete on disk, gzip trailer and rename
+        included, before anything is dropped.
+        """
+        os.makedirs(archive_dir, exist_ok=True)
+        path = os.path.join(archive_dir, f"{name}.csv.gz")
+        partial = f"{path}.partial"
+
+        cursor = db.session.connection().connection.cursor()
+        with open(partial, "wb") as raw:
+            # Closing the GzipFile writes the CRC/size trailer; only then is
+            # the file worth syncing.
+            with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+                cursor.copy_expert(
+                    f"COPY (SELECT * FROM {name} ORDER BY id) "
+                    f"TO STDOUT WITH (FORMAT csv, HEADER)",
+                    archive,
+                )
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(partial, path)
+        _fsync_dir(archive_dir)
+
+        result = self._remove_partition(name, drop=True)
+        result["archive"] = path
+        current_app.logger.info(
+            "Archived partition %s (%d rows) to %s.", name, result["rows"], path
+        )
+        return result
+
+    def detach_partition(self, name: str) -> Dict[str, Any]:
+        """
+        Detach the partition but keep it as a standalone table.
+        """
+        result = self._remove_partition(name, drop=False)
+        current_app.logger.info(
+            "Detached partition %s (%d rows).", name, result["rows"]
+        )
+        return result
+
+    def _remove_partition(self, name: str, drop: bool) -> Dict[str, Any]:
+        """
+        Detach (and optionally drop) a partition, taking its rows out of the
+        maintained crm_object_counts in the same transaction.
+        """
+        counts = dict(
+            db.session.execute(
+                text(f"SELECT object_type, count(*) FROM {name} GROUP BY object_type")
+            ).all()
+        )
+        db.session.execute(text(f"ALTER TABLE {self.TABLE} DETACH PARTITION {name}"))
+        for object_type, count in counts.items():
+            CRMObjectCount.adjust(object_type, -count)
+        if drop:
+            db.session.execute(text(f"DROP TABLE {name}"))
+        db.session.commit()
+        return {"partition": name, "rows": sum(counts.values()), "counts": counts}
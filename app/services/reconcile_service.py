@@ -0,0 +1,281 @@
+import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List
+
+from flask import current_app
+from sqlalchemy import bindparam, delete, select, text, update
+
+from app.models import CreatedCRMObject, CRMObjectCount, change_seq_sequence, db
+from app.utils.constants import CRM_OBJECT_TYPES, HUBSPOT_BATCH_LIMIT, NAME_PROPERTY
+from .oauth_service import HubspotOAuthService
+from ..integrations.hubspot_api import HubSpotAPI
+
+MERGED_IDS_PROPERTY = "hs_merged_object_ids"
+
+_table = CreatedCRMObject.__table__
+
+
+class CRMReconcileService:
+    """
+    Compares created_crm_objects with HubSpot and reports (and optionally
+    fixes) drift.
+
+    Local rows are streamed by keyset pagination on id, 100 at a time, and
+    each chunk is checked with one batch read; several chunks are in flight
+    at once. HubSpot answers a batch read of a merged-away ID with the
+    surviving record, whose hs_merged_object_ids lists the old ID.
+
+    Each row ends up as one of:
+      ok       - still in HubSpot under the same name
+      renamed  - still in HubSpot, name changed
+      merged   - merged into another record
+      missing  - deleted (or archived) in HubSpot
+
+    Actions:
+      report - change nothing
+      mark   - set stale_date on merged/missing rows, clear it on the rest
+      repair - rename changed rows, re-point merged rows to the survivor
+               (dropping them if the survivor is already tracked) and mark
+               missing rows stale
+      remove - as repair, but delete missing rows instead of marking them
+    """
+
+    def __init__(self, concurrency: int = None, chunk_size: int = HUBSPOT_BATCH_LIMIT):
+        self.concurrency = (
+            concurrency or current_app.config["HUBSPOT_RECONCILE_CONCURRENCY"]
+        )
+        self.chunk_size = max(1, min(chunk_size, HUBSPOT_BATCH_LIMIT))
+
+    @staticmethod
+    def _api_client() -> HubSpotAPI:
+        token = HubspotOAuthService().get_access_token()
+        return HubSpotAPI(token)
+
+    def run(
+        self, object_types: Iterable[str] = None, action: str = "report"
+    ) -> Dict[str, Dict[str, int]]:
+        return {
+            object_type: self.reconcile(object_type, action)
+            for object_type in (object_types or CRM_OBJECT_TYPES)
+        }
+
+    def reconcile(self, object_type: str, action: str = "report") -> Dict[str, int]:
+        stats = dict.fromkeys(
+            ["checked", "ok", "renamed", "merged", "missing", "updated", "removed"], 0
+        )
+        app = current_app._get_current_object()
+        window = self.concurrency * 2
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="hubspot-reconcile"
+        ) as pool:
+            in_flight = set()
+
+            def collect():
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.discard(future)
+                    findings = future.result()
+                    for key, rows in findings.items():
+                        stats[key] += len(rows)
+                        stats["checked"] += len(rows)
+                    if action != "report":
+                        applied = self._apply(object_type, findings, action)
+                        stats["updated"] += applied["updated"]
+                        stats["removed"] += applied["removed"]
+
+            for rows in self._iter_chunks(object_type):
+                while len(in_flight) >= window:
+                    collect()
+                in_flight.add(pool.submit(self._check_chunk, app, object_type, rows))
+            while in_flight:
+                collect()
+
+        current_app.logger.info(
+            "Reconciled %d %s: %d renamed, %d merged, %d missing (%s).",
+            stats["checked"],
+            object_type,
+            stats["renamed"],
+            stats["merged"],
+            stats["missing"],
+            action,
+        )
+        return stats
+
+    def _iter_chunks(self, object_type: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Keyset pagination over (object_type, id): every query starts after
+        the last id seen, so it stays cheap however deep into the table.
+        """
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                select(
+                    CreatedCRMObject.id,
+                    CreatedCRMObject.external_id,
+                    CreatedCRMObject.name,
+                )
+                .where(
+                    CreatedCRMObject.object_type == object_type,
+                    CreatedCRMObject.id > last_id,
+                )
+                .order_by(CreatedCRMObject.id)
+                .limit(self.chunk_size)
+            ).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            yield [row._asdict() for row in rows]
+
+    def _check_chunk(
+        self, app, object_type: str, rows: List[Dict[str, Any]]
+    ) -> Dict[str, list]:
+        """
+        Worker: classify one chunk of local rows with a single batch read.
+        """
+        name_property = NAME_PROPERTY[object_type]
+        with app.app_context():
+            data = self._api_client().batch_read(
+                object_type,
+                sorted({row["external_id"] for row in rows}),
+                [name_property, MERGED_IDS_PROPERTY],
+            )
+
+        by_id, merged_into = {}, {}
+        for record in data.get("results", []):
+            by_id[str(record["id"])] = record
+            merged_ids = (record.get("properties") or {}).get(MERGED_IDS_PROPERTY)
+            for old_id in (merged_ids or "").split(";"):
+                if old_id.strip():
+                    merged_into[old_id.strip()] = record
+
+        findings = {"ok": [], "renamed": [], "merged": [], "missing": []}
+        for row in rows:
+            record = by_id.get(row["external_id"])
+            if record is None and row["external_id"] in merged_into:
+                survivor = merged_into[row["external_id"]]
+                findings["merged"].append(
+                    {
+                        **row,
+                        "survivor_id": str(survivor["id"]),
+                        "survivor_name": (survivor.get("properties") or {}).get(
+                            name_property
+                        ),
+                    }
+                )
+            elif record is None:
+                findings["missing"].append(row)
+            else:
+                name = (record.get("properties") or {}).get(name_property)
+                if name and name != row["name"]:
+                    findings["renamed"].append({**row, "new_name": name})
+                else:
+                    findings["ok"].append(row)
+        return findings
+
+    def _apply(
+        self, object_type: str, findings: Dict[str, list], action: str
+    ) -> Dict[str, int]:
+        """
+        Apply one chunk's findings in a single transaction.
+        """
+        now = datetime.datetime.utcnow()
+        applied = {"updated": 0, "removed": 0}
+        found = findings["ok"] + findings["renamed"]
+        to_remove = []
+
+        if found:
+            db.session.execute(
+                update(CreatedCRMObject)
+                .where(
+                    CreatedCRMObject.id.in_([row["id"] for row in found]),
+                    CreatedCRMObject.stale_date.isnot(None),
+                )
+                .values(stale_date=None)
+                .execution_options(synchronize_session=False)
+            )
+
+        if action == "mark":
+            stale = findings["missing"] + findings["merged"]
+        elif action == "repair":
+            stale = findings["missing"]
+        else:
+            stale = []
+            to_remove.extend(row["id"] for row in findings["missing"])
+        if stale:
+            db.session.execute(
+                update(CreatedCRMObject)
+                .where(
+                    CreatedCRMObject.id.in_([row["id"] for row in stale]),
+                    CreatedCRMObject.stale_date.is_(None),
+                )
+                .values(stale_date=now)
+                .execution_options(synchronize_session=False)
+            )
+
+        if action in ("repair", "remove"):
+            changes = [
+                {"row_id": row["id"], "ext": row["external_id"], "new": row["new_name"]}
+                for row in findings["renamed"]
+            ]
+            tracked = self._tracked_ids(
+                object_type, {row["survivor_id"] for row in findings["merged"]}
+            )
+            for row in findings["merged"]:
+                if row["survivor_id"] in tracked:
+                    to_remove.append(row["id"])
+                else:
+                    tracked.add(row["survivor_id"])
+                    changes.append(
+                        {
+                            "row_id": row["id"],
+                            "ext": row["survivor_id"],
+                            "new": row["survivor_name"] or row["name"],
+                        }
+                    )
+            if changes:
+                db.session.execute(
+                    _table.update()
+                    .where(_table.c.id == bindparam("row_id"))
+                    .values(
+                        external_id=bindparam("ext"),
+                        name=bindparam("new"),
+                        stale_date=None,
+                        updated_date=now,
+                        change_seq=change_seq_sequence.next_value(),
+                    ),
+                    changes,
+                )
+                db.session.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {
+                        "channel": current_app.config["CRM_CHANGE_FEED_CHANNEL"],
+                        "payload": object_type,
+                    },
+                )
+            applied["updated"] = len(changes)
+
+        if to_remove:
+            removed = db.session.execute(
+                delete(CreatedCRMObject)
+                .where(CreatedCRMObject.id.in_(to_remove))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            CRMObjectCount.adjust(object_type, -removed)
+            applied["removed"] = removed
+
+        db.session.commit()
+        return applied
+
+    @staticmethod
+    def _tracked_ids(object_type: str, external_ids: set) -> set:
+        if not external_ids:
+            return set()
+        return set(
+            db.session.execute(
+                select(CreatedCRMObject.external_id).where(
+                    CreatedCRMObject.object_type == object_type,
+                    CreatedCRMObject.external_id.in_(list(external_ids)),
+                )
+            ).scalars()
+        )
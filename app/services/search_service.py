@@ -0,0 +1,108 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+from flask import current_app
+from sqlalchemy import func, select, text
+
+from app.models import CRMMirrorObject, db
+from .hubspot_service import _escape_like
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def _prefix_tsquery(q: str) -> str:
+    """
+    'ann smi' -> 'ann':* & 'smi':*  (every word, matched as a prefix).
+    Only word characters are kept, so user input can't break the syntax.
+    """
+    return " & ".join(f"'{token}':*" for token in _TOKEN_PATTERN.findall(q.lower()))
+
+
+class CRMSearchService:
+    """
+    Lookups over crm_mirror_objects that never call HubSpot. Every mode is
+    answered from an index:
+      email    -> lower(name) = ...            (ix_crm_mirror_objects_name_prefix)
+      prefix   -> lower(name) LIKE 'q%'        (ix_crm_mirror_objects_name_prefix)
+      fulltext -> every word as a prefix,
+                  search_vector @@ tsquery     (ix_crm_mirror_objects_search_vector)
+      fuzzy    -> lower(name) % q, pg_trgm     (ix_crm_mirror_objects_name_trgm),
+                  or prefix full-text when pg_trgm is not installed.
+    "auto" uses email for queries containing "@" and full-text otherwise.
+    """
+
+    def search(
+        self,
+        q: str,
+        object_type: str = None,
+        mode: str = "auto",
+        limit: int = 20,
+        include_archived: bool = False,
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Returns (mode actually used, results ordered best match first).
+        """
+        q = q.strip()
+        if mode == "auto":
+            mode = "email" if "@" in q else "fulltext"
+        if mode == "fuzzy" and not self.trigram_available():
+            mode = "fulltext"
+
+        lowered_name = func.lower(CRMMirrorObject.name)
+        stmt = select(CRMMirrorObject)
+        if object_type:
+            stmt = stmt.where(CRMMirrorObject.object_type == object_type)
+        if not include_archived:
+            stmt = stmt.where(CRMMirrorObject.archived.is_(False))
+
+        if mode == "email":
+            stmt = stmt.where(lowered_name == q.lower()).order_by(
+                CRMMirrorObject.object_type
+            )
+        elif mode == "prefix":
+            stmt = stmt.where(
+                lowered_name.like(f"{_escape_like(q.lower())}%")
+            ).order_by(lowered_name)
+        elif mode == "fuzzy":
+            stmt = stmt.where(lowered_name.op("%")(q.lower())).order_by(
+                func.similarity(lowered_name, q.lower()).desc()
+            )
+        else:
+            query_text = _prefix_tsquery(q)
+            if not query_text:
+                return mode, []
+            tsquery = func.to_tsquery("simple", query_text)
+            stmt = stmt.where(CRMMirrorObject.search_vector.op("@@")(tsquery)).order_by(
+                func.ts_rank(CRMMirrorObject.search_vector, tsquery).desc(),
+                lowered_name,
+            )
+
+        rows = db.session.execute(stmt.limit(limit)).scalars().all()
+        return mode, [self._serialize(row) for row in rows]
+
+    @staticmethod
+    def trigram_available() -> bool:
+        """
+        Whether pg_trgm is installed in this database; checked once per app.
+        """
+        cache = current_app.extensions.setdefault("crm_search", {})
+        if "pg_trgm" not in cache:
+            cache["pg_trgm"] = bool(
+                db.session.execute(
+                    text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                ).scalar()
+            )
+        return cache["pg_trgm"]
+
+    @staticmethod
+    def _serialize(obj: CRMMirrorObject) -> Dict[str, Any]:
+        return {
+            "object_type": obj.object_type,
+            "hubspot_id": obj.hubspot_id,
+            "name": obj.name,
+            "properties": obj.properties,
+            "archived": obj.archived,
+            "hs_updated_at": (
+                obj.hs_updated_at.isoformat() if obj.hs_updated_at else None
+            ),
+        }
@@ -0,0 +1,194 @@
+import datetime
+from typing import Any, Dict, Iterable, List
+
+from dateutil.parser import isoparse
+from flask import current_app
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models import CRMMirrorObject, SyncState, db
+from app.utils.constants import (
+    CRM_OBJECT_TYPES,
+    HUBSPOT_SEARCH_MAX_RESULTS,
+    LAST_MODIFIED_PROPERTY,
+    MIRROR_PROPERTIES,
+    NAME_PROPERTY,
+)
+from .oauth_service import HubspotOAuthService
+from ..integrations.hubspot_api import HubSpotAPI
+
+
+def _parse_timestamp(value: str):
+    """
+    HubSpot ISO 8601 timestamp -> naive UTC datetime (None if missing).
+    """
+    if not value:
+        return None
+    parsed = isoparse(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _epoch_millis(value: datetime.datetime) -> str:
+    return str(int(value.replace(tzinfo=datetime.timezone.utc).timestamp() * 1000))
+
+
+class HubSpotSyncService:
+    """
+    Incrementally mirrors HubSpot contacts, deals and tickets into
+    crm_mirror_objects, using a persisted last-modified high-water mark.
+    """
+
+    def __init__(self):
+        self.oauth_service = HubspotOAuthService()
+
+    def _api_client(self) -> HubSpotAPI:
+        token = self.oauth_service.get_access_token()
+        return HubSpotAPI(token)
+
+    def sync_all(
+        self, object_types: Iterable[str] = None, full: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Sync each object type in turn; returns per-type stats.
+        """
+        return {
+            object_type: self.sync(object_type, full=full)
+            for object_type in (object_types or CRM_OBJECT_TYPES)
+        }
+
+    def sync(self, object_type: str, full: bool = False) -> Dict[str, Any]:
+        """
+        Pull every object of object_type modified at or after the stored
+        high-water mark (or everything, if full), oldest first, and upsert
+        each page into the mirror. The high-water mark is committed with
+        every page, so an interrupted run resumes where it stopped.
+
+        HubSpot search stops paging at HUBSPOT_SEARCH_MAX_RESULTS, so long
+        runs restart the query from the latest timestamp this run has seen
+        (not the stored mark, which a full run may be far behind).
+        """
+        state = db.session.get(SyncState, object_type)
+        if state is None:
+            state = SyncState(object_type=object_type)
+            db.session.add(state)
+
+        since = None if full else state.high_water_mark
+        page_size = current_app.config["HUBSPOT_SYNC_PAGE_SIZE"]
+        modified_property = LAST_MODIFIED_PROPERTY[object_type]
+        api = self._api_client()
+
+        after = None
+        run_newest = since
+        stats = {"fetched": 0, "pages": 0, "high_water_mark": since}
+        while True:
+            data = api.search_objects(
+                object_type,
+                filter_groups=self._modified_since_filter(modified_property, since),
+                properties=MIRROR_PROPERTIES[object_type],
+                sorts=[{"propertyName": modified_property, "direction": "ASCENDING"}],
+                after=after,
+                limit=page_size,
+            )
+            results = data.get("results", [])
+            if results:
+                self.apply_objects(object_type, results)
+                newest = max(
+                    _parse_timestamp(record.get("updatedAt")) or datetime.datetime.min
+                    for record in results
+                )
+                if run_newest is None or newest > run_newest:
+                    run_newest = newest
+                if state.high_water_mark is None or newest > state.high_water_mark:
+                    state.high_water_mark = newest
+                stats["fetched"] += len(results)
+            stats["pages"] += 1
+            db.session.commit()
+
+            after = data.get("paging", {}).get("next", {}).get("after")
+            if not after:
+                break
+            if int(after) >= HUBSPOT_SEARCH_MAX_RESULTS:
+                if run_newest == since:
+                    current_app.logger.error(
+                        "Sync of %s stuck: more than %d objects share last-modified %s.",
+                        object_type,
+                        HUBSPOT_SEARCH_MAX_RESULTS,
+                        since,
+                    )
+                    break
+                since, after = run_newest, None
+
+        state.last_run_at = datetime.datetime.utcnow()
+        db.session.commit()
+        stats["high_water_mark"] = state.high_water_mark
+        current_app.logger.info(
+            "Synced %d %s in %d page(s); high-water mark %s.",
+            stats["fetched"],
+            object_type,
+            stats["pages"],
+            state.high_water_mark,
+        )
+        return stats
+
+    @staticmethod
+    def _modified_since_filter(
+        modified_property: str, since: datetime.datetime = None
+    ) -> List[Dict[str, Any]]:
+        if since is None:
+            return []
+        return [
+            {
+                "filters": [
+                    {
+                        "propertyName": modified_property,
+                        "operator": "GTE",
+                        "value": _epoch_millis(since),
+                    }
+                ]
+            }
+        ]
+
+    def apply_objects(self, object_type: str, records: List[Dict[str, Any]]) -> int:
+        """
+        Upsert HubSpot object records (as returned by search/batch read) into
+        crm_mirror_objects in one statement. A row is only overwritten by a
+        record at least as new as what is stored, so replays and out-of-order
+        deliveries cannot roll the mirror back. Does not commit.
+        """
+        if not records:
+            return 0
+        rows = {}
+        for record in records:
+            properties = record.get("properties") or {}
+            rows[str(record["id"])] = {
+                "object_type": object_type,
+                "hubspot_id": str(record["id"]),
+                "name": properties.get(NAME_PROPERTY[object_type]),
+                "properties": properties,
+                "hs_created_at": _parse_timestamp(record.get("createdAt")),
+                "hs_updated_at": _parse_timestamp(record.get("updatedAt")),
+                "archived": bool(record.get("archived", False)),
+                "synced_at": datetime.datetime.utcnow(),
+            }
+
+        stmt = pg_insert(CRMMirrorObject).values(list(rows.values()))
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_crm_mirror_objects_type_hubspot_id",
+            set_={
+                "name": excluded.name,
+                "properties": excluded.properties,
+                "hs_created_at": excluded.hs_created_at,
+                "hs_updated_at": excluded.hs_updated_at,
+                "archived": excluded.archived,
+                "synced_at": excluded.synced_at,
+            },
+            where=(
+                CRMMirrorObject.hs_updated_at.is_(None)
+                | excluded.hs_updated_at.is_(None)
+                | (excluded.hs_updated_at >= CRMMirrorObject.hs_updated_at)
+            ),
+        )
+        db.session.execute(stmt)
+        return len(rows)
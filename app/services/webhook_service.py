@@ -0,0 +1,259 @@
+import datetime
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from flask import current_app
+from sqlalchemy import String, column, select, text, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models import (
+    CreatedCRMObject,
+    CRMMirrorObject,
+    WebhookEvent,
+    change_seq_sequence,
+    db,
+)
+from app.utils.constants import (
+    HUBSPOT_BATCH_LIMIT,
+    MIRROR_PROPERTIES,
+    NAME_PROPERTY,
+    WEBHOOK_OBJECT_TYPES,
+)
+from .oauth_service import HubspotOAuthService
+from .sync_service import HubSpotSyncService
+from ..integrations.hubspot_api import HubSpotAPI
+
+_DELETION_EVENTS = ("deletion", "privacyDeletion")
+
+
+def _from_epoch_millis(value):
+    if value is None:
+        return None
+    return datetime.datetime.fromtimestamp(
+        int(value) / 1000, datetime.timezone.utc
+    ).replace(tzinfo=None)
+
+
+class WebhookService:
+    """
+    Queues HubSpot webhook deliveries and applies them to the local tables
+    in batches: duplicate events per object are collapsed, changed objects
+    are fetched with one batch read per 100 IDs, and deletions archive the
+    mirrored row.
+    """
+
+    def __init__(self):
+        self.oauth_service = HubspotOAuthService()
+        self.sync_service = HubSpotSyncService()
+
+    def _api_client(self) -> HubSpotAPI:
+        token = self.oauth_service.get_access_token()
+        return HubSpotAPI(token)
+
+    @staticmethod
+    def enqueue(events: List[Dict[str, Any]]) -> int:
+        """
+        Store a webhook delivery with a single multi-row INSERT. Redelivered
+        events (same eventId) are ignored. Returns the number of new rows.
+        """
+        if not events:
+            return 0
+        rows = []
+        for event in events:
+            subscription_type = str(event.get("subscriptionType", ""))
+            prefix = subscription_type.split(".", 1)[0]
+            rows.append(
+                {
+                    "event_id": event.get("eventId"),
+                    "subscription_type": subscription_type,
+                    "object_type": WEBHOOK_OBJECT_TYPES.get(prefix),
+                    "object_id": (
+                        str(event["objectId"])
+                        if event.get("objectId") is not None
+                        else None
+                    ),
+                    "occurred_at": _from_epoch_millis(event.get("occurredAt")),
+                    "payload": event,
+                    "received_at": datetime.datetime.utcnow(),
+                }
+            )
+        stmt = (
+            pg_insert(WebhookEvent)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["event_id"])
+        )
+        result = db.session.execute(stmt)
+        db.session.commit()
+        return result.rowcount
+
+    def process_all(self, batch_size: int = None) -> Dict[str, int]:
+        """
+        Process batches until the queue is empty; returns summed stats.
+        """
+        totals = defaultdict(int)
+        while True:
+            stats = self.process_pending(batch_size)
+            for key, value in stats.items():
+                totals[key] += value
+            if not stats["events"]:
+                return dict(totals)
+
+    def process_pending(self, batch_size: int = None) -> Dict[str, int]:
+        """
+        Claim up to batch_size unprocessed events (skipping rows another
+        worker holds), apply them and mark them processed in one commit.
+        If HubSpot fails the transaction is rolled back and the events stay
+        queued for the next run.
+        """
+        batch_size = batch_size or current_app.config["HUBSPOT_WEBHOOK_BATCH_SIZE"]
+        events = (
+            db.session.execute(
+                select(WebhookEvent)
+                .where(WebhookEvent.processed_at.is_(None))
+                .order_by(WebhookEvent.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            .scalars()
+            .all()
+        )
+        stats = {"events": len(events), "fetched": 0, "archived": 0, "renamed": 0}
+        if not events:
+            db.session.commit()
+            return stats
+
+        try:
+            changed, deleted = self._collapse(events)
+            api = self._api_client() if changed else None
+            for object_type, ids in changed.items():
+                records = self._batch_read(api, object_type, sorted(ids))
+                self.sync_service.apply_objects(object_type, records)
+                stats["fetched"] += len(records)
+                stats["renamed"] += self._rename_tracked(object_type, records)
+                # Objects gone by the time we read them were deleted since.
+                found = {str(record["id"]) for record in records}
+                deleted[object_type] |= ids - found
+            for object_type, ids in deleted.items():
+                stats["archived"] += self._archive(object_type, ids)
+
+            if stats["renamed"]:
+                db.session.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {
+                        "channel": current_app.config["CRM_CHANGE_FEED_CHANNEL"],
+                        "payload": "webhook",
+                    },
+                )
+            now = datetime.datetime.utcnow()
+            for event in events:
+                event.processed_at = now
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception(
+                "Failed to process %d webhook event(s).", len(events)
+            )
+            raise
+
+        current_app.logger.info(
+            "Processed %d webhook event(s): %d fetched, %d archived.",
+            stats["events"],
+            stats["fetched"],
+            stats["archived"],
+        )
+        return stats
+
+    @staticmethod
+    def _collapse(
+        events: List[WebhookEvent],
+    ) -> Tuple[Dict[str, set], Dict[str, set]]:
+        """
+        Reduce events to the latest one per object. Returns
+        ({object_type: ids to fetch}, {object_type: ids to archive}).
+        """
+        latest = {}
+        for event in events:
+            if event.object_type is None or event.object_id is None:
+                continue
+            action = event.subscription_type.split(".", 1)[-1]
+            key = (event.object_type, event.object_id)
+            order = (event.occurred_at or datetime.datetime.min, event.id)
+            if key not in latest or order >= latest[key][0]:
+                latest[key] = (order, action)
+            if action == "merge":
+                # The losing records of a merge no longer exist on their own.
+                for merged_id in event.payload.get("mergedObjectIds") or []:
+                    merged_key = (event.object_type, str(merged_id))
+                    if merged_key != key:
+                        latest[merged_key] = (order, "deletion")
+
+        changed, deleted = defaultdict(set), defaultdict(set)
+        for (object_type, object_id), (_, action) in latest.items():
+            if action in _DELETION_EVENTS:
+                deleted[object_type].add(object_id)
+            else:
+                changed[object_type].add(object_id)
+        return changed, deleted
+
+    @staticmethod
+    def _batch_read(
+        api: HubSpotAPI, object_type: str, ids: List[str]
+    ) -> List[Dict[str, Any]]:
+        records = []
+        for start in range(0, len(ids), HUBSPOT_BATCH_LIMIT):
+            data = api.batch_read(
+                object_type,
+                ids[start : start + HUBSPOT_BATCH_LIMIT],
+                MIRROR_PROPERTIES[object_type],
+            )
+            records.extend(data.get("results", []))
+        return records
+
+    @staticmethod
+    def _rename_tracked(object_type: str, records: List[Dict[str, Any]]) -> int:
+        """
+        Bring the name of tracked CreatedCRMObject rows in line with HubSpot,
+        in one UPDATE ... FROM (VALUES ...). Unchanged rows are not touched.
+        """
+        incoming = {}
+        for record in records:
+            name = (record.get("properties") or {}).get(NAME_PROPERTY[object_type])
+            if name:
+                incoming[str(record["id"])] = name
+        if not incoming:
+            return 0
+
+        names = values(
+            column("external_id", String), column("name", String), name="incoming"
+        ).data(list(incoming.items()))
+        stmt = (
+            update(CreatedCRMObject)
+            .where(
+                CreatedCRMObject.object_type == object_type,
+                CreatedCRMObject.external_id == names.c.external_id,
+                CreatedCRMObject.name.is_distinct_from(names.c.name),
+            )
+            .values(
+                name=names.c.name,
+                updated_date=datetime.datetime.utcnow(),
+                change_seq=change_seq_sequence.next_value(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return db.session.execute(stmt).rowcount
+
+    @staticmethod
+    def _archive(object_type: str, ids: set) -> int:
+        if not ids:
+            return 0
+        stmt = (
+            update(CRMMirrorObject)
+            .where(
+                CRMMirrorObject.object_type == object_type,
+                CRMMirrorObject.hubspot_id.in_(sorted(ids)),
+                CRMMirrorObject.archived.is_(False),
+            )
+            .values(archived=True, synced_at=datetime.datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return db.session.execute(stmt).rowcount
@@ -0,0 +1,298 @@
+"""
+adaptive_concurrency.py
+
+AIMD limit on in-flight HubSpot calls, on top of the token bucket in
+rate_limit_handler.py. Every success raises the limit by 1/limit, so it
+grows by about one per round of calls. A 429, a 5xx, a connection error or
+a call slower than HUBSPOT_ADAPTIVE_LATENCY_MS halves it (at most once per
+second, so one burst of 429s counts once). The limit stays between
+HUBSPOT_ADAPTIVE_MIN and HUBSPOT_ADAPTIVE_MAX, so bulk pipelines settle
+near the quota they actually get, even when other integrations share the
+portal.
+
+HUBSPOT_ADAPTIVE_CONCURRENCY chooses where the state lives:
+
+  off      no limit (default)
+  process  in memory, per process
+  shared   a JSON file (HUBSPOT_ADAPTIVE_STATE_FILE) guarded by fcntl.flock,
+           so all gunicorn workers on the host share one limit; slots held
+           by workers that died are dropped
+
+The limit and the calls in flight are exported as the
+hubspot_concurrency_limit and hubspot_in_flight_calls gauges.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, Optional
+
+from flask import current_app, has_app_context
+
+from .metrics import (
+    HUBSPOT_CONCURRENCY_DECREASES,
+    HUBSPOT_CONCURRENCY_LIMIT,
+    HUBSPOT_IN_FLIGHT,
+)
+
+POLL_MIN = 0.005
+POLL_MAX = 0.05
+
+
+def _new_state(initial: float) -> Dict:
+    return {"limit": float(initial), "in_flight": {}, "last_decrease": 0.0}
+
+
+class MemoryState:
+    """
+    Limiter state for one process.
+    """
+
+    blocking = False
+
+    def __init__(self, initial: float):
+        self._lock = threading.Lock()
+        self._state = _new_state(initial)
+
+    def update(self, func: Callable[[Dict], object]):
+        with self._lock:
+            return func(self._state)
+
+
+class FileState:
+    """
+    Limiter state in a JSON file shared by the processes on one host. Each
+    update opens the file and holds an exclusive flock while it runs, so it
+    is safe across forked workers. Updates block on file I/O, so async
+    callers run them in a thread.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, initial: float):
+        self.path = path
+        self.initial = initial
+        self._lock = threading.Lock()
+
+    def update(self, func: Callable[[Dict], object]):
+        import fcntl
+
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, "r+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    raw = f.read()
+                    state = json.loads(raw) if raw else _new_state(self.initial)
+                    _drop_dead_workers(state)
+                    result = func(state)
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(state, f)
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        return result
+
+
+def _drop_dead_workers(state: Dict):
+    for pid in list(state["in_flight"]):
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            del state["in_flight"][pid]
+        except PermissionError:
+            pass  # alive, owned by another user
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        state,
+        min_limit: int = 1,
+        max_limit: int = 50,
+        latency_threshold: float = 0.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.state = state
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_threshold = latency_threshold
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+
+    def _publish(self, state: Dict):
+        HUBSPOT_CONCURRENCY_LIMIT.set(state["limit"])
+        HUBSPOT_IN_FLIGHT.set(state["in_flight"].get(str(os.getpid()), 0))
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot if fewer than int(limit) calls are in flight.
+        """
+        pid = str(os.getpid())
+
+        def take(state):
+            if sum(state["in_flight"].values()) >= int(state["limit"]):
+                return False
+            state["in_flight"][pid] = state["in_flight"].get(pid, 0) + 1
+            self._publish(state)
+            return True
+
+        return self.state.update(take)
+
+    def release(self, status: Optional[int], latency: float):
+        """
+        Give the slot back and adjust the limit: status is the HTTP status
+        (None if the call raised) and latency its duration in seconds.
+        """
+        pid = str(os.getpid())
+        reason = None
+        if status is None:
+            reason = "error"
+        elif status == 429:
+            reason = "429"
+        elif status >= 500:
+            reason = "5xx"
+        elif self.latency_threshold and latency > self.latency_threshold:
+            reason = "latency"
+
+        def give_back(state):
+            held = state["in_flight"].get(pid, 0) - 1
+            if held > 0:
+                state["in_flight"][pid] = held
+            else:
+                state["in_flight"].pop(pid, None)
+            limit = state["limit"]
+            if reason is None:
+                state["limit"] = min(self.max_limit, limit + 1.0 / limit)
+            elif time.time() - state["last_decrease"] >= self.decrease_cooldown:
+                state["limit"] = max(self.min_limit, limit * self.decrease_factor)
+                state["last_decrease"] = time.time()
+                HUBSPOT_CONCURRENCY_DECREASES.labels(reason).inc()
+            self._publish(state)
+
+        self.state.update(give_back)
+
+    def acquire(self) -> float:
+        """
+        Block until a slot is free; returns the time waited.
+        """
+        started = time.perf_counter()
+        delay = POLL_MIN
+        while not self.try_acquire():
+            time.sleep(delay)
+            delay = min(POLL_MAX, delay * 2)
+        return time.perf_counter() - started
+
+    async def _off_loop(self, func, *args):
+        # File-backed state does blocking I/O under a flock; keep it off the
+        # event loop.
+        if self.state.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def acquire_async(self) -> float:
+        started = time.perf_counter()
+        delay = POLL_MIN
+        while not await self._off_loop(self.try_acquire):
+            await asyncio.sleep(delay)
+            delay = min(POLL_MAX, delay * 2)
+        return time.perf_counter() - started
+
+    async def release_async(self, status: Optional[int], latency: float):
+        await self._off_loop(self.release, status, latency)
+
+    @property
+    def limit(self) -> float:
+        return self.state.update(lambda state: state["limit"])
+
+
+class _Slot:
+    status = None
+    waited = 0.0
+
+
+@contextmanager
+def concurrency_slot(limiter: Optional[AdaptiveConcurrencyLimiter]):
+    """
+    Hold a slot of limiter around one HubSpot call (nothing if None). Set
+    .status on the yielded object to the response code; calls that raise
+    count as errors. Its .waited is the time spent waiting for the slot.
+    """
+    slot = _Slot()
+    if limiter is None:
+        yield slot
+        return
+    slot.waited = limiter.acquire()
+    started = time.perf_counter()
+    try:
+        yield slot
+    finally:
+        limiter.release(slot.status, time.perf_counter() - started)
+
+
+@asynccontextmanager
+async def async_concurrency_slot(limiter: Optional[AdaptiveConcurrencyLimiter]):
+    slot = _Slot()
+    if limiter is None:
+        yield slot
+        return
+    slot.waited = await limiter.acquire_async()
+    started = time.perf_counter()
+    try:
+        yield slot
+    finally:
+        await limiter.release_async(slot.status, time.perf_counter() - started)
+
+
+_limiter = None
+_limiter_key = None
+_limiter_lock = threading.Lock()
+
+
+def get_concurrency_limiter() -> Optional[AdaptiveConcurrencyLimiter]:
+    """
+    The process-wide limiter built from the HUBSPOT_ADAPTIVE_* settings
+    (rebuilt if they change), or None when HUBSPOT_ADAPTIVE_CONCURRENCY is
+    off. Outside an app context the last configured limiter is used.
+    """
+    global _limiter, _limiter_key
+    if not has_app_context():
+        return _limiter
+    config = current_app.config
+    mode = config.get("HUBSPOT_ADAPTIVE_CONCURRENCY", "off")
+    key = (
+        mode,
+        config.get("HUBSPOT_ADAPTIVE_MIN", 1),
+        config.get("HUBSPOT_ADAPTIVE_MAX", 50),
+        config.get("HUBSPOT_ADAPTIVE_INITIAL", 10),
+        config.get("HUBSPOT_ADAPTIVE_LATENCY_MS", 0),
+        config.get("HUBSPOT_ADAPTIVE_STATE_FILE"),
+    )
+    with _limiter_lock:
+        if key == _limiter_key:
+            return _limiter
+        _, min_limit, max_limit, initial, latency_ms, path = key
+        if mode == "off":
+            _limiter = None
+        elif mode in ("process", "shared"):
+            state = (
+                MemoryState(initial) if mode == "process" else FileState(path, initial)
+            )
+            _limiter = AdaptiveConcurrencyLimiter(
+                state,
+                min_limit=min_limit,
+                max_limit=max_limit,
+                latency_threshold=latency_ms / 1000.0,
+            )
+        else:
+            raise ValueError(
+                f"Unknown HUBSPOT_ADAPTIVE_CONCURRENCY {mode!r}; "
+                "expected off, process or shared."
+            )
+        _limiter_key = key
+        return _limiter
@@ -0,0 +1,37 @@
+"""
+admin_auth.py
+
+Bearer-token check for operator-only endpoints. The token is ADMIN_API_TOKEN;
+while it is unset every admin request is refused.
+"""
+
+import hmac
+from functools import wraps
+
+from flask import current_app, request
+
+from .errors import UnauthorizedError
+
+
+def is_admin_request() -> bool:
+    token = current_app.config.get("ADMIN_API_TOKEN")
+    if not token:
+        return False
+    return hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    )
+
+
+def require_admin(view):
+    """
+    Raise UnauthorizedError unless the request carries
+    "Authorization: Bearer <ADMIN_API_TOKEN>".
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin_request():
+            raise UnauthorizedError(message="Admin token required.")
+        return view(*args, **kwargs)
+
+    return wrapper
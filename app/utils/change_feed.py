@@ -0,0 +1,138 @@
+"""
+change_feed.py
+
+Per-process Postgres LISTEN loop that wakes up long-poll and SSE requests
+when CRM objects are written. One dedicated connection per worker listens
+on the channel; waiting requests block on a Condition instead of polling
+the database.
+"""
+
+import logging
+import select
+import threading
+
+from flask import current_app
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL = 5.0
+_RECONNECT_BACKOFF_MAX = 30.0
+
+
+class ChangeFeedListener:
+    """
+    Background thread holding a LISTEN connection on `channel`.
+    Every notification bumps `generation`; callers capture the generation
+    before reading the table and then wait for it to move.
+    """
+
+    def __init__(self, app, channel: str):
+        self.app = app
+        self.channel = channel
+        self.generation = 0
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="crm-change-feed", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join(timeout=_POLL_INTERVAL + 1)
+
+    def wait(self, since_generation: int, timeout: float) -> bool:
+        """
+        Block until a notification newer than since_generation arrives
+        or timeout seconds pass. Returns True if something changed.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self.generation > since_generation, timeout=timeout
+            )
+
+    def _connect(self):
+        with self.app.app_context():
+            raw = db.engine.raw_connection()
+        # Keep this connection out of the pool; it lives as long as the thread.
+        raw.detach()
+        conn = raw.dbapi_connection
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                backoff = 1.0
+                # Anything may have been written while (re)connecting.
+                self._notify_waiters()
+                while not self._stopped.is_set():
+                    readable, _, _ = select.select([conn], [], [], _POLL_INTERVAL)
+                    if not readable:
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        self._notify_waiters()
+            except Exception:
+                logger.exception(
+                    "Change feed listener failed; reconnecting in %.0fs.", backoff
+                )
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, _RECONNECT_BACKOFF_MAX)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _notify_waiters(self):
+        with self._condition:
+            self.generation += 1
+            self._condition.notify_all()
+
+
+_listener_lock = threading.Lock()
+
+
+def get_change_listener() -> ChangeFeedListener:
+    """
+    Return the current app's listener, starting it on first use. Started
+    lazily so that each gunicorn worker opens its own connection after fork.
+    """
+    app = current_app._get_current_object()
+    listener = app.extensions.get("crm_change_feed")
+    if listener is None:
+        with _listener_lock:
+            listener = app.extensions.get("crm_change_feed")
+            if listener is None:
+                listener = ChangeFeedListener(
+                    app, app.config["CRM_CHANGE_FEED_CHANNEL"]
+                )
+                listener.start()
+                app.extensions["crm_change_feed"] = listener
+    return listener
+
+
+def current_generation() -> int:
+    """
+    Capture this before reading the table, then pass it to wait_for_change,
+    so a write landing between the read and the wait is not missed.
+    """
+    return get_change_listener().generation
+
+
+def wait_for_change(since_generation: int, timeout: float) -> bool:
+    if timeout <= 0:
+        return False
+    return get_change_listener().wait(since_generation, timeout)
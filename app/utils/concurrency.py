@@ -0,0 +1,53 @@
+"""
+concurrency.py
+
+Helpers for fanning work out to threads from inside a Flask request or CLI
+command.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from flask import current_app
+
+from . import tracing
+from .request_stats import current_request_stats, use_request_stats
+
+
+def map_in_app_context(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int,
+    thread_name_prefix: str = "hubspot-worker",
+) -> List[Tuple[Any, Optional[Exception]]]:
+    """
+    Call func(item) for every item on at most max_workers threads and return
+    (result, error) pairs in input order. A failing item does not stop the
+    others; its exception is returned in place of a result.
+
+    Each call runs inside its own app context, so it gets its own
+    Flask-SQLAlchemy session (removed again when the context pops) and can
+    use current_app and config as usual. Queries and HubSpot calls are
+    counted towards the caller's request_stats and traced under its span.
+    """
+    items = list(items)
+    if not items:
+        return []
+    app = current_app._get_current_object()
+    stats = current_request_stats()
+    trace_context = tracing.current_context()
+
+    def call(item):
+        use_request_stats(stats)
+        with tracing.attached(trace_context), app.app_context():
+            try:
+                return func(item), None
+            except Exception as e:
+                app.logger.warning("Bulk item failed: %s", e)
+                return None, e
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(items))),
+        thread_name_prefix=thread_name_prefix,
+    ) as pool:
+        return list(pool.map(call, items))
@@ -7,12 +7,14 @@ statuses, etc.
 
 # HTTP Status Codes
 statusCodes = {
+    "207": 207,
     "400": 400,
     "401": 401,
     "403": 403,
     "404": 404,
     "422": 422,
     "500": 500,
+    "502": 502,
     "503": 503,
     # Not officially in standard but used for RateLimitExceededError:
     "429": 429,
@@ -26,6 +28,8 @@ errorTypes = {
     "UNPROCESSABLE_ENTITY": "UNPROCESSABLE_ENTITY",
     "INTERNAL_SERVER_ERROR": "INTERNAL_SERVER_ERROR",
     "SERVICE_UNAVAILABLE": "SERVICE_UNAVAILABLE",
+    "PARTIAL_FAILURE": "PARTIAL_FAILURE",
+    "BULK_FAILURE": "BULK_FAILURE",
 }
 
 # Default error messages
@@ -44,3 +48,85 @@ VALID_CATEGORIES = [
     "service_request",
     "meeting",
 ]
+
+CRM_OBJECT_TYPES = ["contacts", "deals", "tickets"]
+
+# How GET /api/new-crm-objects computes its "total" field
+TOTAL_COUNT_MODES = ["exact", "estimated", "none"]
+
+# Filters accepted by the local CRM object listing and export endpoints
+CRM_OBJECT_FILTERS = [
+    "created_since",
+    "created_until",
+    "updated_since",
+    "name_prefix",
+    "email_domain",
+    "external_ids",
+]
+MAX_EXTERNAL_ID_FILTER = 500
+
+# Output formats for GET /api/new-crm-objects/export
+EXPORT_FORMATS = ["ndjson", "csv"]
+
+# Columns of a serialized CreatedCRMObject, in export order
+CRM_OBJECT_FIELDS = [
+    "id",
+    "external_id",
+    "object_type",
+    "name",
+    "created_date",
+    "updated_date",
+]
+
+# Properties mirrored locally for each object type
+MIRROR_PROPERTIES = {
+    "contacts": ["email", "firstname", "lastname", "phone", "lastmodifieddate"],
+    "deals": ["dealname", "amount", "dealstage", "pipeline", "hs_lastmodifieddate"],
+    "tickets": [
+        "subject",
+        "content",
+        "hs_pipeline",
+        "hs_pipeline_stage",
+        "hs_ticket_priority",
+        "hs_lastmodifieddate",
+    ],
+}
+
+# Property used as the display name of each object type
+NAME_PROPERTY = {"contacts": "email", "deals": "dealname", "tickets": "subject"}
+
+# Searchable "last modified" property of each object type
+LAST_MODIFIED_PROPERTY = {
+    "contacts": "lastmodifieddate",
+    "deals": "hs_lastmodifieddate",
+    "tickets": "hs_lastmodifieddate",
+}
+
+# HubSpot search stops paging after this many results for one query
+HUBSPOT_SEARCH_MAX_RESULTS = 10000
+
+# HubSpot batch endpoints accept at most this many inputs per call
+HUBSPOT_BATCH_LIMIT = 100
+
+# Webhook subscriptionType prefix -> local object_type
+WEBHOOK_OBJECT_TYPES = {"contact": "contacts", "deal": "deals", "ticket": "tickets"}
+
+# GET /api/search modes; "auto" picks email or full-text from the query
+SEARCH_MODES = ["auto", "email", "prefix", "fulltext", "fuzzy"]
+MAX_SEARCH_LIMIT = 100
+
+# `flask hubspot import` input formats
+IMPORT_FORMATS = ["csv", "ndjson"]
+
+# HUBSPOT_DEFINED association type IDs for inline associations on batch create,
+# keyed by the schema field that carries the associated object's ID
+INLINE_ASSOCIATIONS = {
+    "deals": {"contact_id": 3},
+    "tickets": {"contact_id": 16, "deal_id": 28},
+}
+
+# `flask hubspot export` output formats (parquet needs the optional pyarrow)
+BULK_EXPORT_FORMATS = ["ndjson", "parquet"]
+
+# What `flask hubspot reconcile` does with drifted rows
+RECONCILE_ACTIONS = ["report", "mark", "repair", "remove"]
@@ -4,7 +4,6 @@ errors.py
 Custom error classes inheriting from BaseError for unified error handling.
 """
 
-import logging
 from .constants import (
     InternalServerErrorMessage,
     unprocessableEntityErrorMessage,
@@ -20,7 +19,8 @@ from .constants import (
 
 class BaseError(Exception):
     """
-    BaseError with logging, carrying a message, verboseMessage, errorType, and httpCode.
+    BaseError carrying a message, verboseMessage, errorType, and httpCode.
+    Raising one does not log; the app's error handler logs it once.
     """
 
     def __init__(
@@ -30,8 +30,6 @@ class BaseError(Exception):
         self.verboseMessage = verboseMessage
         self.errorType = errorType or errorTypes["INTERNAL_SERVER_ERROR"]
         self.httpCode = httpCode or statusCodes["500"]
-
-        logging.error(self.message)
         super().__init__(self.message)
 
 
@@ -107,3 +105,27 @@ class RateLimitExceededError(BaseError):
             httpCode=statusCodes["429"] if "429" in statusCodes else 429,
             errorType="RATE_LIMIT_EXCEEDED",
         )
+
+
+class BulkOperationError(BaseError):
+    """
+    Some items of a bulk operation failed. Every item was still attempted;
+    results holds each item's outcome (None where it failed), in input order
+    or keyed by step, and errors lists {"index"/"step", "error"} for the
+    failures. httpCode is 207 while at least one item succeeded and 502 when
+    none did.
+    """
+
+    def __init__(self, results, errors: list, message=None):
+        self.results = results
+        self.errors = errors
+        outcomes = results.values() if isinstance(results, dict) else results
+        self.all_failed = all(outcome is None for outcome in outcomes)
+        super().__init__(
+            message=message or f"{len(errors)} of {len(results)} items failed.",
+            verboseMessage=errors,
+            httpCode=statusCodes["502" if self.all_failed else "207"],
+            errorType=errorTypes[
+                "BULK_FAILURE" if self.all_failed else "PARTIAL_FAILURE"
+            ],
+        )
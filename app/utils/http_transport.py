@@ -0,0 +1,228 @@
+"""
+http_transport.py
+
+How synchronous HubSpot calls reach the network, selected by
+HUBSPOT_HTTP_TRANSPORT:
+
+  http1         requests.request: a fresh connection for every call (default)
+  http1-pooled  one shared requests.Session; keep-alive connections, but each
+                carries one request at a time
+  http2         one shared httpx.Client speaking HTTP/2, so concurrent calls
+                are multiplexed as streams over one connection per host
+                (needs the optional h2 package: pip install "httpx[http2]")
+
+Every transport returns a requests.Response and raises requests exceptions,
+so request_with_tenacity and its callers work the same on all of them.
+Shared clients are created lazily, i.e. after a gunicorn worker forks.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from flask import current_app, has_app_context
+
+
+class TransportStats:
+    """
+    Thread-safe counters for one transport: calls made, connections opened,
+    HTTP/2 streams started, and calls in flight (now and at peak).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+        self.streams = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.http_versions: Dict[str, int] = {}
+
+    @contextmanager
+    def track(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def add(self, name: str, count: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def saw_version(self, http_version: str):
+        with self._lock:
+            self.http_versions[http_version] = (
+                self.http_versions.get(http_version, 0) + 1
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "streams": self.streams,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "http_versions": dict(self.http_versions),
+            }
+
+
+class PlainTransport:
+    name = "http1"
+
+    def __init__(self, pool_size: int = None):
+        self.pool_size = pool_size
+        self.stats = TransportStats()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        with self.stats.track():
+            resp = requests.request(method, url, **kwargs)
+        # No pooling: every call opens (and closes) its own connection.
+        self.stats.add("connections_opened")
+        self.stats.saw_version("HTTP/1.1")
+        return resp
+
+    def close(self):
+        pass
+
+
+class PooledTransport:
+    name = "http1-pooled"
+
+    def __init__(self, pool_size: int):
+        self.pool_size = pool_size
+        self.stats = TransportStats()
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        with self.stats.track():
+            resp = self.session.request(method, url, **kwargs)
+        self.stats.saw_version("HTTP/1.1")
+        return resp
+
+    def connections_opened(self) -> int:
+        pools = self._adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def close(self):
+        self.session.close()
+
+
+class HTTP2Transport:
+    name = "http2"
+
+    def __init__(self, pool_size: int):
+        try:
+            import h2  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "HUBSPOT_HTTP_TRANSPORT=http2 needs the optional h2 package "
+                '(pip install "httpx[http2]").'
+            ) from e
+        self.pool_size = pool_size
+        self.stats = TransportStats()
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+
+    def _trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.add("connections_opened")
+        elif event_name == "http2.send_request_headers.started":
+            self.stats.add("streams")
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        try:
+            with self.stats.track():
+                resp = self.client.request(
+                    method, url, extensions={"trace": self._trace}, **kwargs
+                )
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        self.stats.saw_version(resp.http_version)
+        return _to_requests_response(resp)
+
+    def close(self):
+        self.client.close()
+
+
+def _to_requests_response(resp: httpx.Response) -> requests.Response:
+    converted = requests.Response()
+    converted.status_code = resp.status_code
+    converted._content = resp.content
+    converted.headers = CaseInsensitiveDict(resp.headers)
+    converted.url = str(resp.url)
+    converted.reason = resp.reason_phrase
+    converted.encoding = resp.encoding
+    converted.elapsed = resp.elapsed
+    return converted
+
+
+TRANSPORTS = {
+    PlainTransport.name: PlainTransport,
+    PooledTransport.name: PooledTransport,
+    HTTP2Transport.name: HTTP2Transport,
+}
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """
+    The process-wide transport for HUBSPOT_HTTP_TRANSPORT and
+    HUBSPOT_HTTP_POOL_SIZE, rebuilt if either changes. Outside an app context
+    the last configured transport (or plain requests) is used.
+    """
+    global _transport
+    if not has_app_context():
+        return _transport or PlainTransport()
+    name = current_app.config.get("HUBSPOT_HTTP_TRANSPORT", PlainTransport.name)
+    pool_size = current_app.config.get("HUBSPOT_HTTP_POOL_SIZE", 10)
+    if name not in TRANSPORTS:
+        raise ValueError(
+            f"Unknown HUBSPOT_HTTP_TRANSPORT {name!r}; "
+            f"expected one of {', '.join(TRANSPORTS)}."
+        )
+    with _transport_lock:
+        if (
+            _transport is None
+            or _transport.name != name
+            or _transport.pool_size != pool_size
+        ):
+            if _transport is not None:
+                _transport.close()
+            _transport = TRANSPORTS[name](pool_size)
+        return _transport
+
+
+def transport_stats() -> Dict[str, Any]:
+    """
+    Counters of the current transport, for metrics and benchmarks.
+    """
+    transport = _transport
+    if transport is None:
+        return {"transport": None}
+    stats = transport.stats.snapshot()
+    if isinstance(transport, PooledTransport):
+        stats["connections_opened"] = transport.connections_opened()
+    stats["transport"] = transport.name
+    return stats
@@ -0,0 +1,131 @@
+"""
+logging_config.py
+
+Non-blocking logging. Every record goes through a QueueHandler on the root
+logger. A single QueueListener thread per process formats it and writes it
+to stderr, so request threads never wait on log I/O. LOG_FORMAT=json (the
+default) writes one JSON object per line with the record's extra fields;
+LOG_FORMAT=text keeps the classic one-line format.
+
+Repetitive warnings are sampled. Within each LOG_SAMPLE_WINDOW seconds only
+the first LOG_SAMPLE_BURST records with the same logger, level and message
+template get through; the next one let through carries a "suppressed"
+count. Only WARNING records are sampled: the per-request cost line and other
+INFO/DEBUG records always get through, and so do errors. Either setting at 0
+turns sampling off.
+"""
+
+import atexit
+import copy
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from pythonjsonlogger.json import JsonFormatter
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
+JSON_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+_listener = None
+_queue_handler = None
+_stream_handler = None
+
+
+class RepeatSampler(logging.Filter):
+    """
+    Let through the first `burst` records of each (logger, level, template)
+    per `window` seconds, for WARNING records only. The first record let
+    through after a suppression carries the number dropped in .suppressed.
+    """
+
+    def __init__(self, burst: int, window: float):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._lock = threading.Lock()
+        # key -> [window start, records seen, records suppressed]
+        self._seen = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING or self.burst <= 0 or self.window <= 0:
+            return True
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is None or now - seen[0] >= self.window:
+                suppressed = seen[2] if seen else 0
+                self._seen[key] = [now, 1, 0]
+            elif seen[1] < self.burst:
+                seen[1] += 1
+                suppressed = 0
+            else:
+                seen[2] += 1
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Like QueueHandler, but leaves formatting to the listener's handler:
+    only the message and traceback are rendered here, so extra fields reach
+    the JSON formatter intact.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter(JSON_FORMAT, rename_fields={"levelname": "level"})
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def stop_logging():
+    """
+    Flush queued records and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def init_logging(app):
+    """
+    Route the root logger through the queue pipeline. Safe to call again
+    (e.g. once per create_app); later calls only update format, level and
+    sampling.
+    """
+    global _listener, _queue_handler, _stream_handler
+    root = logging.getLogger()
+    root.setLevel(app.config["LOG_LEVEL"].upper())
+
+    if _stream_handler is None:
+        _stream_handler = logging.StreamHandler(sys.stderr)
+    _stream_handler.setFormatter(_formatter(app.config["LOG_FORMAT"]))
+
+    if _queue_handler is None:
+        _queue_handler = _QueueHandler(queue.SimpleQueue())
+    _queue_handler.filters = [
+        RepeatSampler(app.config["LOG_SAMPLE_BURST"], app.config["LOG_SAMPLE_WINDOW"])
+    ]
+    if _queue_handler not in root.handlers:
+        root.addHandler(_queue_handler)
+
+    if _listener is None:
+        _listener = QueueListener(_queue_handler.queue, _stream_handler)
+        _listener.start()
+        atexit.register(stop_logging)
@@ -0,0 +1,273 @@
+"""
+metrics.py
+
+Prometheus metrics, served by GET /metrics:
+
+  hubspot_request_duration_seconds{family,method,status}  every HubSpot HTTP call
+  hubspot_rate_limited_total{family}                      429s from HubSpot
+  hubspot_retries_total{reason}                           tenacity retries
+  hubspot_concurrency_limit                               adaptive in-flight limit
+  hubspot_in_flight_calls                                 calls holding a slot of it
+  hubspot_concurrency_decreases_total{reason}             limit cuts (429/5xx/...)
+  hubspot_token_refreshes_total{outcome}                  OAuth token refreshes
+  hubspot_token_refresh_duration_seconds
+  db_query_duration_seconds{endpoint}                     every SQL statement
+  db_queries_per_request{endpoint}                        SQL statements per request
+  db_slow_queries_total{endpoint}                         statements over SLOW_QUERY_MS
+  db_repeated_statements_total{endpoint}                  likely N+1 patterns
+  http_request_duration_seconds{method,endpoint,status}   every Flask request
+
+Each histogram's _count is the matching call/query/request count. Under
+gunicorn, set PROMETHEUS_MULTIPROC_DIR (scripts/entrypoint.sh does) so every
+worker writes its samples there and /metrics adds them up across workers.
+gunicorn.conf.py empties the directory at start-up and marks exited workers
+dead.
+"""
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from flask import request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import tracing
+from .request_stats import current_request_stats, record_hubspot_retry, record_span
+
+HUBSPOT_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+HUBSPOT_REQUEST_SECONDS = Histogram(
+    "hubspot_request_duration_seconds",
+    "Latency of HubSpot HTTP calls, by endpoint family and status.",
+    ["family", "method", "status"],
+    buckets=HUBSPOT_BUCKETS,
+)
+HUBSPOT_RATE_LIMITED = Counter(
+    "hubspot_rate_limited_total",
+    "429 responses from HubSpot.",
+    ["family"],
+)
+HUBSPOT_RETRIES = Counter(
+    "hubspot_retries_total",
+    "HubSpot calls retried, by what triggered the retry.",
+    ["reason"],
+)
+HUBSPOT_CONCURRENCY_LIMIT = Gauge(
+    "hubspot_concurrency_limit",
+    "Current adaptive limit on in-flight HubSpot calls.",
+    multiprocess_mode="livemostrecent",
+)
+HUBSPOT_IN_FLIGHT = Gauge(
+    "hubspot_in_flight_calls",
+    "HubSpot calls holding an adaptive concurrency slot.",
+    multiprocess_mode="livesum",
+)
+HUBSPOT_CONCURRENCY_DECREASES = Counter(
+    "hubspot_concurrency_decreases_total",
+    "Multiplicative cuts of the adaptive HubSpot concurrency limit.",
+    ["reason"],
+)
+TOKEN_REFRESHES = Counter(
+    "hubspot_token_refreshes_total",
+    "HubSpot OAuth token refreshes.",
+    ["outcome"],
+)
+TOKEN_REFRESH_SECONDS = Histogram(
+    "hubspot_token_refresh_duration_seconds",
+    "Time taken by HubSpot OAuth token refreshes.",
+    buckets=HUBSPOT_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Latency of SQL statements, by the Flask endpoint that ran them.",
+    ["endpoint"],
+    buckets=DB_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements run by one request, by Flask endpoint.",
+    ["endpoint"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than SLOW_QUERY_MS, by Flask endpoint.",
+    ["endpoint"],
+)
+DB_REPEATED_STATEMENTS = Counter(
+    "db_repeated_statements_total",
+    "Statement shapes run at least N_PLUS_ONE_THRESHOLD times in one request.",
+    ["endpoint"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Latency of requests to this app, by Flask endpoint.",
+    ["method", "endpoint", "status"],
+)
+
+_OBJECT_PATH = re.compile(r"^/crm/v3/objects/(\w+)(?:/([^/]+))?(?:/(\w+))?")
+
+
+def endpoint_family(url: str) -> str:
+    """
+    A low-cardinality name for a HubSpot URL, e.g. contacts.search,
+    deals.batch_read, tickets.object (one object by ID) or associations.
+    """
+    path = urlparse(url).path
+    if path.startswith("/oauth/"):
+        return "oauth"
+    if path.startswith("/crm/v3/associations/"):
+        return "associations"
+    match = _OBJECT_PATH.match(path)
+    if not match:
+        return "other"
+    object_type, part, action = match.groups()
+    if part is None:
+        return object_type
+    if part == "search":
+        return f"{object_type}.search"
+    if part == "batch" and action:
+        return f"{object_type}.batch_{action}"
+    return f"{object_type}.object"
+
+
+class _CallStatus:
+    status = "error"
+
+
+@contextmanager
+def time_hubspot_call(
+    method: str, url: str, attempt: int = 1, backoff_slept: float = 0.0
+):
+    """
+    Time one HubSpot call (and trace it, see tracing.py). Set .status on the
+    yielded object to the response code; calls that raise are recorded with
+    status "error". attempt and backoff_slept describe the retry it is part of.
+    """
+    call = _CallStatus()
+    family = endpoint_family(url)
+    with tracing.span(
+        f"HubSpot {family}",
+        kind="client",
+        attributes={
+            "http.request.method": method.upper(),
+            "url.full": url,
+            "hubspot.endpoint": family,
+            "hubspot.attempt": attempt,
+            "hubspot.backoff_slept_seconds": backoff_slept,
+        },
+    ) as traced:
+        started = time.perf_counter()
+        try:
+            yield call
+        finally:
+            elapsed = time.perf_counter() - started
+            HUBSPOT_REQUEST_SECONDS.labels(
+                family, method.upper(), str(call.status)
+            ).observe(elapsed)
+            record_span(f"hubspot.{family}", elapsed)
+            if call.status == 429:
+                HUBSPOT_RATE_LIMITED.labels(family).inc()
+            tracing.set_attributes(traced, {"http.response.status_code": call.status})
+
+
+def record_retry(retry_state):
+    """
+    tenacity before_sleep hook: count the retry, why it happens and (for the
+    request's Server-Timing) how long it sleeps first.
+    """
+    outcome = retry_state.outcome
+    if outcome.failed:
+        reason = type(outcome.exception()).__name__
+    elif outcome.result().status_code == 429:
+        reason = "429"
+    else:
+        reason = "5xx"
+    HUBSPOT_RETRIES.labels(reason).inc()
+    record_hubspot_retry(retry_state.next_action.sleep)
+
+
+@contextmanager
+def time_token_refresh():
+    started = time.perf_counter()
+    outcome = "failure"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        TOKEN_REFRESH_SECONDS.observe(time.perf_counter() - started)
+        TOKEN_REFRESHES.labels(outcome).inc()
+
+
+def endpoint_label() -> str:
+    stats = current_request_stats()
+    if stats is None:
+        return "none"
+    return stats.endpoint or "unmatched"
+
+
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    DB_QUERY_SECONDS.labels(endpoint_label()).observe(elapsed)
+    record_span("db", elapsed)
+
+
+def _query_failed(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def render_metrics():
+    """
+    The exposition text and its content type. In multiprocess mode the
+    samples of all workers are collected from PROMETHEUS_MULTIPROC_DIR.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def init_metrics(app):
+    """
+    Time SQL statements and requests. Call after init_request_stats, whose
+    per-request endpoint and start time this reads.
+    """
+    for name, listener in (
+        ("before_cursor_execute", _query_started),
+        ("after_cursor_execute", _query_finished),
+        ("handle_error", _query_failed),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+    @app.after_request
+    def _observe_request(response):
+        stats = current_request_stats()
+        if stats is not None:
+            HTTP_REQUEST_SECONDS.labels(
+                request.method, endpoint_label(), str(response.status_code)
+            ).observe(time.perf_counter() - stats.started)
+            DB_QUERIES_PER_REQUEST.labels(endpoint_label()).observe(stats.db_queries)
+        return response
@@ -0,0 +1,161 @@
+"""
+profiling.py
+
+Opt-in per-request profiling with pyinstrument (optional dependency:
+pip install pyinstrument). A request is profiled when
+
+  - an admin (see admin_auth.py) sends "X-Profile: 1", or
+  - it falls in the PROFILING_SAMPLE_RATE share of all requests.
+
+The sampling profiler runs every PROFILING_INTERVAL seconds. Each profile is
+written to PROFILE_DIR as <request id>.speedscope.json (open it in
+https://www.speedscope.app for a flamegraph), next to a <request id>.meta.json
+summary. The response names it in X-Profile-Id. The request ID is the caller's
+X-Request-ID or a new one. Only the newest PROFILE_KEEP profiles are kept. The
+directory can be shared by all gunicorn workers; /api/admin/profiles lists it.
+
+Requests that are not profiled pay for one header lookup and one random().
+Async views run on asgiref's event loop thread, so their profiles show the
+request thread waiting rather than the coroutine's own frames.
+"""
+
+import json
+import os
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from flask import current_app, g, request
+
+from .admin_auth import is_admin_request
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # optional dependency
+    Profiler = None
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _request_id() -> str:
+    request_id = request.headers.get("X-Request-ID", "")
+    if _REQUEST_ID.match(request_id):
+        return request_id
+    return uuid.uuid4().hex
+
+
+def _profile_path(profile_dir: str, request_id: str, kind: str) -> str:
+    return os.path.join(profile_dir, f"{request_id}.{kind}.json")
+
+
+def _trigger() -> Optional[str]:
+    if request.headers.get("X-Profile") == "1" and is_admin_request():
+        return "header"
+    rate = current_app.config.get("PROFILING_SAMPLE_RATE", 0.0)
+    if rate > 0 and random.random() < rate:
+        return "sampled"
+    return None
+
+
+def _start_profile():
+    trigger = _trigger()
+    if trigger is None:
+        return
+    if Profiler is None:
+        current_app.logger.warning(
+            "Profiling requested but pyinstrument is not installed."
+        )
+        return
+    profiler = Profiler(interval=current_app.config["PROFILING_INTERVAL"])
+    profiler.start()
+    g._profile = (profiler, trigger, _request_id(), time.time())
+
+
+def _stop_profile():
+    profile = g.pop("_profile", None)
+    if profile is not None and profile[0].is_running:
+        profile[0].stop()
+    return profile
+
+
+def _save_profile(response):
+    profile = _stop_profile()
+    if profile is None:
+        return response
+    profiler, trigger, request_id, started = profile
+    meta = {
+        "request_id": request_id,
+        "method": request.method,
+        "path": request.path,
+        "status": response.status_code,
+        "duration_ms": round(profiler.last_session.duration * 1000, 1),
+        "trigger": trigger,
+        "created_at": started,
+    }
+    profile_dir = current_app.config["PROFILE_DIR"]
+    os.makedirs(profile_dir, exist_ok=True)
+    with open(_profile_path(profile_dir, request_id, "speedscope"), "w") as f:
+        f.write(profiler.output(SpeedscopeRenderer()))
+    with open(_profile_path(profile_dir, request_id, "meta"), "w") as f:
+        json.dump(meta, f)
+    _prune(profile_dir, current_app.config["PROFILE_KEEP"])
+    response.headers["X-Profile-Id"] = request_id
+    return response
+
+
+def _prune(profile_dir: str, keep: int):
+    metas = sorted(
+        (p for p in os.listdir(profile_dir) if p.endswith(".meta.json")),
+        key=lambda p: os.path.getmtime(os.path.join(profile_dir, p)),
+        reverse=True,
+    )
+    for name in metas[keep:]:
+        request_id = name[: -len(".meta.json")]
+        for kind in ("meta", "speedscope"):
+            try:
+                os.remove(_profile_path(profile_dir, request_id, kind))
+            except FileNotFoundError:
+                pass  # another worker pruned it first
+
+
+def list_profiles(profile_dir: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Summaries of the stored profiles, newest first.
+    """
+    if not os.path.isdir(profile_dir):
+        return []
+    profiles = []
+    for name in os.listdir(profile_dir):
+        if not name.endswith(".meta.json"):
+            continue
+        try:
+            with open(os.path.join(profile_dir, name)) as f:
+                profiles.append(json.load(f))
+        except (FileNotFoundError, ValueError):
+            continue  # pruned or half-written by another worker
+    profiles.sort(key=lambda p: p["created_at"], reverse=True)
+    return profiles[:limit]
+
+
+def profile_file(profile_dir: str, request_id: str) -> Optional[str]:
+    """
+    Path of the speedscope profile for request_id, or None if there is none.
+    """
+    if not _REQUEST_ID.match(request_id):
+        return None
+    path = _profile_path(profile_dir, request_id, "speedscope")
+    return path if os.path.exists(path) else None
+
+
+def init_profiling(app):
+    if app.config.get("PROFILING_SAMPLE_RATE", 0.0) > 0 and Profiler is None:
+        raise ImportError(
+            "PROFILING_SAMPLE_RATE needs the optional pyinstrument package "
+            "(pip install pyinstrument)."
+        )
+    app.before_request(_start_profile)
+    app.after_request(_save_profile)
+    app.teardown_request(lambda exc: _stop_profile())
@@ -0,0 +1,163 @@
+"""
+query_watch.py
+
+Slow-query and N+1 detection on top of SQLAlchemy engine events.
+
+  - A statement slower than SLOW_QUERY_MS is logged as a warning together
+    with its EXPLAIN plan (Postgres), counted in db_slow_queries_total and
+    added to the request's Server-Timing as db.slow.
+  - At the end of a request, every statement shape (the statement with its
+    literals and placeholder lists collapsed) that ran N_PLUS_ONE_THRESHOLD
+    times or more is logged as a likely N+1 and counted in
+    db_repeated_statements_total.
+
+Either check is off when its setting is 0. Per-request totals are included in
+the request_stats cost log line (slow_queries, repeated_queries).
+"""
+
+import logging
+import re
+import time
+from typing import List, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .metrics import DB_REPEATED_STATEMENTS, DB_SLOW_QUERIES, endpoint_label
+from .request_stats import current_request_stats, record_span
+
+logger = logging.getLogger(__name__)
+
+_SPACE = re.compile(r"\s+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s(?:\s*,\s*%\(\w+\)s)*|%s(?:\s*,\s*%s)*")
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    statement with whitespace normalised and literals, placeholders and
+    IN-lists replaced by "?", so repeats with other values compare equal.
+    """
+    shape = _SPACE.sub(" ", statement).strip()
+    shape = _LITERAL.sub("?", shape)
+    return _PLACEHOLDERS.sub("?", shape)
+
+
+def repeated_statements(stats, threshold: int) -> List[Tuple[str, int]]:
+    """
+    (shape, executions) for the shapes stats ran at least threshold times,
+    most repeated first.
+    """
+    if threshold <= 0:
+        return []
+    with stats._lock:
+        shapes = stats.query_shapes.most_common()
+    return [(shape, count) for shape, count in shapes if count >= threshold]
+
+
+def _explain(conn, cursor, statement, parameters) -> str:
+    """
+    The EXPLAIN plan of a statement that has just run, taken on the same
+    DBAPI connection inside a savepoint so a failure cannot abort the
+    caller's transaction.
+    """
+    if conn.dialect.name != "postgresql":
+        return "(EXPLAIN is only collected on PostgreSQL)"
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return "(not explainable)"
+    raw = cursor.connection
+    with raw.cursor() as explain_cursor:
+        savepoint = not raw.autocommit
+        if savepoint:
+            explain_cursor.execute("SAVEPOINT query_watch_explain")
+        try:
+            explain_cursor.execute("EXPLAIN " + statement, parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+        except Exception as e:
+            if savepoint:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT query_watch_explain")
+            return f"(EXPLAIN failed: {e})"
+        if savepoint:
+            explain_cursor.execute("RELEASE SAVEPOINT query_watch_explain")
+    return plan
+
+
+def _statement_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("watch_started", []).append(time.perf_counter())
+
+
+def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["watch_started"].pop()
+    stats = current_request_stats()
+    if stats is not None:
+        stats.count_shape(statement_shape(statement))
+
+    slow_ms = current_app.config.get("SLOW_QUERY_MS", 0) if has_app_context() else 0
+    if slow_ms <= 0 or elapsed * 1000 < slow_ms:
+        return
+    DB_SLOW_QUERIES.labels(endpoint_label()).inc()
+    record_span("db.slow", elapsed)
+    if stats is not None:
+        stats.add("slow_queries")
+    plan = (
+        "(executemany)"
+        if executemany
+        else _explain(conn, cursor, statement, parameters)
+    )
+    logger.warning(
+        "Slow query (%.1fms) in %s: %s\n%s",
+        elapsed * 1000,
+        endpoint_label(),
+        statement,
+        plan,
+        extra={
+            "duration_ms": round(elapsed * 1000, 1),
+            "endpoint": endpoint_label(),
+            "statement": statement,
+            "plan": plan,
+        },
+    )
+
+
+def _statement_failed(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("watch_started"):
+        conn.info["watch_started"].pop()
+
+
+def init_query_watch(app):
+    """
+    Register the statement hooks and the end-of-request N+1 check. Call after
+    init_request_stats.
+    """
+    for name, listener in (
+        ("before_cursor_execute", _statement_started),
+        ("after_cursor_execute", _statement_finished),
+        ("handle_error", _statement_failed),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+    @app.after_request
+    def _flag_repeated_statements(response):
+        stats = current_request_stats()
+        if stats is None:
+            return response
+        threshold = current_app.config.get("N_PLUS_ONE_THRESHOLD", 0)
+        for shape, count in repeated_statements(stats, threshold):
+            stats.add("repeated_queries", count)
+            DB_REPEATED_STATEMENTS.labels(endpoint_label()).inc()
+            logger.warning(
+                "Possible N+1 in %s: %d identical statements: %s",
+                endpoint_label(),
+                count,
+                shape,
+                extra={
+                    "endpoint": endpoint_label(),
+                    "executions": count,
+                    "statement": shape,
+                },
+            )
+        return response
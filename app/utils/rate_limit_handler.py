@@ -1,8 +1,14 @@
+import asyncio
 import logging
+import threading
+import time
+from contextvars import ContextVar
+
+import httpx
 import requests
 from requests import Response
 
-from flask import current_app
+from flask import current_app, has_app_context
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -11,10 +17,86 @@ from tenacity import (
     retry_if_result,
     RetryCallState,
 )
+from .adaptive_concurrency import (
+    async_concurrency_slot,
+    concurrency_slot,
+    get_concurrency_limiter,
+)
 from .errors import RateLimitExceededError, ServiceUnavailableError
+from .http_transport import get_transport
+from .metrics import record_retry, time_hubspot_call
+from .request_stats import record_hubspot_call, record_span
 
 logger = logging.getLogger(__name__)
 
+# (attempt number, seconds of backoff slept so far) of the HubSpot call being
+# made in this thread/task, set by tenacity before each attempt.
+_attempt: ContextVar = ContextVar("hubspot_attempt", default=(1, 0.0))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Tokens refill at `rate` per second up to `burst`.
+    reserve() takes a token immediately (possibly going into debt) and returns
+    how long the caller must wait before using it, so threads can sleep and
+    coroutines can await the same limiter without holding its lock.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Block until `tokens` may be spent; returns the time waited.
+        """
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    The process-wide HubSpot TokenBucket, built from HUBSPOT_RATE_LIMIT_PER_SECOND
+    and HUBSPOT_RATE_LIMIT_BURST (rebuilt if they change). None when disabled.
+    Outside an app context the last configured limiter is used.
+    """
+    global _rate_limiter
+    if not has_app_context():
+        return _rate_limiter
+    rate = current_app.config.get("HUBSPOT_RATE_LIMIT_PER_SECOND", 0)
+    burst = current_app.config.get("HUBSPOT_RATE_LIMIT_BURST", 1)
+    with _rate_limiter_lock:
+        if rate <= 0:
+            _rate_limiter = None
+        elif (
+            _rate_limiter is None
+            or _rate_limiter.rate != rate
+            or _rate_limiter.burst != max(1, burst)
+        ):
+            _rate_limiter = TokenBucket(rate, burst)
+        return _rate_limiter
+
 
 def _is_rate_limit_or_server_error(response: Response) -> bool:
     """
@@ -71,6 +153,13 @@ def _final_attempt_callback(retry_state: RetryCallState):
             final_resp.raise_for_status()
 
 
+def _note_attempt(retry_state: RetryCallState):
+    """
+    tenacity before hook: remember which attempt this is for time_hubspot_call.
+    """
+    _attempt.set((retry_state.attempt_number, retry_state.idle_for))
+
+
 @retry(
     stop=stop_after_attempt(5),
     wait=wait_exponential(multiplier=1.0, min=1, max=30),
@@ -80,6 +169,8 @@ def _final_attempt_callback(retry_state: RetryCallState):
     ),
     reraise=True,
     retry_error_callback=_final_attempt_callback,
+    before=_note_attempt,
+    before_sleep=record_retry,
 )
 def request_with_tenacity(method: str, url: str, **kwargs) -> requests.Response:
     """
@@ -89,10 +180,56 @@ def request_with_tenacity(method: str, url: str, **kwargs) -> requests.Response:
       - Connection/Timeout errors
     We'll raise_for_status() only if it's not a rate-limit or server error we plan to handle.
     """
-    resp = requests.request(method, url, **kwargs)
+    limiter = get_rate_limiter()
+    if limiter is not None:
+        waited = limiter.acquire()
+        if waited:
+            record_span("hubspot.throttle", waited)
+    with concurrency_slot(get_concurrency_limiter()) as slot:
+        if slot.waited:
+            record_span("hubspot.concurrency", slot.waited)
+        record_hubspot_call()
+        with time_hubspot_call(method, url, *_attempt.get()) as call:
+            resp = get_transport().request(method, url, **kwargs)
+            call.status = slot.status = resp.status_code
     if not _is_rate_limit_or_server_error(resp):
         # For 2xx or 4xx (not 429), raise an exception to fail fast
         # e.g., 400 or 404 or 403 won't be retried
         resp.raise_for_status()
     # If we see a 429 or 5xx, we let Tenacity do a retry via _needs_retry
     return resp
+
+
+@retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1.0, min=1, max=30),
+    retry=retry_if_result(_needs_retry)
+    | retry_if_exception_type((httpx.ConnectError, httpx.TimeoutException)),
+    reraise=True,
+    retry_error_callback=_final_attempt_callback,
+    before=_note_attempt,
+    before_sleep=record_retry,
+)
+async def async_request_with_tenacity(
+    client: httpx.AsyncClient, method: str, url: str, **kwargs
+) -> httpx.Response:
+    """
+    request_with_tenacity for an httpx.AsyncClient: same retry policy, same
+    shared rate limiter, but waits are awaited instead of blocking the thread.
+    """
+    limiter = get_rate_limiter()
+    if limiter is not None:
+        delay = limiter.reserve()
+        if delay > 0:
+            record_span("hubspot.throttle", delay)
+            await asyncio.sleep(delay)
+    async with async_concurrency_slot(get_concurrency_limiter()) as slot:
+        if slot.waited:
+            record_span("hubspot.concurrency", slot.waited)
+        record_hubspot_call()
+        with time_hubspot_call(method, url, *_attempt.get()) as call:
+            resp = await client.request(method, url, **kwargs)
+            call.status = slot.status = resp.status_code
+    if not _is_rate_limit_or_server_error(resp):
+        resp.raise_for_status()
+    return resp
@@ -0,0 +1,192 @@
+"""
+request_stats.py
+
+Per-request cost accounting: counts of SQL statements, HubSpot calls and
+retries, and timed spans (validate, token, hubspot.<family>, store, db, ...)
+gathered across the controller, service, OAuth and HubSpotAPI layers.
+
+At the end of every request the spans go out in a Server-Timing header
+(SERVER_TIMING_HEADER, on by default). The whole breakdown is also logged
+as one line with structured fields. X-DB-Queries and X-HubSpot-Calls are
+added when REQUEST_STATS_HEADERS is on; benchmarks/endpoints.py uses them.
+
+The counters live in a context variable, so they follow the request into
+async views; map_in_app_context hands them on to its worker threads.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestStats:
+    def __init__(self, endpoint: str = None):
+        self._lock = threading.Lock()
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.hubspot_calls = 0
+        self.hubspot_retries = 0
+        self.slow_queries = 0
+        self.repeated_queries = 0
+        # statement shape -> executions (see query_watch.py)
+        self.query_shapes: Counter = Counter()
+        # span name -> [seconds, count]
+        self.spans: Dict[str, List[float]] = {}
+
+    def add(self, name: str, count: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def count_shape(self, shape: str):
+        with self._lock:
+            self.query_shapes[shape] += 1
+
+    def add_span(self, name: str, seconds: float):
+        with self._lock:
+            totals = self.spans.setdefault(name, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+
+    def server_timing(self, total_seconds: float) -> str:
+        """
+        The spans as a Server-Timing header value, in the order first seen;
+        desc gives the count when a span ran more than once.
+        """
+        with self._lock:
+            spans = list(self.spans.items())
+        entries = []
+        for name, (seconds, count) in spans + [("total", [total_seconds, 1])]:
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                entry += f';desc="{count}x"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """
+    Counters of the request being served, or None outside a request.
+    """
+    return _current.get()
+
+
+def use_request_stats(stats: Optional[RequestStats]):
+    """
+    Count this thread's work towards stats (another thread's request).
+    """
+    _current.set(stats)
+
+
+def record_hubspot_call():
+    """
+    Count one HubSpot HTTP call (every attempt, retries included).
+    """
+    stats = _current.get()
+    if stats is not None:
+        stats.add("hubspot_calls")
+
+
+def record_hubspot_retry(backoff_seconds: float):
+    """
+    Count one retried HubSpot call and the backoff slept before it.
+    """
+    stats = _current.get()
+    if stats is not None:
+        stats.add("hubspot_retries")
+        stats.add_span("hubspot.backoff", backoff_seconds)
+
+
+def record_span(name: str, seconds: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.add_span(name, seconds)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time the enclosed block as a span of the current request (if any).
+    """
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_span(name, time.perf_counter() - started)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.add("db_queries")
+
+
+def init_request_stats(app):
+    """
+    Register the hooks. Every request is counted; SERVER_TIMING_HEADER and
+    REQUEST_STATS_HEADERS decide per request which headers are sent back.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _count_query):
+        event.listen(Engine, "before_cursor_execute", _count_query)
+
+    @app.before_request
+    def _start_request_stats():
+        _current.set(RequestStats(request.endpoint))
+
+    @app.after_request
+    def _add_request_stats_headers(response):
+        stats = _current.get()
+        if stats is None:
+            return response
+        total = time.perf_counter() - stats.started
+        if current_app.config.get("SERVER_TIMING_HEADER"):
+            response.headers["Server-Timing"] = stats.server_timing(total)
+        if current_app.config.get("REQUEST_STATS_HEADERS"):
+            response.headers["X-DB-Queries"] = str(stats.db_queries)
+            response.headers["X-HubSpot-Calls"] = str(stats.hubspot_calls)
+
+        spans_ms = {name: round(s * 1000, 1) for name, (s, _) in stats.spans.items()}
+        current_app.logger.info(
+            "%s %s -> %d in %.1fms (hubspot_calls=%d hubspot_retries=%d "
+            "db_queries=%d spans=%s)",
+            request.method,
+            request.path,
+            response.status_code,
+            total * 1000,
+            stats.hubspot_calls,
+            stats.hubspot_retries,
+            stats.db_queries,
+            spans_ms,
+            extra={
+                "http_method": request.method,
+                "http_path": request.path,
+                "endpoint": stats.endpoint,
+                "status": response.status_code,
+                "duration_ms": round(total * 1000, 1),
+                "hubspot_calls": stats.hubspot_calls,
+                "hubspot_retries": stats.hubspot_retries,
+                "db_queries": stats.db_queries,
+                "slow_queries": stats.slow_queries,
+                "repeated_queries": stats.repeated_queries,
+                "spans_ms": spans_ms,
+            },
+        )
+        return response
+
+    @app.teardown_request
+    def _stop_request_stats(exc):
+        _current.set(None)
@@ -0,0 +1,43 @@
+"""
+streaming.py
+
+Generators that render row iterators as NDJSON or CSV chunks for
+streamed Flask responses.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def ndjson_stream(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    One compact JSON document per line.
+    """
+    for row in rows:
+        yield json.dumps(row, separators=(",", ":")) + "\n"
+
+
+def csv_stream(rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Iterator[str]:
+    """
+    Header line followed by one CSV line per row. A single small buffer is
+    reused so only the current line is ever held in memory.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Header only, if there were no rows
+    if buffer.tell():
+        yield buffer.getvalue()
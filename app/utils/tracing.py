@@ -0,0 +1,260 @@
+"""
+tracing.py
+
+Optional OpenTelemetry tracing, off unless TRACING_EXPORTER is set:
+
+  console   spans are written to stdout, one JSON object per line
+  file      spans are appended to TRACING_FILE, one JSON object per line
+
+Spans: one per Flask request (continuing the caller's trace when a W3C
+traceparent header is sent), one per HubSpot HTTP attempt (endpoint family,
+status, attempt number, backoff slept so far) and one per SQL statement.
+TRACING_SAMPLE_RATIO samples new traces; a caller's sampling decision is
+kept. Needs the optional SDK: pip install opentelemetry-sdk.
+
+While tracing is off every helper here is a no-op and OpenTelemetry is
+never imported.
+"""
+
+import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_tracer = None
+_provider = None
+
+
+def _one_line(span) -> str:
+    return span.to_json(indent=None) + "\n"
+
+
+def configure_tracing(
+    exporter=None,
+    sample_ratio: float = 1.0,
+    service_name: str = "hubspot-crm-integration",
+):
+    """
+    Send spans to exporter (an OpenTelemetry SpanExporter), or turn tracing
+    off when it is None. Returns the TracerProvider.
+    """
+    global _tracer, _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _tracer = _provider = None
+    if exporter is None:
+        return None
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = _provider.get_tracer(__name__)
+    return _provider
+
+
+def force_flush():
+    if _provider is not None:
+        _provider.force_flush()
+
+
+def _exporter_from_config(config):
+    name = config.get("TRACING_EXPORTER")
+    if not name:
+        return None
+    try:
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+    except ImportError as e:
+        raise ImportError(
+            "TRACING_EXPORTER needs the optional OpenTelemetry SDK "
+            "(pip install opentelemetry-sdk)."
+        ) from e
+    if name == "console":
+        out = sys.stdout
+    elif name == "file":
+        out = open(config["TRACING_FILE"], "a", buffering=1)
+    else:
+        raise ValueError(
+            f"Unknown TRACING_EXPORTER {name!r}; expected console or file."
+        )
+    return ConsoleSpanExporter(out=out, formatter=_one_line)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", attributes: Dict[str, Any] = None):
+    """
+    A child span of the current one, or nothing while tracing is off.
+    Yields the span (None when off); exceptions are recorded on it.
+    """
+    if _tracer is None:
+        yield None
+        return
+    from opentelemetry.trace import SpanKind
+
+    with _tracer.start_as_current_span(
+        name, kind=SpanKind[kind.upper()], attributes=attributes
+    ) as current:
+        yield current
+
+
+def set_attributes(current, attributes: Dict[str, Any]):
+    if current is not None:
+        current.set_attributes(attributes)
+
+
+def current_context():
+    """
+    The active trace context, to hand to another thread (see attached).
+    """
+    if _tracer is None:
+        return None
+    from opentelemetry import context
+
+    return context.get_current()
+
+
+@contextmanager
+def attached(trace_context):
+    """
+    Make trace_context (from current_context) active in this thread.
+    """
+    if trace_context is None:
+        yield
+        return
+    from opentelemetry import context
+
+    token = context.attach(trace_context)
+    try:
+        yield
+    finally:
+        context.detach(token)
+
+
+def _start_request_span():
+    if _tracer is None:
+        return
+    from opentelemetry import context, trace
+    from opentelemetry.trace import SpanKind
+    from opentelemetry.trace.propagation.tracecontext import (
+        TraceContextTextMapPropagator,
+    )
+
+    parent = TraceContextTextMapPropagator().extract(carrier=request.headers)
+    route = request.url_rule.rule if request.url_rule else request.path
+    current = _tracer.start_span(
+        f"{request.method} {route}",
+        context=parent,
+        kind=SpanKind.SERVER,
+        attributes={
+            "http.request.method": request.method,
+            "http.route": route,
+            "url.path": request.path,
+        },
+    )
+    g._trace_span = current
+    g._trace_token = context.attach(trace.set_span_in_context(current, parent))
+
+
+def _finish_request_span(response):
+    current = g.get("_trace_span")
+    if current is not None:
+        current.set_attribute("http.response.status_code", response.status_code)
+        if response.status_code >= 500:
+            from opentelemetry.trace import Status, StatusCode
+
+            current.set_status(Status(StatusCode.ERROR))
+    return response
+
+
+def _end_request_span(exc):
+    current = g.pop("_trace_span", None)
+    if current is None:
+        return
+    from opentelemetry import context
+
+    if exc is not None:
+        current.record_exception(exc)
+    current.end()
+    context.detach(g.pop("_trace_token"))
+
+
+def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+    if _tracer is None:
+        return
+    from opentelemetry.trace import SpanKind
+
+    current = _tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement else "SQL",
+        kind=SpanKind.CLIENT,
+        attributes={"db.system": "postgresql", "db.statement": statement[:2000]},
+    )
+    conn.info.setdefault("trace_spans", []).append(current)
+
+
+def _end_query_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        spans.pop().end()
+
+
+def _fail_query_span(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get("trace_spans") if conn is not None else None
+    if spans:
+        from opentelemetry.trace import Status, StatusCode
+
+        current = spans.pop()
+        current.record_exception(exception_context.original_exception)
+        current.set_status(Status(StatusCode.ERROR))
+        current.end()
+
+
+def init_tracing(app):
+    """
+    Register the request and SQL hooks, and start exporting if
+    TRACING_EXPORTER is set.
+    """
+    exporter = _exporter_from_config(app.config)
+    if exporter is not None:
+        configure_tracing(
+            exporter,
+            sample_ratio=app.config.get("TRACING_SAMPLE_RATIO", 1.0),
+            service_name=app.config.get(
+                "TRACING_SERVICE_NAME", "hubspot-crm-integration"
+            ),
+        )
+
+    for name, listener in (
+        ("before_cursor_execute", _start_query_span),
+        ("after_cursor_execute", _end_query_span),
+        ("handle_error", _fail_query_span),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+    app.before_request(_start_request_span)
+    app.after_request(_finish_request_span)
+    app.teardown_request(_end_request_span)
+
+
+def trace_id() -> Optional[str]:
+    """
+    The current trace ID as 32 hex digits, or None (e.g. for log fields).
+    """
+    if _tracer is None:
+        return None
+    from opentelemetry import trace
+
+    span_context = trace.get_current_span().get_span_context()
+    if not span_context.is_valid:
+        return None
+    return format(span_context.trace_id, "032x")
@@ -0,0 +1,85 @@
+"""
+webhook_signature.py
+
+Verification of HubSpot webhook request signatures.
+https://developers.hubspot.com/docs/api/webhooks/validating-requests
+"""
+
+import base64
+import hashlib
+import hmac
+import time
+
+from .errors import UnauthorizedError
+
+# Characters HubSpot decodes in the request URI before signing (v3).
+_V3_URI_DECODE = {
+    "%3A": ":",
+    "%2F": "/",
+    "%3F": "?",
+    "%40": "@",
+    "%21": "!",
+    "%24": "$",
+    "%27": "'",
+    "%28": "(",
+    "%29": ")",
+    "%2A": "*",
+    "%2C": ",",
+    "%3B": ";",
+}
+
+
+def _decode_uri(uri: str) -> str:
+    for encoded, char in _V3_URI_DECODE.items():
+        uri = uri.replace(encoded, char).replace(encoded.lower(), char)
+    return uri
+
+
+def verify_hubspot_signature(
+    method: str,
+    uri: str,
+    body: bytes,
+    headers,
+    client_secret: str,
+    max_age_seconds: int = 300,
+) -> None:
+    """
+    Raise UnauthorizedError unless the request carries a valid HubSpot
+    signature. v3 (HMAC-SHA256 with a timestamp) is checked when present;
+    otherwise the older v1/v2 SHA-256 signatures are accepted.
+    """
+    if not client_secret:
+        raise UnauthorizedError(message="Webhook client secret is not configured.")
+    body_text = body.decode("utf-8")
+
+    signature_v3 = headers.get("X-HubSpot-Signature-v3")
+    if signature_v3:
+        timestamp = headers.get("X-HubSpot-Request-Timestamp", "")
+        try:
+            age = time.time() - int(timestamp) / 1000
+        except ValueError:
+            raise UnauthorizedError(message="Invalid webhook timestamp.")
+        if age > max_age_seconds:
+            raise UnauthorizedError(message="Webhook request is too old.")
+
+        source = f"{method}{_decode_uri(uri)}{body_text}{timestamp}"
+        expected = base64.b64encode(
+            hmac.new(
+                client_secret.encode("utf-8"), source.encode("utf-8"), hashlib.sha256
+            ).digest()
+        ).decode("ascii")
+        if not hmac.compare_digest(expected, signature_v3):
+            raise UnauthorizedError(message="Invalid webhook signature.")
+        return
+
+    signature = headers.get("X-HubSpot-Signature")
+    version = headers.get("X-HubSpot-Signature-Version", "v1")
+    if not signature:
+        raise UnauthorizedError(message="Missing webhook signature.")
+    if version == "v2":
+        source = f"{client_secret}{method}{uri}{body_text}"
+    else:
+        source = f"{client_secret}{body_text}"
+    expected = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    if not hmac.compare_digest(expected, signature):
+        raise UnauthorizedError(message="Invalid webhook signature.")
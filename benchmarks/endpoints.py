@@ -0,0 +1,318 @@
+"""
+End-to-end benchmark of the main API endpoints.
+
+Starts the HubSpot stand-in (benchmarks/hubspot_standin.py) and the app under
+gunicorn, pointed at it and at a local Postgres, then drives each scenario
+from a pool of client threads:
+
+  contacts          POST /api/contacts         (new contact per request)
+  deals             POST /api/deals            (new deal per request)
+  tickets           POST /api/tickets
+  new-crm-objects   GET  /api/new-crm-objects?objectType=contacts
+
+and reports throughput, p50/p95/p99 latency, HubSpot calls per request and
+DB queries per request (from the X-HubSpot-Calls / X-DB-Queries headers the
+app adds with REQUEST_STATS_HEADERS=1):
+
+    DB_NAME=hubspot_crm_db_bench python -m benchmarks.endpoints --migrate \
+        --requests 500 --concurrency 16 --latency lognormal:40:0.5 \
+        --output results.json --baseline previous.json --threshold 0.10
+
+Use a database of its own: every write scenario adds rows, and the app
+stores the stand-in's access token in hubspot_auth. With --baseline the run
+exits 1 if a scenario got slower, lost throughput, or makes more HubSpot
+calls or queries per request by more than --threshold.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.hubspot_standin import StandinConfig, StandinServer
+
+SCENARIOS = {
+    "contacts": (
+        "POST",
+        "/api/contacts",
+        lambda run, i: {
+            "email": f"bench-{run}-{i}@example.com",
+            "firstname": "Bench",
+            "lastname": f"User{i}",
+            "phone": f"+1-555-{i:07d}",
+        },
+    ),
+    "deals": (
+        "POST",
+        "/api/deals",
+        lambda run, i: {
+            "dealname": f"Bench deal {run}-{i}",
+            "amount": 100 + i,
+            "dealstage": "appointmentscheduled",
+        },
+    ),
+    "tickets": (
+        "POST",
+        "/api/tickets",
+        lambda run, i: {
+            "subject": f"Bench ticket {run}-{i}",
+            "description": "Benchmark",
+            "category": "general_inquiry",
+            "pipeline": "0",
+            "hs_ticket_priority": "LOW",
+            "hs_pipeline_stage": "1",
+        },
+    ),
+    "new-crm-objects": (
+        "GET",
+        "/api/new-crm-objects?objectType=contacts&page=1&limit=10",
+        None,
+    ),
+}
+
+# Result fields compared against a baseline, and which direction is worse.
+HIGHER_IS_WORSE = ("p50_ms", "p95_ms", "p99_ms", "hubspot_calls", "db_queries")
+LOWER_IS_WORSE = ("requests_per_second",)
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_scenario(
+    base_url: str, name: str, total: int, concurrency: int, warmup: int
+) -> dict:
+    method, path, body = SCENARIOS[name]
+    run = uuid.uuid4().hex[:8]
+    local = threading.local()
+
+    def call(i):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        resp = session.request(
+            method,
+            base_url + path,
+            json=body(run, i) if body else None,
+            timeout=60,
+        )
+        return (
+            time.perf_counter() - started,
+            resp.status_code,
+            int(resp.headers.get("X-HubSpot-Calls", 0)),
+            int(resp.headers.get("X-DB-Queries", 0)),
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(-warmup, 0)))
+        started = time.perf_counter()
+        samples = list(pool.map(call, range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(s[0] * 1000 for s in samples)
+    statuses = {}
+    for sample in samples:
+        statuses[str(sample[1])] = statuses.get(str(sample[1]), 0) + 1
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": sum(1 for s in samples if s[1] >= 400),
+        "statuses": statuses,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "hubspot_calls": round(sum(s[2] for s in samples) / total, 2),
+        "db_queries": round(sum(s[3] for s in samples) / total, 2),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Regressions of current against baseline (both as written by --output),
+    as human-readable lines; empty if there are none.
+    """
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for field in HIGHER_IS_WORSE + LOWER_IS_WORSE:
+            old, new = before.get(field), result.get(field)
+            if old is None or new is None:
+                continue
+            if field in HIGHER_IS_WORSE:
+                worse = new > old * (1 + threshold) and new - old > 0.05
+            else:
+                worse = new < old * (1 - threshold)
+            if worse:
+                regressions.append(f"{name}: {field} {old} -> {new}")
+    return regressions
+
+
+def start_app(args, standin_url: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        HUBSPOT_API_BASE_URL=standin_url,
+        HUBSPOT_OAUTH_TOKEN_URL=f"{standin_url}/oauth/v1/token",
+        HUBSPOT_REFRESH_TOKEN=os.environ.get("HUBSPOT_REFRESH_TOKEN") or "bench",
+        HUBSPOT_RATE_LIMIT_PER_SECOND=str(args.client_rate_limit),
+        REQUEST_STATS_HEADERS="1",
+        FLASK_ENV=os.environ.get("FLASK_ENV", "production"),
+        PROMETHEUS_MULTIPROC_DIR=os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        or tempfile.mkdtemp(prefix="bench-metrics-"),
+        LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"),
+    )
+    if args.migrate:
+        subprocess.run(["alembic", "upgrade", "head"], env=env, check=True)
+    command = [
+        "gunicorn",
+        "app.main:create_app()",
+        "--config",
+        "gunicorn.conf.py",
+        "--bind",
+        f"127.0.0.1:{args.port}",
+        "--workers",
+        str(args.workers),
+        "--threads",
+        str(args.threads),
+    ]
+    return subprocess.Popen(command, env=env)
+
+
+def wait_until_up(base_url: str, process: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError("gunicorn exited before it was ready")
+        try:
+            requests.get(f"{base_url}/api/docs/", timeout=5)
+            return
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"{base_url} did not come up within {timeout}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario(s) to run (default: all).",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=1, help="gunicorn threads")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument(
+        "--app-url",
+        help="Benchmark an already running app instead of starting gunicorn; "
+        "it must use the stand-in on --standin-port and REQUEST_STATS_HEADERS=1.",
+    )
+    parser.add_argument("--standin-port", type=int, default=0)
+    parser.add_argument(
+        "--migrate", action="store_true", help="alembic upgrade head first."
+    )
+    parser.add_argument("--latency", default="fixed:20", help="Stand-in latency.")
+    parser.add_argument("--error-rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate-5xx", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--client-rate-limit",
+        type=float,
+        default=0,
+        help="HUBSPOT_RATE_LIMIT_PER_SECOND for the app (0 = off).",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--baseline", help="Earlier --output to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed relative regression against --baseline.",
+    )
+    args = parser.parse_args(argv)
+
+    standin = StandinServer(
+        StandinConfig(
+            latency=args.latency,
+            error_rate_429=args.error_rate_429,
+            error_rate_5xx=args.error_rate_5xx,
+            seed=args.seed,
+        ),
+        port=args.standin_port,
+    ).start()
+    process = None
+    base_url = args.app_url
+    try:
+        if base_url is None:
+            process = start_app(args, standin.base_url)
+            base_url = f"http://127.0.0.1:{args.port}"
+        wait_until_up(base_url, process)
+
+        scenarios = {}
+        for name in args.scenario or list(SCENARIOS):
+            scenarios[name] = run_scenario(
+                base_url, name, args.requests, args.concurrency, args.warmup
+            )
+            print(f"{name:<16} {json.dumps(scenarios[name])}", file=sys.stderr)
+        standin_stats = requests.get(
+            f"{standin.base_url}/__standin/stats", timeout=5
+        ).json()
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        standin.stop()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "workers": args.workers,
+            "threads": args.threads,
+            "latency": args.latency,
+            "error_rate_429": args.error_rate_429,
+            "error_rate_5xx": args.error_rate_5xx,
+            "standin": standin_stats["counters"],
+        },
+        "scenarios": scenarios,
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(json.load(fh), results, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,694 @@
+"""
+A local stand-in for the parts of the HubSpot API this app uses, for load
+and latency testing without touching the real HubSpot.
+
+It serves, from memory:
+  POST   /oauth/v1/token                               token refresh
+  POST   /crm/v3/objects/{type}                         create (inline associations)
+  GET    /crm/v3/objects/{type}                         list (limit/after)
+  GET    /crm/v3/objects/{type}/{id}                    read
+  PATCH  /crm/v3/objects/{type}/{id}                    update
+  DELETE /crm/v3/objects/{type}/{id}                    archive
+  POST   /crm/v3/objects/{type}/search                  search (filters, sorts, paging)
+  POST   /crm/v3/objects/{type}/batch/{read|create|upsert}
+  POST   /crm/v3/associations/{from}/{to}/batch/create
+  GET    /__standin/stats                               request/fault counters
+  POST   /__standin/reset                               clear objects and counters
+
+Every response is delayed by a sample from the latency model. A share of
+requests can be failed with 429 or 5xx, and a fixed-window rate limit per
+access token sends HubSpot's X-HubSpot-RateLimit-* headers and answers 429
+once the window is used up. All randomness comes from one seeded RNG, so
+for a given seed and request order a run is reproducible.
+
+    python -m benchmarks.hubspot_standin --port 8099 --latency lognormal:40:0.5 \
+        --error-rate-429 0.01 --error-rate-5xx 0.005 --rate-limit 100 --seed 7
+
+Point the app at it with HUBSPOT_API_BASE_URL=http://127.0.0.1:8099 and
+HUBSPOT_OAUTH_TOKEN_URL=http://127.0.0.1:8099/oauth/v1/token.
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+OBJECT_TYPES = ("contacts", "deals", "tickets")
+
+# Properties filtered and sorted as epoch milliseconds.
+CREATED_PROPERTIES = {"createdate"}
+MODIFIED_PROPERTIES = {"lastmodifieddate", "hs_lastmodifieddate"}
+
+SEARCH_MAX_RESULTS = 10000
+BATCH_LIMIT = 100
+
+_OBJECT_PATH = re.compile(r"^/crm/v3/objects/(\w+)(?:/([^/]+))?(?:/(\w+))?$")
+_ASSOCIATION_PATH = re.compile(r"^/crm/v3/associations/(\w+)/(\w+)/batch/create$")
+
+
+class LatencyModel:
+    """
+    Response delay, parsed from a spec:
+      fixed:MS                  always MS
+      uniform:LOW_MS:HIGH_MS    uniform between the two
+      normal:MEAN_MS:STDEV_MS   normal, clipped at zero
+      lognormal:MEDIAN_MS:SIGMA log-normal with that median (long tail)
+      exponential:MEAN_MS       exponential with that mean
+    """
+
+    def __init__(self, spec: str = "fixed:0"):
+        kind, *args = spec.split(":")
+        self.spec = spec
+        self.kind = kind
+        self.args = [float(a) for a in args]
+        expected = {
+            "fixed": 1,
+            "uniform": 2,
+            "normal": 2,
+            "lognormal": 2,
+            "exponential": 1,
+        }
+        if self.kind not in expected or len(self.args) != expected[self.kind]:
+            raise ValueError(f"Bad latency spec {spec!r}; see LatencyModel.")
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        One delay, in seconds.
+        """
+        a = self.args
+        if self.kind == "fixed":
+            ms = a[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(a[0], a[1])
+        elif self.kind == "normal":
+            ms = max(0.0, rng.gauss(a[0], a[1]))
+        elif self.kind == "lognormal":
+            ms = rng.lognormvariate(math.log(max(a[0], 1e-3)), a[1])
+        else:
+            ms = rng.expovariate(1.0 / a[0]) if a[0] > 0 else 0.0
+        return ms / 1000.0
+
+
+class StandinConfig:
+    def __init__(
+        self,
+        latency: str = "fixed:0",
+        error_rate_429: float = 0.0,
+        error_rate_5xx: float = 0.0,
+        rate_limit: int = 0,
+        rate_window: float = 10.0,
+        token_ttl: int = 1800,
+        seed: int = 0,
+        seed_objects: int = 0,
+    ):
+        self.latency = LatencyModel(latency)
+        self.error_rate_429 = error_rate_429
+        self.error_rate_5xx = error_rate_5xx
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.token_ttl = token_ttl
+        self.seed = seed
+        self.seed_objects = seed_objects
+
+
+def _iso(millis: int) -> str:
+    return (
+        datetime.datetime.fromtimestamp(millis / 1000, datetime.timezone.utc)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class StandinState:
+    """
+    In-memory objects, associations and counters, behind one lock.
+    """
+
+    def __init__(self, config: StandinConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.rng = random.Random(self.config.seed)
+            self.ids = itertools.count(1001)
+            self.objects = {object_type: {} for object_type in OBJECT_TYPES}
+            self.associations = []
+            self.tokens = {}
+            self.windows = {}
+            self.stats = Counter()
+            self.started = time.time()
+        if self.config.seed_objects:
+            self.seed(self.config.seed_objects)
+
+    def seed(self, per_type: int):
+        """
+        per_type objects of each type, created over the last 365 days.
+        """
+        now = _now_ms()
+        span = 365 * 24 * 3600 * 1000
+        with self.lock:
+            for object_type in OBJECT_TYPES:
+                for i in range(per_type):
+                    created = now - span + (span * i) // max(per_type, 1)
+                    self._create(object_type, _seed_properties(object_type, i), created)
+
+    # --- helpers below expect self.lock to be held ---
+
+    def _create(self, object_type: str, properties: dict, created_ms: int = None):
+        object_id = str(next(self.ids))
+        created_ms = created_ms or _now_ms()
+        record = {
+            "id": object_id,
+            "properties": {k: _string(v) for k, v in properties.items()},
+            "created_ms": created_ms,
+            "updated_ms": created_ms,
+            "archived": False,
+        }
+        self.objects[object_type][object_id] = record
+        return record
+
+    def _update(self, record: dict, properties: dict):
+        record["properties"].update({k: _string(v) for k, v in properties.items()})
+        record["updated_ms"] = max(_now_ms(), record["updated_ms"] + 1)
+
+    def _find(self, object_type: str, prop: str, value) -> dict:
+        value = str(value).lower()
+        for record in self.objects[object_type].values():
+            if str(record["properties"].get(prop, "")).lower() == value:
+                return record
+        return None
+
+
+def _string(value):
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _seed_properties(object_type: str, i: int) -> dict:
+    if object_type == "contacts":
+        return {
+            "email": f"seed{i}@example.com",
+            "firstname": f"Seed{i}",
+            "lastname": "Contact",
+            "phone": f"+1-555-{i:07d}",
+        }
+    if object_type == "deals":
+        return {
+            "dealname": f"Seed deal {i}",
+            "amount": str(100 + i),
+            "dealstage": "appointmentscheduled",
+            "pipeline": "default",
+        }
+    return {
+        "subject": f"Seed ticket {i}",
+        "content": "Seeded",
+        "hs_pipeline": "0",
+        "hs_pipeline_stage": "1",
+        "hs_ticket_priority": "LOW",
+    }
+
+
+def _render(record: dict, properties: list = None) -> dict:
+    """
+    A record as HubSpot returns it.
+    """
+    values = dict(record["properties"])
+    values["hs_object_id"] = record["id"]
+    values["createdate"] = _iso(record["created_ms"])
+    values["lastmodifieddate"] = values["hs_lastmodifieddate"] = _iso(
+        record["updated_ms"]
+    )
+    if properties:
+        values = {k: values.get(k) for k in set(properties) | {"hs_object_id"}}
+    return {
+        "id": record["id"],
+        "properties": values,
+        "createdAt": _iso(record["created_ms"]),
+        "updatedAt": _iso(record["updated_ms"]),
+        "archived": record["archived"],
+    }
+
+
+def _sort_value(record: dict, prop: str):
+    if prop in CREATED_PROPERTIES:
+        return record["created_ms"]
+    if prop in MODIFIED_PROPERTIES:
+        return record["updated_ms"]
+    return str(record["properties"].get(prop) or "")
+
+
+def _matches(record: dict, flt: dict) -> bool:
+    prop, operator = flt.get("propertyName"), flt.get("operator", "EQ")
+    actual = _sort_value(record, prop)
+    if operator == "HAS_PROPERTY":
+        return actual not in ("", None)
+    if operator == "NOT_HAS_PROPERTY":
+        return actual in ("", None)
+    if operator == "IN":
+        return str(actual).lower() in {str(v).lower() for v in flt.get("values", [])}
+    expected = flt.get("value")
+    if isinstance(actual, int):
+        expected = int(expected)
+    else:
+        try:
+            actual, expected = float(actual), float(expected)
+        except (TypeError, ValueError):
+            actual, expected = str(actual).lower(), str(expected).lower()
+    if operator == "EQ":
+        return actual == expected
+    if operator == "NEQ":
+        return actual != expected
+    if operator == "GT":
+        return actual > expected
+    if operator == "GTE":
+        return actual >= expected
+    if operator == "LT":
+        return actual < expected
+    if operator == "LTE":
+        return actual <= expected
+    if operator == "CONTAINS_TOKEN":
+        return str(expected).strip("*") in str(actual)
+    raise ValueError(f"Unsupported operator {operator}")
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "HubSpotStandin/1.0"
+
+    @property
+    def state(self) -> StandinState:
+        return self.server.state
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        if url.path.startswith("/__standin/"):
+            return self._control(method, url.path)
+
+        state, config = self.state, self.state.config
+        with state.lock:
+            state.stats["requests"] += 1
+            state.stats[f"{method} {self._route_name(url.path)}"] += 1
+            delay = config.latency.sample(state.rng)
+            roll = state.rng.random()
+            status_5xx = state.rng.choice([500, 502, 503, 504])
+        time.sleep(delay)
+
+        headers = {}
+        if url.path != "/oauth/v1/token":
+            limited, headers = self._rate_limit()
+            if limited:
+                return self._send(
+                    429,
+                    {
+                        "status": "error",
+                        "category": "RATE_LIMITS",
+                        "message": "You have reached your secondly limit.",
+                    },
+                    headers,
+                )
+        if roll < config.error_rate_429:
+            with state.lock:
+                state.stats["injected_429"] += 1
+            return self._send(
+                429, {"status": "error", "category": "RATE_LIMITS"}, headers
+            )
+        if roll < config.error_rate_429 + config.error_rate_5xx:
+            with state.lock:
+                state.stats[f"injected_{status_5xx}"] += 1
+            return self._send(
+                status_5xx, {"status": "error", "message": "Injected failure"}, headers
+            )
+
+        try:
+            if url.path == "/oauth/v1/token" and method == "POST":
+                status, body = self._token(raw)
+            else:
+                body_json = json.loads(raw) if raw else {}
+                status, body = self._crm(method, url, body_json)
+        except (ValueError, KeyError) as e:
+            status, body = 400, {"status": "error", "message": str(e)}
+        self._send(status, body, headers)
+
+    @staticmethod
+    def _route_name(path: str) -> str:
+        return re.sub(r"/\d+", "/{id}", path)
+
+    def _rate_limit(self):
+        config = self.state.config
+        if not config.rate_limit:
+            return False, {}
+        token = self.headers.get("Authorization", "")
+        window_ms = int(config.rate_window * 1000)
+        now = _now_ms()
+        with self.state.lock:
+            start, used = self.state.windows.get(token, (now, 0))
+            if now - start >= window_ms:
+                start, used = now, 0
+            used += 1
+            self.state.windows[token] = (start, used)
+            limited = used > config.rate_limit
+            if limited:
+                self.state.stats["rate_limited_429"] += 1
+        headers = {
+            "X-HubSpot-RateLimit-Max": str(config.rate_limit),
+            "X-HubSpot-RateLimit-Remaining": str(max(0, config.rate_limit - used)),
+            "X-HubSpot-RateLimit-Interval-Milliseconds": str(window_ms),
+        }
+        if limited:
+            headers["Retry-After"] = str(
+                max(1, math.ceil((start + window_ms - now) / 1000))
+            )
+        return limited, headers
+
+    def _send(self, status: int, body, headers: dict = None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        with self.state.lock:
+            self.state.stats[f"status_{status}"] += 1
+
+    def _control(self, method: str, path: str):
+        if path == "/__standin/stats" and method == "GET":
+            with self.state.lock:
+                body = {
+                    "uptime_seconds": round(time.time() - self.state.started, 3),
+                    "objects": {
+                        t: len(objects) for t, objects in self.state.objects.items()
+                    },
+                    "associations": len(self.state.associations),
+                    "counters": dict(self.state.stats),
+                }
+            return self._send(200, body)
+        if path == "/__standin/reset" and method == "POST":
+            self.state.reset()
+            return self._send(204, None)
+        return self._send(404, {"status": "error", "message": "Unknown control path"})
+
+    def _token(self, raw: bytes):
+        form = {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+        if form.get("grant_type") != "refresh_token" or not form.get("refresh_token"):
+            return 400, {"status": "BAD_REFRESH_TOKEN", "message": "missing token"}
+        with self.state.lock:
+            self.state.stats["token_refreshes"] += 1
+            token = f"standin-{self.state.rng.getrandbits(64):016x}"
+            self.state.tokens[token] = time.time() + self.state.config.token_ttl
+        return 200, {
+            "access_token": token,
+            "refresh_token": form["refresh_token"],
+            "expires_in": self.state.config.token_ttl,
+            "token_type": "bearer",
+        }
+
+    def _crm(self, method: str, url, body: dict):
+        match = _ASSOCIATION_PATH.match(url.path)
+        if match and method == "POST":
+            return self._associate(match.group(1).lower(), match.group(2).lower(), body)
+
+        match = _OBJECT_PATH.match(url.path)
+        if not match or match.group(1) not in OBJECT_TYPES:
+            return 404, {"status": "error", "message": f"No route {url.path}"}
+        object_type, part, action = match.groups()
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if part is None:
+            if method == "POST":
+                return self._create_one(object_type, body)
+            if method == "GET":
+                return self._list(object_type, query)
+        elif part == "search" and method == "POST":
+            return self._search(object_type, body)
+        elif part == "batch" and method == "POST" and action:
+            return self._batch(object_type, action, body)
+        elif action is None:
+            return self._single(method, object_type, part, body)
+        return 405, {"status": "error", "message": "Method not allowed"}
+
+    def _create_one(self, object_type: str, body: dict):
+        with self.state.lock:
+            record = self.state._create(object_type, body.get("properties") or {})
+            self._link(object_type, record["id"], body.get("associations"))
+            return 201, _render(record)
+
+    def _link(self, object_type: str, object_id: str, associations):
+        for association in associations or []:
+            for kind in association.get("types", [{}]):
+                self.state.associations.append(
+                    (
+                        object_type,
+                        object_id,
+                        str(association["to"]["id"]),
+                        kind.get("associationTypeId"),
+                    )
+                )
+
+    def _single(self, method: str, object_type: str, object_id: str, body: dict):
+        with self.state.lock:
+            record = self.state.objects[object_type].get(object_id)
+            if record is None or record["archived"]:
+                return 404, {"status": "error", "category": "OBJECT_NOT_FOUND"}
+            if method == "GET":
+                return 200, _render(record)
+            if method == "PATCH":
+                self.state._update(record, body.get("properties") or {})
+                return 200, _render(record)
+            if method == "DELETE":
+                record["archived"] = True
+                return 204, None
+        return 405, {"status": "error", "message": "Method not allowed"}
+
+    def _list(self, object_type: str, query: dict):
+        limit = min(int(query.get("limit", 10)), 100)
+        offset = int(query.get("after") or 0)
+        with self.state.lock:
+            records = [
+                r for r in self.state.objects[object_type].values() if not r["archived"]
+            ]
+            page = [_render(r) for r in records[offset : offset + limit]]
+        body = {"results": page}
+        if offset + limit < len(records):
+            body["paging"] = {"next": {"after": str(offset + limit)}}
+        return 200, body
+
+    def _search(self, object_type: str, body: dict):
+        limit = min(int(body.get("limit", 10)), 200)
+        offset = int(body.get("after") or 0)
+        if offset >= SEARCH_MAX_RESULTS:
+            return 400, {
+                "status": "error",
+                "message": f"Paging past {SEARCH_MAX_RESULTS} results is not supported.",
+            }
+        groups = body.get("filterGroups") or []
+        with self.state.lock:
+            records = [
+                r
+                for r in self.state.objects[object_type].values()
+                if not r["archived"]
+                and (
+                    not groups
+                    or any(
+                        all(_matches(r, f) for f in g.get("filters", []))
+                        for g in groups
+                    )
+                )
+            ]
+            for sort in reversed(body.get("sorts") or []):
+                records.sort(
+                    key=lambda r: _sort_value(r, sort["propertyName"]),
+                    reverse=sort.get("direction") == "DESCENDING",
+                )
+            page = [
+                _render(r, body.get("properties"))
+                for r in records[offset : offset + limit]
+            ]
+        result = {"total": len(records), "results": page}
+        if offset + limit < len(records):
+            result["paging"] = {"next": {"after": str(offset + limit)}}
+        return 200, result
+
+    def _batch(self, object_type: str, action: str, body: dict):
+        inputs = body.get("inputs") or []
+        if len(inputs) > BATCH_LIMIT:
+            return 400, {
+                "status": "error",
+                "message": f"Batch size exceeds {BATCH_LIMIT}.",
+            }
+        results, missing = [], []
+        with self.state.lock:
+            objects = self.state.objects[object_type]
+            if action == "read":
+                for item in inputs:
+                    record = objects.get(str(item["id"]))
+                    if record is None or record["archived"]:
+                        missing.append(str(item["id"]))
+                    else:
+                        results.append(_render(record, body.get("properties")))
+            elif action == "create":
+                for item in inputs:
+                    record = self.state._create(
+                        object_type, item.get("properties") or {}
+                    )
+                    self._link(object_type, record["id"], item.get("associations"))
+                    results.append(_render(record))
+            elif action == "upsert":
+                for item in inputs:
+                    record = self.state._find(
+                        object_type, item.get("idProperty", "hs_object_id"), item["id"]
+                    )
+                    properties = dict(item.get("properties") or {})
+                    if record is None:
+                        properties.setdefault(item.get("idProperty"), item["id"])
+                        record = self.state._create(object_type, properties)
+                        results.append({**_render(record), "new": True})
+                    else:
+                        self.state._update(record, properties)
+                        results.append({**_render(record), "new": False})
+            else:
+                return 404, {"status": "error", "message": f"No batch {action}"}
+
+        now = _iso(_now_ms())
+        response = {
+            "status": "COMPLETE",
+            "results": results,
+            "startedAt": now,
+            "completedAt": now,
+        }
+        if missing:
+            response["numErrors"] = 1
+            response["errors"] = [
+                {
+                    "status": "error",
+                    "category": "OBJECT_NOT_FOUND",
+                    "message": f"Could not get some {object_type} objects.",
+                    "context": {"ids": missing},
+                }
+            ]
+            return 207, response
+        return (201 if action == "create" else 200), response
+
+    def _associate(self, from_type: str, to_type: str, body: dict):
+        with self.state.lock:
+            for item in body.get("inputs") or []:
+                self.state.associations.append(
+                    (from_type, str(item["from"]["id"]), str(item["to"]["id"]), to_type)
+                )
+        return 200, {"status": "COMPLETE", "results": body.get("inputs") or []}
+
+
+class StandinServer(ThreadingHTTPServer):
+    """
+    The stand-in as an embeddable server:
+
+        server = StandinServer(StandinConfig(latency="fixed:20"))
+        server.start()   # serves on a daemon thread
+        ... server.base_url ...
+        server.stop()
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config: StandinConfig = None, host="127.0.0.1", port=0):
+        super().__init__((host, port), StandinHandler)
+        self.state = StandinState(config or StandinConfig())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="hubspot-standin", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HubSpot stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument(
+        "--latency", default="fixed:0", help="See LatencyModel, e.g. lognormal:40:0.5"
+    )
+    parser.add_argument("--error-rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate-5xx", type=float, default=0.0)
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=0,
+        help="Requests per token per window (0 = unlimited).",
+    )
+    parser.add_argument("--rate-window", type=float, default=10.0, help="Seconds.")
+    parser.add_argument("--token-ttl", type=int, default=1800, help="Seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--seed-objects", type=int, default=0, help="Pre-created objects per type."
+    )
+    args = parser.parse_args(argv)
+
+    server = StandinServer(
+        StandinConfig(
+            latency=args.latency,
+            error_rate_429=args.error_rate_429,
+            error_rate_5xx=args.error_rate_5xx,
+            rate_limit=args.rate_limit,
+            rate_window=args.rate_window,
+            token_ttl=args.token_ttl,
+            seed=args.seed,
+            seed_objects=args.seed_objects,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"HubSpot stand-in listening on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
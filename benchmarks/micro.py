@@ -0,0 +1,294 @@
+"""
+Micro-benchmarks of the layers under the API endpoints.
+
+Each benchmark reports the time per call (best and median of --repeat runs)
+and the peak memory allocated during one call, from tracemalloc (measured on
+a separate run, so tracing does not skew the timings):
+
+  schema.<Contact|Deal|Ticket>          Schema().load of one valid item
+  schema.<Contact|Deal|Ticket>.many     Schema(many=True).load of --items items
+  store_created_crm_object.insert       HubSpotService._store_created_crm_object,
+  store_created_crm_object.update       for a new and an already tracked ID
+  get_new_objects_from_db.<rows>.*      first page, deep page and name_prefix
+                                        filter with <rows> rows of one type
+  request_with_tenacity.transport       a stubbed transport on its own
+  request_with_tenacity                 the same call through the retry and
+  request_with_tenacity.rate_limited    rate limiting layers (limiter off/on)
+
+    python -m benchmarks.micro --items 10000 --table-sizes 1000,10000,100000
+    python -m benchmarks.micro --only schema --json
+
+The database benchmarks use the configured database (set DB_NAME, or
+FLASK_ENV=testing for the test database). Rows they add are tagged with a
+"microbench-" external_id and deleted again afterwards; --skip-db leaves the
+database alone.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+
+import requests
+
+from app import create_app
+from app.extensions import db
+from app.models import CreatedCRMObject, CRMObjectCount
+from app.schemas.hubspot_schema import ContactSchema, DealSchema, TicketSchema
+from app.services.hubspot_service import HubSpotService
+from app.utils import http_transport
+from app.utils.rate_limit_handler import request_with_tenacity
+
+ITEMS = {
+    ContactSchema: {
+        "email": "micro@example.com",
+        "firstname": "Micro",
+        "lastname": "Bench",
+        "phone": "+1-555-0100",
+    },
+    DealSchema: {"dealname": "Micro deal", "amount": 1200.5, "dealstage": "closedwon"},
+    TicketSchema: {
+        "subject": "Micro ticket",
+        "description": "Benchmark",
+        "category": "general_inquiry",
+        "pipeline": "0",
+        "hs_ticket_priority": "LOW",
+        "hs_pipeline_stage": "1",
+    },
+}
+
+TAG = "microbench-"
+
+
+def measure(name: str, func, number: int = 1, repeat: int = 5) -> dict:
+    """
+    Time func() `number` times per run over `repeat` runs, then trace the
+    allocations of one more call.
+    """
+    func()  # warm caches and lazy imports
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "name": name,
+        "calls": number * repeat,
+        "best_us": round(min(timings) * 1e6, 1),
+        "median_us": round(statistics.median(timings) * 1e6, 1),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def schema_benchmarks(items: int, repeat: int):
+    for schema_cls, item in ITEMS.items():
+        name = f"schema.{schema_cls.__name__.replace('Schema', '')}"
+        schema, many = schema_cls(), schema_cls(many=True)
+        batch = [dict(item) for _ in range(items)]
+        yield measure(name, lambda: schema.load(item), number=1000, repeat=repeat)
+        yield measure(f"{name}.many", lambda: many.load(batch), repeat=repeat)
+
+
+def _insert_rows(object_type: str, count: int, start: int):
+    now = datetime.datetime.utcnow()
+    db.session.execute(
+        CreatedCRMObject.__table__.insert(),
+        [
+            {
+                "external_id": f"{TAG}{start + i}",
+                "object_type": object_type,
+                "name": f"{TAG}{start + i}@example.com",
+                "created_date": now,
+                "updated_date": now,
+            }
+            for i in range(count)
+        ],
+    )
+    CRMObjectCount.adjust(object_type, count)
+    db.session.commit()
+
+
+def _cleanup():
+    db.session.rollback()
+    for object_type in ("contacts", "deals", "tickets"):
+        deleted = CreatedCRMObject.query.filter(
+            CreatedCRMObject.object_type == object_type,
+            CreatedCRMObject.external_id.like(f"{TAG}%"),
+        ).delete(synchronize_session=False)
+        if deleted:
+            CRMObjectCount.adjust(object_type, -deleted)
+    db.session.commit()
+
+
+def db_benchmarks(table_sizes: list, repeat: int):
+    service = HubSpotService()
+    try:
+        ids = iter(range(10**9))
+        run = uuid.uuid4().hex[:8]
+        yield measure(
+            "store_created_crm_object.insert",
+            lambda: service._store_created_crm_object(
+                f"{TAG}{run}-{next(ids)}", "tickets", "micro ticket"
+            ),
+            number=50,
+            repeat=repeat,
+        )
+        yield measure(
+            "store_created_crm_object.update",
+            lambda: service._store_created_crm_object(
+                f"{TAG}{run}-0", "tickets", "micro ticket"
+            ),
+            number=50,
+            repeat=repeat,
+        )
+
+        rows = 0
+        for size in sorted(table_sizes):
+            while rows < size:
+                batch = min(size - rows, 10000)
+                _insert_rows("deals", batch, rows)
+                rows += batch
+            db.session.execute(db.text("ANALYZE created_crm_objects"))
+            db.session.commit()
+            deep_page = max(1, size // 10 // 2)
+            for name, kwargs in (
+                ("first_page", {}),
+                ("deep_page", {"page": deep_page}),
+                ("estimated_total", {"total_mode": "estimated"}),
+                ("name_prefix", {"filters": {"name_prefix": f"{TAG}1"}}),
+            ):
+                yield measure(
+                    f"get_new_objects_from_db.{size}.{name}",
+                    lambda: service.get_new_objects_from_db("deals", **kwargs),
+                    number=20,
+                    repeat=repeat,
+                )
+    finally:
+        _cleanup()
+
+
+class StubTransport:
+    """
+    A transport that answers every call with the same 200 response.
+    """
+
+    name = "stub"
+
+    def __init__(self, pool_size: int = None):
+        self.pool_size = pool_size
+        self.stats = http_transport.TransportStats()
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response._content = b'{"total": 0, "results": []}'
+
+    def request(self, method: str, url: str, **kwargs):
+        return self.response
+
+    def close(self):
+        pass
+
+
+def request_benchmarks(app, repeat: int):
+    http_transport.TRANSPORTS[StubTransport.name] = StubTransport
+    app.config["HUBSPOT_HTTP_TRANSPORT"] = StubTransport.name
+    url = "http://hubspot.invalid/crm/v3/objects/contacts/search"
+    transport = http_transport.get_transport()
+
+    yield measure(
+        "request_with_tenacity.transport",
+        lambda: transport.request("POST", url, json={}),
+        number=2000,
+        repeat=repeat,
+    )
+    app.config["HUBSPOT_RATE_LIMIT_PER_SECOND"] = 0
+    yield measure(
+        "request_with_tenacity",
+        lambda: request_with_tenacity("POST", url, json={}),
+        number=2000,
+        repeat=repeat,
+    )
+    # A limit far above the call rate: the bucket's bookkeeping, no waiting.
+    app.config["HUBSPOT_RATE_LIMIT_PER_SECOND"] = 1e9
+    app.config["HUBSPOT_RATE_LIMIT_BURST"] = 10**9
+    yield measure(
+        "request_with_tenacity.rate_limited",
+        lambda: request_with_tenacity("POST", url, json={}),
+        number=2000,
+        repeat=repeat,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--table-sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--only", action="append", help="Run benchmarks whose name starts with this."
+    )
+    parser.add_argument("--skip-db", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Print JSON only.")
+    parser.add_argument("--output", help="Also write the results to this file.")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    app.logger.setLevel("WARNING")
+
+    def wanted(prefix: str) -> bool:
+        return not args.only or any(
+            prefix.startswith(o) or o.startswith(prefix) for o in args.only
+        )
+
+    results = []
+    if not args.json:
+        print(f"{'benchmark':<48} {'best_us':>12} {'median_us':>12} {'peak_kib':>10}")
+    with app.app_context():
+        groups = []
+        if wanted("schema"):
+            groups.append(schema_benchmarks(args.items, args.repeat))
+        if not args.skip_db and (
+            wanted("store_created_crm_object") or wanted("get_new_objects_from_db")
+        ):
+            sizes = [int(size) for size in args.table_sizes.split(",") if size]
+            groups.append(db_benchmarks(sizes, args.repeat))
+        if wanted("request_with_tenacity"):
+            groups.append(request_benchmarks(app, args.repeat))
+
+        for group in groups:
+            for result in group:
+                if args.only and not any(
+                    result["name"].startswith(o) for o in args.only
+                ):
+                    continue
+                results.append(result)
+                if not args.json:
+                    print(
+                        f"{result['name']:<48} {result['best_us']:>12.1f} "
+                        f"{result['median_us']:>12.1f} {result['peak_kib']:>10.1f}",
+                        flush=True,
+                    )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Compare HUBSPOT_HTTP_TRANSPORT settings under concurrent load.
+
+Runs the same number of HubSpotAPI.search_objects calls from a thread pool
+once per transport and reports wall time, throughput and the transport's
+connection/stream counters:
+
+    python -m benchmarks.transport --base-url http://127.0.0.1:8099 \
+        --requests 500 --concurrency 32
+
+Point --base-url at the HubSpot stand-in (or anything that answers the CRM
+search endpoint). HTTP/2 is only negotiated over TLS via ALPN; against a
+plain-HTTP server the http2 transport falls back to HTTP/1.1, which shows
+up in the http_versions column.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.integrations.hubspot_api import HubSpotAPI
+from app.utils.http_transport import TRANSPORTS, get_transport, transport_stats
+
+
+def run_transport(app, name: str, total: int, concurrency: int) -> dict:
+    app.config["HUBSPOT_HTTP_TRANSPORT"] = name
+    app.config["HUBSPOT_HTTP_POOL_SIZE"] = concurrency
+
+    def call(_):
+        with app.app_context():
+            started = time.perf_counter()
+            HubSpotAPI("BENCHMARK_TOKEN").search_objects(
+                "contacts", filter_groups=[], properties=["email"], limit=10
+            )
+            return time.perf_counter() - started
+
+    with app.app_context():
+        get_transport()  # build a fresh transport before timing
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = sorted(pool.map(call, range(total)))
+        elapsed = time.perf_counter() - started
+        stats = transport_stats()
+
+    return {
+        "transport": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "connections_opened": stats["connections_opened"],
+        "streams": stats["streams"],
+        "max_in_flight": stats["max_in_flight"],
+        "http_versions": stats["http_versions"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--transport",
+        action="append",
+        choices=list(TRANSPORTS),
+        help="Transport(s) to run (default: all).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON only.")
+    args = parser.parse_args(argv)
+
+    app = create_app()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app.config["HUBSPOT_API_BASE_URL"] = args.base_url.rstrip("/")
+    # Measure the transport, not the token bucket.
+    app.config["HUBSPOT_RATE_LIMIT_PER_SECOND"] = 0
+
+    results = []
+    for name in args.transport or list(TRANSPORTS):
+        try:
+            results.append(run_transport(app, name, args.requests, args.concurrency))
+        except ImportError as e:
+            print(f"Skipping {name}: {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    columns = [
+        "transport",
+        "seconds",
+        "requests_per_second",
+        "p50_ms",
+        "p95_ms",
+        "connections_opened",
+        "streams",
+        "max_in_flight",
+        "http_versions",
+    ]
+    print("  ".join(f"{c:>19}" for c in columns))
+    for row in results:
+        print("  ".join(f"{str(row[c]):>19}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Gunicorn settings and hooks (used via `gunicorn --config gunicorn.conf.py`).
+
+Workers are threaded (gthread): a change feed long-poll, an SSE stream or a
+request waiting on HubSpot holds one thread, not a whole worker. gthread
+workers report to the master from their own loop, so `timeout` only catches
+hung workers and does not cut off streams that run longer than it. Keep
+GUNICORN_THREADS at or below the SQLAlchemy pool (5 + 10 overflow).
+
+With PROMETHEUS_MULTIPROC_DIR set, every worker writes its metrics to files
+in that directory and /metrics adds them up (see app/utils/metrics.py). The
+directory is emptied when the master starts, so samples of a previous run
+are not carried over, and each worker that exits is marked dead, as
+prometheus_client's multiprocess mode requires. The shared adaptive
+concurrency state (HUBSPOT_ADAPTIVE_CONCURRENCY=shared) also starts afresh.
+"""
+
+import glob
+import os
+
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.environ.get("GUNICORN_WORKERS", 4))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+
+
+def on_starting(server):
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        os.makedirs(path, exist_ok=True)
+        for stale in glob.glob(os.path.join(path, "*.db")):
+            os.remove(stale)
+
+    from app.config import BaseConfig
+
+    if os.path.exists(BaseConfig.HUBSPOT_ADAPTIVE_STATE_FILE):
+        os.remove(BaseConfig.HUBSPOT_ADAPTIVE_STATE_FILE)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
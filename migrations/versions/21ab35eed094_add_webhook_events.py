@@ -0,0 +1,47 @@
+"""Add webhook_events queue
+
+Revision ID: 21ab35eed094
+Revises: 8243dd39769b
+Create Date: 2026-10-19 16:25:11.907415
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "21ab35eed094"
+down_revision = "8243dd39769b"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "webhook_events",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("event_id", sa.BigInteger(), nullable=True),
+        sa.Column("subscription_type", sa.String(length=64), nullable=False),
+        sa.Column("object_type", sa.String(length=32), nullable=True),
+        sa.Column("object_id", sa.String(length=128), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(), nullable=True),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("received_at", sa.DateTime(), nullable=False),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_id"),
+    )
+    op.create_index(
+        "ix_webhook_events_pending",
+        "webhook_events",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_webhook_events_pending", table_name="webhook_events")
+    op.drop_table("webhook_events")
@@ -0,0 +1,38 @@
+"""Add import_checkpoints
+
+Revision ID: 48a9ebaa2b9f
+Revises: 5e78a0c8ca59
+Create Date: 2026-10-19 17:48:05.331962
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "48a9ebaa2b9f"
+down_revision = "5e78a0c8ca59"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "import_checkpoints",
+        sa.Column("job_id", sa.String(length=64), nullable=False),
+        sa.Column("source", sa.String(length=1024), nullable=False),
+        sa.Column("object_type", sa.String(length=32), nullable=False),
+        sa.Column("rows_done", sa.BigInteger(), nullable=False),
+        sa.Column("succeeded", sa.BigInteger(), nullable=False),
+        sa.Column("failed", sa.BigInteger(), nullable=False),
+        sa.Column("invalid", sa.BigInteger(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("job_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("import_checkpoints")
@@ -0,0 +1,72 @@
+"""Add search vector and lookup indexes to crm_mirror_objects
+
+Revision ID: 5e78a0c8ca59
+Revises: 21ab35eed094
+Create Date: 2026-10-19 17:02:38.514027
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5e78a0c8ca59"
+down_revision = "21ab35eed094"
+branch_labels = None
+depends_on = None
+
+
+# Kept in sync with app.models.SEARCH_VECTOR_EXPRESSION.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(name, '') || ' ' || "
+    "translate(coalesce(name, ''), '@._-', '    ') || ' ' || "
+    "coalesce(properties->>'firstname', '') || ' ' || "
+    "coalesce(properties->>'lastname', '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(properties->>'content', '')), 'B')"
+)
+
+
+def _trigram_available():
+    return bool(
+        op.get_bind()
+        .execute(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        )
+        .scalar()
+    )
+
+
+def upgrade():
+    op.execute(
+        "ALTER TABLE crm_mirror_objects ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    )
+    op.create_index(
+        "ix_crm_mirror_objects_search_vector",
+        "crm_mirror_objects",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_crm_mirror_objects_name_prefix",
+        "crm_mirror_objects",
+        [sa.text("lower(name) text_pattern_ops")],
+    )
+    # Fuzzy search uses trigrams when the server ships pg_trgm; otherwise
+    # the application falls back to prefix full-text matching.
+    if _trigram_available():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_crm_mirror_objects_name_trgm ON crm_mirror_objects "
+            "USING gin (lower(name) gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_crm_mirror_objects_name_trgm")
+    op.drop_index("ix_crm_mirror_objects_name_prefix", table_name="crm_mirror_objects")
+    op.drop_index(
+        "ix_crm_mirror_objects_search_vector", table_name="crm_mirror_objects"
+    )
+    op.drop_column("crm_mirror_objects", "search_vector")
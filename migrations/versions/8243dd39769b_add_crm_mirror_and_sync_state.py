@@ -0,0 +1,58 @@
+"""Add crm_mirror_objects and sync_states
+
+Revision ID: 8243dd39769b
+Revises: ade0d1612cbd
+Create Date: 2026-10-19 15:08:36.402118
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "8243dd39769b"
+down_revision = "ade0d1612cbd"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "crm_mirror_objects",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("object_type", sa.String(length=32), nullable=False),
+        sa.Column("hubspot_id", sa.String(length=128), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column(
+            "properties", postgresql.JSONB(astext_type=sa.Text()), nullable=False
+        ),
+        sa.Column("hs_created_at", sa.DateTime(), nullable=True),
+        sa.Column("hs_updated_at", sa.DateTime(), nullable=True),
+        sa.Column("archived", sa.Boolean(), nullable=False),
+        sa.Column("synced_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "object_type", "hubspot_id", name="uq_crm_mirror_objects_type_hubspot_id"
+        ),
+    )
+    op.create_index(
+        "ix_crm_mirror_objects_type_updated",
+        "crm_mirror_objects",
+        ["object_type", "hs_updated_at"],
+        unique=False,
+    )
+    op.create_table(
+        "sync_states",
+        sa.Column("object_type", sa.String(length=32), nullable=False),
+        sa.Column("high_water_mark", sa.DateTime(), nullable=True),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("object_type"),
+    )
+
+
+def downgrade():
+    op.drop_table("sync_states")
+    op.drop_index("ix_crm_mirror_objects_type_updated", table_name="crm_mirror_objects")
+    op.drop_table("crm_mirror_objects")
@@ -0,0 +1,40 @@
+"""Add crm_object_counts summary table
+
+Revision ID: a9e43098a035
+Revises: a9df5e965eda
+Create Date: 2026-10-19 09:12:41.118204
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a9e43098a035"
+down_revision = "a9df5e965eda"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "crm_object_counts",
+        sa.Column("object_type", sa.String(length=32), nullable=False),
+        sa.Column("total", sa.BigInteger(), nullable=False),
+        sa.Column("updated_date", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("object_type"),
+    )
+    # Seed the counters from whatever is already tracked.
+    op.execute(
+        """
+        INSERT INTO crm_object_counts (object_type, total, updated_date)
+        SELECT object_type, count(*), now() at time zone 'utc'
+        FROM created_crm_objects
+        GROUP BY object_type
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("crm_object_counts")
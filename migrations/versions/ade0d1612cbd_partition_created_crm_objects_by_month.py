@@ -0,0 +1,140 @@
+"""Partition created_crm_objects by month on created_date
+
+Revision ID: ade0d1612cbd
+Revises: b499aaa093c6
+Create Date: 2026-10-19 13:41:52.270931
+
+"""
+
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "ade0d1612cbd"
+down_revision = "b499aaa093c6"
+branch_labels = None
+depends_on = None
+
+
+MONTHS_AHEAD = 3
+
+COLUMNS = """
+    id INTEGER NOT NULL DEFAULT nextval('created_crm_objects_id_seq'),
+    external_id VARCHAR(128) NOT NULL,
+    object_type VARCHAR(32) NOT NULL,
+    name VARCHAR(255),
+    created_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    updated_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    change_seq BIGINT NOT NULL DEFAULT nextval('created_crm_objects_change_seq')
+"""
+
+INDEXES = [
+    ("ix_created_crm_objects_change_seq", "change_seq"),
+    ("ix_created_crm_objects_type_external_id", "object_type, external_id"),
+    ("ix_created_crm_objects_type_created", "object_type, created_date"),
+    ("ix_created_crm_objects_type_updated", "object_type, updated_date"),
+    ("ix_created_crm_objects_name_prefix", "lower(name) text_pattern_ops"),
+    ("ix_created_crm_objects_name_suffix", "reverse(lower(name)) text_pattern_ops"),
+]
+
+
+def _month_start(value):
+    return datetime.date(value.year, value.month, 1)
+
+
+def _next_month(month):
+    return datetime.date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _set_aside(table, suffix):
+    """
+    Rename table and free up the index/constraint names it holds, which are
+    schema-global in Postgres.
+    """
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_{suffix}")
+    op.execute(
+        f"ALTER TABLE {table}_{suffix} RENAME CONSTRAINT {table}_pkey "
+        f"TO {table}_{suffix}_pkey"
+    )
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _create_indexes():
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON created_crm_objects ({columns})")
+
+
+def upgrade():
+    _set_aside("created_crm_objects", "legacy")
+
+    op.execute(
+        f"""
+        CREATE TABLE created_crm_objects (
+            {COLUMNS},
+            CONSTRAINT created_crm_objects_pkey PRIMARY KEY (id, created_date)
+        ) PARTITION BY RANGE (created_date)
+        """
+    )
+    op.execute(
+        "ALTER SEQUENCE created_crm_objects_id_seq OWNED BY created_crm_objects.id"
+    )
+
+    # One partition per month from the oldest existing row up to a few months
+    # ahead; anything outside that lands in the default partition.
+    oldest = (
+        op.get_bind()
+        .execute(sa.text("SELECT min(created_date) FROM created_crm_objects_legacy"))
+        .scalar()
+    )
+    today = datetime.datetime.utcnow()
+    month = _month_start(min(oldest or today, today))
+    last = _month_start(today)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE created_crm_objects_p{month:%Y%m} "
+            f"PARTITION OF created_crm_objects "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute(
+        "CREATE TABLE created_crm_objects_default "
+        "PARTITION OF created_crm_objects DEFAULT"
+    )
+
+    op.execute(
+        "INSERT INTO created_crm_objects "
+        "SELECT id, external_id, object_type, name, created_date, updated_date, "
+        "change_seq FROM created_crm_objects_legacy"
+    )
+    op.execute("DROP TABLE created_crm_objects_legacy")
+    _create_indexes()
+
+
+def downgrade():
+    _set_aside("created_crm_objects", "partitioned")
+
+    op.execute(
+        f"""
+        CREATE TABLE created_crm_objects (
+            {COLUMNS},
+            CONSTRAINT created_crm_objects_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        "ALTER SEQUENCE created_crm_objects_id_seq OWNED BY created_crm_objects.id"
+    )
+    op.execute(
+        "INSERT INTO created_crm_objects "
+        "SELECT id, external_id, object_type, name, created_date, updated_date, "
+        "change_seq FROM created_crm_objects_partitioned"
+    )
+    op.execute("DROP TABLE created_crm_objects_partitioned CASCADE")
+    _create_indexes()
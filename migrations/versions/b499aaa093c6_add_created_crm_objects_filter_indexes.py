@@ -0,0 +1,54 @@
+"""Add filter indexes to created_crm_objects
+
+Revision ID: b499aaa093c6
+Revises: e427696a89f9
+Create Date: 2026-10-19 11:20:05.813467
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b499aaa093c6"
+down_revision = "e427696a89f9"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_created_crm_objects_type_external_id", ["object_type", "external_id"]),
+    ("ix_created_crm_objects_type_created", ["object_type", "created_date"]),
+    ("ix_created_crm_objects_type_updated", ["object_type", "updated_date"]),
+    ("ix_created_crm_objects_name_prefix", [sa.text("lower(name) text_pattern_ops")]),
+    (
+        "ix_created_crm_objects_name_suffix",
+        [sa.text("reverse(lower(name)) text_pattern_ops")],
+    ),
+]
+
+
+def upgrade():
+    # CONCURRENTLY keeps the table writable while the indexes build.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "created_crm_objects",
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="created_crm_objects",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,28 @@
+"""Add stale_date to created_crm_objects
+
+Revision ID: c014b48290b4
+Revises: 48a9ebaa2b9f
+Create Date: 2026-10-19 18:37:20.604118
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c014b48290b4"
+down_revision = "48a9ebaa2b9f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Added on the partitioned parent, so every partition gets the column.
+    op.add_column(
+        "created_crm_objects", sa.Column("stale_date", sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column("created_crm_objects", "stale_date")
@@ -0,0 +1,43 @@
+"""Add change_seq cursor column to created_crm_objects
+
+Revision ID: e427696a89f9
+Revises: a9e43098a035
+Create Date: 2026-10-19 10:03:27.540192
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e427696a89f9"
+down_revision = "a9e43098a035"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE SEQUENCE created_crm_objects_change_seq")
+    # Existing rows are numbered in id order by the volatile default.
+    op.add_column(
+        "created_crm_objects",
+        sa.Column(
+            "change_seq",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('created_crm_objects_change_seq')"),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_created_crm_objects_change_seq",
+        "created_crm_objects",
+        ["change_seq"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_created_crm_objects_change_seq", table_name="created_crm_objects")
+    op.drop_column("created_crm_objects", "change_seq")
+    op.execute("DROP SEQUENCE created_crm_objects_change_seq")
@@ -0,0 +1,58 @@
+"""Assign change_seq at commit time
+
+Revision ID: f3b7c1d92a40
+Revises: c014b48290b4
+Create Date: 2026-10-19 21:12:44.918203
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "f3b7c1d92a40"
+down_revision = "c014b48290b4"
+branch_labels = None
+depends_on = None
+
+# A change_seq drawn when the row is written can commit after a larger one,
+# so a change feed reader could move its cursor past it and never see it.
+# This deferred trigger redraws change_seq while the transaction commits,
+# under a transaction-level advisory lock held until the commit is visible:
+# change_seq order is then commit order. The lock only spans the commit.
+CHANGE_SEQ_LOCK = 7263_0001
+
+FUNCTION = f"""
+CREATE FUNCTION created_crm_objects_change_seq_at_commit() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock({CHANGE_SEQ_LOCK});
+    UPDATE created_crm_objects
+       SET change_seq = nextval('created_crm_objects_change_seq')
+     WHERE id = NEW.id AND created_date = NEW.created_date;
+    RETURN NULL;
+END
+$$
+"""
+
+# Created on the partitioned parent, so current and future partitions get it.
+# pg_trigger_depth() = 0 keeps the trigger's own UPDATE from re-queueing it.
+TRIGGER = """
+CREATE CONSTRAINT TRIGGER created_crm_objects_change_seq_at_commit
+AFTER INSERT OR UPDATE ON created_crm_objects
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW WHEN (pg_trigger_depth() = 0)
+EXECUTE FUNCTION created_crm_objects_change_seq_at_commit()
+"""
+
+
+def upgrade():
+    op.execute(FUNCTION)
+    op.execute(TRIGGER)
+
+
+def downgrade():
+    op.execute(
+        "DROP TRIGGER created_crm_objects_change_seq_at_commit ON created_crm_objects"
+    )
+    op.execute("DROP FUNCTION created_crm_objects_change_seq_at_commit()")
@@ -15,5 +15,8 @@ if [ "$RUN_TESTS" = "1" ]; then
   exit $?
 else
   echo "Starting Gunicorn..."
-  gunicorn "app.main:create_app()" --bind 0.0.0.0:5001 --workers 4
+  # Worker class, workers, threads and timeout come from gunicorn.conf.py
+  # Metrics of all workers are aggregated through this directory (/metrics)
+  export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}"
+  gunicorn "app.main:create_app()" --config gunicorn.conf.py --bind 0.0.0.0:5001
 fi
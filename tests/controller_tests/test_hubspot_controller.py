@@ -1,6 +1,7 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from app.models import CreatedCRMObject
+from app.utils.errors import BulkOperationError
 
 
 @pytest.mark.usefixtures("test_app", "test_client", "db_session")
@@ -80,3 +81,258 @@ class TestHubspotController:
         results = data["data"]["results"]
         assert len(results) == 1
         assert results[0]["external_id"] == "ID_001"
+
+    def test_get_new_crm_objects_total_modes(self, test_client, db_session):
+        """
+        total=none skips counting; total=estimated returns a planner estimate.
+        """
+        resp = test_client.get("/api/new-crm-objects?objectType=contacts&total=none")
+        data = resp.get_json()
+        assert resp.status_code == 200
+        assert data["data"]["total"] is None
+
+        resp = test_client.get("/api/new-crm-objects?total=estimated")
+        data = resp.get_json()
+        assert resp.status_code == 200
+        assert isinstance(data["data"]["total"], int)
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "external_id=1,2",
+            "external_id=1&external_id=2",
+            "objectType=contacts&external_id=ID_001,ID_002&name_prefix=test",
+        ],
+    )
+    def test_get_new_crm_objects_estimated_with_list_filters(
+        self, test_client, db_session, query
+    ):
+        """
+        total=estimated works when the query has an IN-list (external_id).
+        """
+        resp = test_client.get(f"/api/new-crm-objects?total=estimated&{query}")
+        assert resp.status_code == 200
+        assert isinstance(resp.get_json()["data"]["total"], int)
+
+    def test_get_new_crm_objects_invalid_params(self, test_client):
+        """
+        Unknown total modes and non-numeric pages are rejected with a 400.
+        """
+        resp = test_client.get("/api/new-crm-objects?total=sometimes")
+        assert resp.status_code == 400
+
+        resp = test_client.get("/api/new-crm-objects?page=abc")
+        assert resp.status_code == 400
+
+    def test_get_new_crm_object_stats(self, test_client):
+        """
+        GET /api/new-crm-objects/stats returns the maintained per-type counts.
+        """
+        with patch(
+            "app.controllers.hubspot_controller.HubSpotService"
+        ) as mock_service_cls:
+            mock_service = mock_service_cls.return_value
+            mock_service.get_object_counts.return_value = {"contacts": 3, "deals": 2}
+
+            resp = test_client.get("/api/new-crm-objects/stats")
+            data = resp.get_json()
+
+            assert resp.status_code == 200
+            assert data["data"]["counts"] == {"contacts": 3, "deals": 2}
+            assert data["data"]["total"] == 5
+
+    def test_export_new_crm_objects_ndjson(self, test_client, db_session):
+        """
+        GET /api/new-crm-objects/export streams one JSON object per line,
+        honouring objectType and the created_since/created_until window.
+        """
+        import datetime
+        import json
+
+        for i, day in enumerate([1, 2, 3]):
+            db_session.add(
+                CreatedCRMObject(
+                    external_id=f"EXPORT_{i}",
+                    object_type="tickets",
+                    name=f"Export {i}",
+                    created_date=datetime.datetime(2001, 1, day),
+                )
+            )
+        db_session.commit()
+
+        resp = test_client.get(
+            "/api/new-crm-objects/export?objectType=tickets"
+            "&created_since=2001-01-02T00:00:00&created_until=2001-01-04T00:00:00Z"
+        )
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/x-ndjson"
+
+        lines = resp.get_data(as_text=True).splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [row["external_id"] for row in rows] == ["EXPORT_1", "EXPORT_2"]
+
+    def test_export_new_crm_objects_csv(self, test_client, db_session):
+        """
+        format=csv returns a header row followed by the matching rows.
+        """
+        resp = test_client.get(
+            "/api/new-crm-objects/export?objectType=tickets&format=csv"
+            "&created_since=2001-01-03T00:00:00&created_until=2001-01-04T00:00:00"
+        )
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/csv"
+
+        lines = resp.get_data(as_text=True).splitlines()
+        assert lines[0] == "id,external_id,object_type,name,created_date,updated_date"
+        assert len(lines) == 2
+        assert ",EXPORT_2,tickets," in lines[1]
+
+    def test_export_new_crm_objects_invalid_format(self, test_client):
+        resp = test_client.get("/api/new-crm-objects/export?format=xml")
+        assert resp.status_code == 400
+
+    def test_get_new_crm_objects_filters(self, test_client, db_session):
+        """
+        Filters are read from the query string; external_id may be repeated
+        and/or comma-separated.
+        """
+        for external_id, name in [
+            ("QS_1", "Renewal 2025"),
+            ("QS_2", "Renewal 2026"),
+            ("QS_3", "Upsell 2026"),
+        ]:
+            db_session.add(
+                CreatedCRMObject(
+                    external_id=external_id, object_type="deals", name=name
+                )
+            )
+        db_session.commit()
+
+        resp = test_client.get(
+            "/api/new-crm-objects?objectType=deals&name_prefix=renewal"
+            "&external_id=QS_1,QS_3&external_id=QS_2"
+        )
+        data = resp.get_json()["data"]
+        assert resp.status_code == 200
+        assert sorted(r["external_id"] for r in data["results"]) == ["QS_1", "QS_2"]
+        assert data["total"] == 2
+
+        resp = test_client.get("/api/new-crm-objects?created_since=not-a-date")
+        assert resp.status_code == 400
+
+    def test_bulk_tickets_partial_failure(self, test_client):
+        """
+        When only some tickets fail, /api/tickets/bulk answers 207 with the
+        results in input order and the per-item errors.
+        """
+        with patch(
+            "app.controllers.hubspot_controller.HubSpotService"
+        ) as mock_service_cls:
+            mock_service_cls.return_value.create_tickets.side_effect = (
+                BulkOperationError(
+                    results=[{"id": "T1"}, None],
+                    errors=[{"index": 1, "error": "HubSpot said no"}],
+                )
+            )
+            ticket = {
+                "subject": "Bulk",
+                "description": "Partial",
+                "category": "billing",
+                "pipeline": "support",
+                "hs_ticket_priority": "LOW",
+                "hs_pipeline_stage": "1",
+            }
+            resp = test_client.post(
+                "/api/tickets/bulk", json={"tickets": [ticket, ticket]}
+            )
+
+        data = resp.get_json()
+        assert resp.status_code == 207
+        assert data["data"]["tickets"] == [{"id": "T1"}, None]
+        assert data["data"]["errors"] == [{"index": 1, "error": "HubSpot said no"}]
+
+    def test_bulk_tickets_all_failed(self, test_client):
+        """
+        When every ticket fails, /api/tickets/bulk answers 502 with an error
+        body carrying the per-item errors.
+        """
+        with patch(
+            "app.controllers.hubspot_controller.HubSpotService"
+        ) as mock_service_cls:
+            mock_service_cls.return_value.create_tickets.side_effect = (
+                BulkOperationError(
+                    results=[None],
+                    errors=[{"index": 0, "error": "HubSpot said no"}],
+                )
+            )
+            ticket = {
+                "subject": "Bulk",
+                "description": "None",
+                "category": "billing",
+                "pipeline": "support",
+                "hs_ticket_priority": "LOW",
+                "hs_pipeline_stage": "1",
+            }
+            resp = test_client.post("/api/tickets/bulk", json={"tickets": [ticket]})
+
+        data = resp.get_json()
+        assert resp.status_code == 502
+        assert data["success"] is False
+        assert data["error"] == [{"index": 0, "error": "HubSpot said no"}]
+
+    def test_async_bulk_deals(self, test_client):
+        """
+        /api/async/deals/bulk is served by an async view over
+        AsyncHubSpotService.
+        """
+        with patch(
+            "app.controllers.async_hubspot_controller.AsyncHubSpotService"
+        ) as mock_service_cls:
+            mock_service_cls.return_value.upsert_deals = AsyncMock(
+                return_value=[{"id": "D1"}, {"id": "D2"}]
+            )
+            deals = [
+                {"dealname": "Async 1", "amount": 1, "dealstage": "qualifiedtobuy"},
+                {"dealname": "Async 2", "amount": 2, "dealstage": "qualifiedtobuy"},
+            ]
+            resp = test_client.post("/api/async/deals/bulk", json={"deals": deals})
+
+        assert resp.status_code == 200
+        assert resp.get_json()["data"]["deals"] == [{"id": "D1"}, {"id": "D2"}]
+
+    def test_compound_requires_a_step(self, test_client):
+        resp = test_client.post("/api/compound", json={})
+        assert resp.status_code == 400
+
+    def test_compound_partial_failure(self, test_client):
+        with patch(
+            "app.controllers.compound_controller.AsyncHubSpotService"
+        ) as mock_service_cls:
+            mock_service_cls.return_value.compound = AsyncMock(
+                side_effect=BulkOperationError(
+                    results={"contact": {"id": "C1"}, "ticket": None},
+                    errors=[{"step": "ticket", "error": "HubSpot said no"}],
+                )
+            )
+            payload = {
+                "contact": {
+                    "email": "graph@example.com",
+                    "firstname": "G",
+                    "lastname": "Raph",
+                    "phone": "1",
+                },
+                "ticket": {
+                    "subject": "Graph",
+                    "description": "d",
+                    "category": "billing",
+                    "pipeline": "support",
+                    "hs_ticket_priority": "LOW",
+                    "hs_pipeline_stage": "1",
+                },
+            }
+            resp = test_client.post("/api/compound", json=payload)
+
+        data = resp.get_json()["data"]
+        assert resp.status_code == 207
+        assert data["contact"] == {"id": "C1"}
+        assert data["errors"] == [{"step": "ticket", "error": "HubSpot said no"}]
@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import patch
+
+
+@pytest.mark.usefixtures("test_app", "test_client", "db_session")
+class TestSearchController:
+    def test_search_returns_mode_and_results(self, test_client):
+        with patch(
+            "app.controllers.search_controller.CRMSearchService"
+        ) as mock_service_cls:
+            mock_service_cls.return_value.search.return_value = (
+                "prefix",
+                [{"object_type": "deals", "hubspot_id": "D1", "name": "Acme"}],
+            )
+
+            resp = test_client.get("/api/search?q=acm&mode=prefix&objectType=Deals")
+            data = resp.get_json()
+
+            assert resp.status_code == 200
+            assert data["data"]["mode"] == "prefix"
+            assert data["data"]["results"][0]["hubspot_id"] == "D1"
+            mock_service_cls.return_value.search.assert_called_once_with(
+                "acm",
+                object_type="deals",
+                mode="prefix",
+                limit=20,
+                include_archived=False,
+            )
+
+    @pytest.mark.parametrize("query", ["", "?q=", "?q=x&mode=regex", "?q=x&limit=1000"])
+    def test_search_rejects_invalid_params(self, test_client, query):
+        resp = test_client.get(f"/api/search{query}")
+        assert resp.status_code == 400
@@ -0,0 +1,97 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from app.models import WebhookEvent
+
+SECRET = "test-client-secret"
+URL = "http://localhost/api/webhooks/hubspot"
+
+
+def _signed_headers(body: str, timestamp: int = None):
+    timestamp = str(timestamp or int(time.time() * 1000))
+    source = f"POST{URL}{body}{timestamp}"
+    signature = base64.b64encode(
+        hmac.new(SECRET.encode(), source.encode(), hashlib.sha256).digest()
+    ).decode()
+    return {
+        "Content-Type": "application/json",
+        "X-HubSpot-Signature-v3": signature,
+        "X-HubSpot-Request-Timestamp": timestamp,
+    }
+
+
+@pytest.mark.usefixtures("test_app", "test_client", "db_session")
+class TestWebhookController:
+    @pytest.fixture(autouse=True)
+    def _client_secret(self, test_app, monkeypatch):
+        monkeypatch.setitem(test_app.config, "HUBSPOT_CLIENT_SECRET", SECRET)
+
+    def test_valid_signature_queues_events_once(self, test_client, db_session):
+        """
+        A signed delivery is queued in one go; redelivering the same
+        eventIds adds nothing.
+        """
+        events = [
+            {
+                "eventId": 9100001,
+                "subscriptionType": "contact.propertyChange",
+                "objectId": 501,
+                "occurredAt": 1718000000000,
+                "propertyName": "email",
+            },
+            {
+                "eventId": 9100002,
+                "subscriptionType": "deal.deletion",
+                "objectId": 502,
+                "occurredAt": 1718000001000,
+            },
+        ]
+        body = json.dumps(events)
+
+        resp = test_client.post(URL, data=body, headers=_signed_headers(body))
+        assert resp.status_code == 202
+        assert resp.get_json()["data"]["queued"] == 2
+
+        resp = test_client.post(URL, data=body, headers=_signed_headers(body))
+        assert resp.status_code == 202
+        assert resp.get_json()["data"]["queued"] == 0
+
+        queued = (
+            db_session.query(WebhookEvent)
+            .filter(WebhookEvent.event_id.in_([9100001, 9100002]))
+            .order_by(WebhookEvent.event_id)
+            .all()
+        )
+        assert [(e.object_type, e.object_id) for e in queued] == [
+            ("contacts", "501"),
+            ("deals", "502"),
+        ]
+        # Leave the queue empty for the processor tests.
+        for event in queued:
+            db_session.delete(event)
+        db_session.commit()
+
+    def test_invalid_signature_is_rejected(self, test_client):
+        body = json.dumps([{"eventId": 9100003, "subscriptionType": "deal.creation"}])
+        headers = _signed_headers(body)
+        headers["X-HubSpot-Signature-v3"] = base64.b64encode(b"forged").decode()
+
+        resp = test_client.post(URL, data=body, headers=headers)
+        assert resp.status_code == 401
+
+    def test_stale_timestamp_is_rejected(self, test_client):
+        body = json.dumps([{"eventId": 9100004, "subscriptionType": "deal.creation"}])
+        stale = int((time.time() - 600) * 1000)
+
+        resp = test_client.post(URL, data=body, headers=_signed_headers(body, stale))
+        assert resp.status_code == 401
+
+    @pytest.mark.parametrize("body", ["[1]", "[null]", '[{"eventId": 1}, "x"]', "{}"])
+    def test_non_object_events_are_rejected(self, test_client, body):
+        resp = test_client.post(URL, data=body, headers=_signed_headers(body))
+        assert resp.status_code == 400
@@ -108,3 +108,72 @@ class TestHubSpotAPI:
             json={"properties": {"email": "ok@example.com"}},
             timeout=20,
         )
+
+    @patch("app.integrations.hubspot_api.request_with_tenacity")
+    def test_search_objects_passes_sorts_and_after(self, mock_request):
+        """
+        search_objects posts filters, sorts and the paging cursor and returns
+        the raw response so callers can follow paging.next.after.
+        """
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {
+            "results": [{"id": "1"}],
+            "paging": {"next": {"after": "100"}},
+        }
+        mock_request.return_value = mock_resp
+
+        api = HubSpotAPI("FAKE_TOKEN")
+        sorts = [{"propertyName": "hs_lastmodifieddate", "direction": "ASCENDING"}]
+        data = api.search_objects(
+            "deals", [], ["dealname"], sorts=sorts, after="100", limit=50
+        )
+
+        assert data["paging"]["next"]["after"] == "100"
+        assert mock_request.call_args.args == (
+            "POST",
+            f"{api.base_url}/crm/v3/objects/deals/search",
+        )
+        assert mock_request.call_args.kwargs["json"] == {
+            "filterGroups": [],
+            "properties": ["dealname"],
+            "limit": 50,
+            "sorts": sorts,
+            "after": "100",
+        }
+
+    @patch("app.integrations.hubspot_api.request_with_tenacity")
+    def test_batch_read_posts_ids_and_properties(self, mock_request):
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"results": [{"id": "7"}], "errors": []}
+        mock_request.return_value = mock_resp
+
+        api = HubSpotAPI("FAKE_TOKEN")
+        data = api.batch_read("tickets", [7, "8"], ["subject"])
+
+        assert data["results"] == [{"id": "7"}]
+        assert mock_request.call_args.args == (
+            "POST",
+            f"{api.base_url}/crm/v3/objects/tickets/batch/read",
+        )
+        assert mock_request.call_args.kwargs["json"] == {
+            "inputs": [{"id": "7"}, {"id": "8"}],
+            "properties": ["subject"],
+        }
+
+    @patch("app.integrations.hubspot_api.request_with_tenacity")
+    def test_batch_upsert_and_create_post_inputs(self, mock_request):
+        mock_resp = MagicMock()
+        mock_resp.json.return_value = {"results": []}
+        mock_request.return_value = mock_resp
+        api = HubSpotAPI("FAKE_TOKEN")
+        inputs = [{"idProperty": "email", "id": "a@b.io", "properties": {}}]
+
+        api.batch_upsert("contacts", inputs)
+        assert mock_request.call_args.args == (
+            "POST",
+            f"{api.base_url}/crm/v3/objects/contacts/batch/upsert",
+        )
+        assert mock_request.call_args.kwargs["json"] == {"inputs": inputs}
+
+        api.batch_create("deals", [{"properties": {"dealname": "X"}}])
+        assert mock_request.call_args.args[1].endswith("/deals/batch/create")
@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.integrations.hubspot_async_api import AsyncHubSpotAPI
+
+
+def _api(handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncHubSpotAPI(token="DUMMY_TOKEN", client=client)
+
+
+@pytest.mark.usefixtures("test_app")
+class TestAsyncHubSpotAPI:
+    """
+    AsyncHubSpotAPI against an in-process httpx transport.
+    """
+
+    def test_find_contact_by_email_found(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(
+                200,
+                json={
+                    "total": 1,
+                    "results": [{"id": "C1", "properties": {"email": "a@example.com"}}],
+                },
+            )
+
+        async def run():
+            async with _api(handler) as api:
+                return await api.find_contact_by_email("a@example.com")
+
+        contact = asyncio.run(run())
+
+        assert contact["id"] == "C1"
+        request = requests_seen[0]
+        assert request.method == "POST"
+        assert request.url.path == "/crm/v3/objects/contacts/search"
+        assert request.headers["Authorization"] == "Bearer DUMMY_TOKEN"
+        body = json.loads(request.content)
+        assert body["filterGroups"][0]["filters"][0]["value"] == "a@example.com"
+
+    def test_client_error_raises(self):
+        async def run():
+            async with _api(lambda request: httpx.Response(400)) as api:
+                await api.create_deal({"dealname": "Bad"})
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+
+    def test_429_is_retried(self):
+        statuses = iter([429, 201])
+
+        def handler(request):
+            return httpx.Response(next(statuses), json={"id": "T1"})
+
+        async def run():
+            async with _api(handler) as api:
+                return await api.create_ticket({"subject": "Retry"})
+
+        assert asyncio.run(run()) == {"id": "T1"}
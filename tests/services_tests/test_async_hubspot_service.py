@@ -0,0 +1,248 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.integrations.hubspot_async_api import AsyncHubSpotAPI
+from app.models import CreatedCRMObject, CRMObjectCount
+from app.services.async_hubspot_service import AsyncHubSpotService
+from app.utils.errors import BulkOperationError
+
+LATENCY = 0.1
+CALLS = []
+
+
+async def _fake_hubspot(request):
+    """
+    Each call takes LATENCY seconds. Searches find nothing except the deal
+    "ExistingDeal"; creates and updates echo the properties back. A deal
+    named "fail" or a contact with email "fail" is rejected, and so is
+    any association with the ID "BADLINK".
+    """
+    path = request.url.path
+    CALLS.append((path, json.loads(request.content or b"{}")))
+    await asyncio.sleep(LATENCY)
+    if path.endswith("/search"):
+        if b"ExistingDeal" in request.content:
+            existing = {"id": "ASYNC_ExistingDeal", "properties": {}}
+            return httpx.Response(200, json={"total": 1, "results": [existing]})
+        return httpx.Response(200, json={"total": 0, "results": []})
+    if "/associations/" in path:
+        if b"BADLINK" in request.content:
+            return httpx.Response(400, json={"message": "bad association"})
+        return httpx.Response(200, json={})
+    properties = json.loads(request.content)["properties"]
+    if properties.get("dealname") == "fail" or properties.get("email") == "fail":
+        return httpx.Response(400, json={"message": "bad object"})
+    name = (
+        properties.get("dealname")
+        or properties.get("subject")
+        or properties.get("email")
+    )
+    return httpx.Response(201, json={"id": f"ASYNC_{name}", "properties": properties})
+
+
+def _untrack(db_session, object_type, pattern):
+    """
+    Drop rows a test tracked, keeping crm_object_counts in step.
+    """
+    rows = CreatedCRMObject.query.filter(
+        CreatedCRMObject.object_type == object_type,
+        CreatedCRMObject.external_id.like(pattern),
+    ).all()
+    for row in rows:
+        db_session.delete(row)
+    CRMObjectCount.adjust(object_type, -len(rows))
+    db_session.commit()
+    return len(rows)
+
+
+@pytest.mark.usefixtures("test_app", "db_session")
+class TestAsyncHubSpotService:
+    @pytest.fixture(autouse=True)
+    def _fake_api(self, test_app, monkeypatch):
+        monkeypatch.setitem(test_app.config, "HUBSPOT_RATE_LIMIT_PER_SECOND", 0)
+        with patch.object(
+            AsyncHubSpotService,
+            "_api_client",
+            lambda self: AsyncHubSpotAPI(
+                "DUMMY_TOKEN",
+                client=httpx.AsyncClient(transport=httpx.MockTransport(_fake_hubspot)),
+            ),
+        ):
+            CALLS.clear()
+            yield
+
+    def test_upsert_deals_runs_concurrently(self, db_session):
+        """
+        Twenty deals take two HubSpot calls each; awaited together they
+        finish in roughly the time of one deal, in input order, and are
+        tracked locally.
+        """
+        deals = [{"dealname": f"AD{i}"} for i in range(20)]
+
+        started = time.monotonic()
+        results = asyncio.run(AsyncHubSpotService().upsert_deals(deals))
+        elapsed = time.monotonic() - started
+
+        assert [r["id"] for r in results] == [f"ASYNC_AD{i}" for i in range(20)]
+        assert elapsed < 20 * 2 * LATENCY / 4
+        assert _untrack(db_session, "deals", "ASYNC_AD%") == 20
+
+    def test_upsert_deals_aggregates_errors(self, db_session):
+        """
+        A failing item is reported by index while the others still land.
+        """
+        deals = [{"dealname": "AX1"}, {"dealname": "fail"}, {"dealname": "AX2"}]
+
+        with pytest.raises(BulkOperationError) as exc:
+            asyncio.run(AsyncHubSpotService().upsert_deals(deals))
+
+        assert [r and r["id"] for r in exc.value.results] == [
+            "ASYNC_AX1",
+            None,
+            "ASYNC_AX2",
+        ]
+        assert [e["index"] for e in exc.value.errors] == [1]
+
+        assert _untrack(db_session, "deals", "ASYNC_AX%") == 2
+
+    def test_create_ticket_with_associations(self, db_session):
+        ticket = {"subject": "AT1", "contact_id": "1", "deal_id": "2"}
+
+        result = asyncio.run(AsyncHubSpotService().create_ticket(ticket))
+
+        assert result["id"] == "ASYNC_AT1"
+        assert _untrack(db_session, "tickets", "ASYNC_AT1") == 1
+
+    def test_compound_runs_the_dependency_graph(self, db_session):
+        """
+        Contact and deal lookups go out together; the deal is created with
+        the new contact inline and the ticket with both, so the five calls
+        take four round trips and no separate association calls.
+        """
+        graph = {
+            "contact": {"email": "compound@example.com", "firstname": "C"},
+            "deal": {"dealname": "CompoundDeal", "amount": 5.0},
+            "ticket": {"subject": "CompoundTicket", "description": "x"},
+        }
+
+        results = asyncio.run(AsyncHubSpotService().compound(graph))
+
+        assert results["contact"]["id"] == "ASYNC_compound@example.com"
+        assert results["deal"]["id"] == "ASYNC_CompoundDeal"
+        assert results["ticket"]["id"] == "ASYNC_CompoundTicket"
+        assert [path for path, _ in CALLS] == [
+            "/crm/v3/objects/contacts/search",
+            "/crm/v3/objects/deals/search",
+            "/crm/v3/objects/contacts",
+            "/crm/v3/objects/deals",
+            "/crm/v3/objects/tickets",
+        ]
+
+        bodies = {path: body for path, body in CALLS}
+        deal_links = bodies["/crm/v3/objects/deals"]["associations"]
+        assert [link["to"]["id"] for link in deal_links] == [
+            "ASYNC_compound@example.com"
+        ]
+        ticket_links = bodies["/crm/v3/objects/tickets"]["associations"]
+        assert sorted(link["to"]["id"] for link in ticket_links) == [
+            "ASYNC_CompoundDeal",
+            "ASYNC_compound@example.com",
+        ]
+
+        assert _untrack(db_session, "contacts", "ASYNC_compound%") == 1
+        assert _untrack(db_session, "deals", "ASYNC_CompoundDeal") == 1
+        assert _untrack(db_session, "tickets", "ASYNC_CompoundTicket") == 1
+
+    def test_compound_reports_failed_and_blocked_steps(self, db_session):
+        """
+        When the deal fails, the ticket that needs it is reported as blocked
+        while the contact still lands.
+        """
+        graph = {
+            "contact": {"email": "blocked@example.com"},
+            "deal": {"dealname": "fail", "amount": 1.0},
+            "ticket": {"subject": "BlockedTicket"},
+        }
+
+        with pytest.raises(BulkOperationError) as exc:
+            asyncio.run(AsyncHubSpotService().compound(graph))
+
+        assert exc.value.results["contact"]["id"] == "ASYNC_blocked@example.com"
+        assert exc.value.results["deal"] is None
+        assert exc.value.results["ticket"] is None
+        errors = {e["step"]: e["error"] for e in exc.value.errors}
+        assert errors["ticket"].startswith("deal step failed")
+        assert not any(path.endswith("/tickets") for path, _ in CALLS)
+
+        assert _untrack(db_session, "contacts", "ASYNC_blocked%") == 1
+
+    def test_compound_existing_deal_with_own_contact_ignores_contact_step(
+        self, db_session
+    ):
+        """
+        An existing deal that names its own contact_id does not wait on the
+        contact step, so a failed contact does not fail the deal update.
+        """
+        graph = {
+            "contact": {"email": "fail"},
+            "deal": {"dealname": "ExistingDeal", "contact_id": "77"},
+        }
+
+        with pytest.raises(BulkOperationError) as exc:
+            asyncio.run(AsyncHubSpotService().compound(graph))
+
+        assert exc.value.results["deal"]["id"] == "ASYNC_ExistingDeal"
+        assert [e["step"] for e in exc.value.errors] == ["contact"]
+        links = [body for path, body in CALLS if "/associations/" in path]
+        assert links == [
+            {"inputs": [{"from": {"id": "ASYNC_ExistingDeal"}, "to": {"id": "77"}}]}
+        ]
+        assert _untrack(db_session, "deals", "ASYNC_ExistingDeal") == 1
+
+    def test_compound_existing_deal_tracked_when_association_fails(self, db_session):
+        """
+        The deal update already went out, so a failed association still
+        reports and tracks the updated deal next to the error.
+        """
+        graph = {"deal": {"dealname": "ExistingDeal", "contact_id": "BADLINK"}}
+
+        with pytest.raises(BulkOperationError) as exc:
+            asyncio.run(AsyncHubSpotService().compound(graph))
+
+        assert exc.value.results["deal"]["id"] == "ASYNC_ExistingDeal"
+        (error,) = exc.value.errors
+        assert error["step"] == "deal"
+        assert error["error"].startswith("association failed")
+        assert _untrack(db_session, "deals", "ASYNC_ExistingDeal") == 1
+
+    def test_compound_ticket_links_deal_whose_association_failed(self, db_session):
+        """
+        A deal that was updated but could not be linked to its contact still
+        has an ID, so the ticket that needs it is created and linked to it.
+        """
+        graph = {
+            "contact": {"email": "fail"},
+            "deal": {"dealname": "ExistingDeal"},
+            "ticket": {"subject": "LinkedTicket", "contact_id": "88"},
+        }
+
+        with pytest.raises(BulkOperationError) as exc:
+            asyncio.run(AsyncHubSpotService().compound(graph))
+
+        assert exc.value.results["deal"]["id"] == "ASYNC_ExistingDeal"
+        assert exc.value.results["ticket"]["id"] == "ASYNC_LinkedTicket"
+        assert sorted(e["step"] for e in exc.value.errors) == ["contact", "deal"]
+        bodies = {path: body for path, body in CALLS}
+        ticket_links = bodies["/crm/v3/objects/tickets"]["associations"]
+        assert sorted(link["to"]["id"] for link in ticket_links) == [
+            "88",
+            "ASYNC_ExistingDeal",
+        ]
+
+        assert _untrack(db_session, "deals", "ASYNC_ExistingDeal") == 1
+        assert _untrack(db_session, "tickets", "ASYNC_LinkedTicket") == 1
@@ -0,0 +1,165 @@
+import datetime
+import json
+import os
+import pytest
+import threading
+from unittest.mock import patch
+
+from app.services.bulk_export_service import MANIFEST_NAME, HubSpotBulkExportService
+
+EPOCH = datetime.datetime(2024, 1, 1)
+
+
+def _dataset(count):
+    records = []
+    for i in range(count):
+        created = EPOCH + datetime.timedelta(hours=i)
+        records.append(
+            {
+                "id": str(1000 + i),
+                "properties": {"dealname": f"Deal {i}", "amount": str(i)},
+                "createdAt": created.isoformat() + "Z",
+                "updatedAt": created.isoformat() + "Z",
+                "archived": False,
+                "_ms": int(created.replace(tzinfo=datetime.timezone.utc).timestamp())
+                * 1000,
+            }
+        )
+    return records
+
+
+class _FakeSearch:
+    """
+    Minimal stand-in for HubSpot search over createdate ranges, including
+    the total and offset-style paging cursor.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.ranges = []
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, object_type, filter_groups, properties, sorts=None, after=None, limit=100
+    ):
+        if not filter_groups:
+            return {"total": len(self.records), "results": self.records[:limit]}
+        low, high = (int(f["value"]) for f in filter_groups[0]["filters"])
+        if after is None:
+            with self._lock:
+                self.ranges.append((low, high))
+        matches = [r for r in self.records if low <= r["_ms"] < high]
+        offset = int(after or 0)
+        response = {
+            "total": len(matches),
+            "results": [
+                {k: v for k, v in r.items() if k != "_ms"}
+                for r in matches[offset : offset + limit]
+            ],
+        }
+        if offset + limit < len(matches):
+            response["paging"] = {"next": {"after": str(offset + limit)}}
+        return response
+
+
+def _exported_ids(output_dir):
+    ids = []
+    for name in os.listdir(output_dir):
+        if name.endswith(".ndjson"):
+            with open(os.path.join(output_dir, name)) as f:
+                ids.extend(json.loads(line)["id"] for line in f)
+    return sorted(ids)
+
+
+@pytest.mark.usefixtures("test_app")
+class TestHubSpotBulkExportService:
+    @pytest.fixture(autouse=True)
+    def _oauth(self):
+        with patch(
+            "app.services.bulk_export_service.HubspotOAuthService"
+        ) as mock_oauth:
+            mock_oauth.return_value.get_access_token.return_value = "DUMMY_TOKEN"
+            yield
+
+    @patch("app.services.bulk_export_service.HUBSPOT_SEARCH_MAX_RESULTS", 10)
+    @patch("app.services.bulk_export_service.HubSpotAPI")
+    def test_export_splits_large_ranges_and_writes_each_object_once(
+        self, mock_api_cls, tmp_path
+    ):
+        records = _dataset(60)
+        fake = _FakeSearch(records)
+        mock_api_cls.return_value.search_objects.side_effect = fake
+        output_dir = str(tmp_path / "export")
+
+        stats = HubSpotBulkExportService(concurrency=3, page_size=4).run(
+            "deals",
+            output_dir,
+            until=EPOCH + datetime.timedelta(days=3),
+            slices=2,
+        )
+
+        assert stats["rows"] == 60
+        assert _exported_ids(output_dir) == [r["id"] for r in records]
+        # Both initial halves hold more than 10 objects, so they were split.
+        assert stats["ranges"] > 2
+        assert not [n for n in os.listdir(output_dir) if n.endswith(".partial")]
+        with open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        assert len(manifest["completed"]) == stats["ranges"]
+
+    @patch("app.services.bulk_export_service.HubSpotAPI")
+    def test_export_resumes_from_manifest(self, mock_api_cls, tmp_path):
+        records = _dataset(20)
+        fake = _FakeSearch(records)
+        mock_api_cls.return_value.search_objects.side_effect = fake
+        output_dir = str(tmp_path / "resume")
+        until = EPOCH + datetime.timedelta(days=1)
+
+        HubSpotBulkExportService(concurrency=2).run(
+            "deals", output_dir, until=until, slices=4
+        )
+        manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        assert len(manifest["completed"]) == 4
+        # Pretend the run died before the last range finished.
+        lost_key = sorted(manifest["completed"], key=lambda k: int(k.split("-")[0]))[-1]
+        lost = manifest["completed"].pop(lost_key)
+        os.remove(os.path.join(output_dir, lost["file"]))
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+        fake.ranges.clear()
+
+        stats = HubSpotBulkExportService(concurrency=2).run(
+            "deals", output_dir, until=until, slices=4
+        )
+
+        assert fake.ranges == [tuple(int(part) for part in lost_key.split("-"))]
+        assert stats["rows"] == 20
+        assert _exported_ids(output_dir) == [r["id"] for r in records]
+
+    @patch("app.services.bulk_export_service.HubSpotAPI")
+    def test_export_to_parquet(self, mock_api_cls, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        mock_api_cls.return_value.search_objects.side_effect = _FakeSearch(_dataset(5))
+        output_dir = str(tmp_path / "parquet")
+
+        stats = HubSpotBulkExportService(concurrency=1).run(
+            "deals",
+            output_dir,
+            fmt="parquet",
+            until=EPOCH + datetime.timedelta(days=1),
+            slices=1,
+            properties=["dealname"],
+        )
+
+        (name,) = stats["files"]
+        table = pq.read_table(os.path.join(output_dir, name))
+        assert table.column_names == [
+            "id",
+            "createdAt",
+            "updatedAt",
+            "archived",
+            "dealname",
+        ]
+        assert table.column("dealname").to_pylist() == [f"Deal {i}" for i in range(5)]
@@ -1,9 +1,13 @@
+import datetime
+import time
 import pytest
 from unittest.mock import patch, MagicMock
+from sqlalchemy import text
 from flask import current_app
 from app.models import CreatedCRMObject, db
 from app.services.oauth_service import HubspotOAuthService
 from app.services.hubspot_service import HubSpotService
+from app.utils.errors import BulkOperationError
 
 
 @pytest.mark.usefixtures("test_app", "db_session")
@@ -207,3 +211,243 @@ class TestHubSpotService:
         assert results[0]["id"] == "TICKET_111"
         assert results[1]["id"] == "TICKET_222"
         assert mock_create_ticket.call_count == 2
+
+    def test_upsert_deals_fans_out_with_concurrency(self, test_app, monkeypatch):
+        """
+        With HUBSPOT_BULK_CONCURRENCY > 1, deals are upserted on a thread
+        pool: results keep input order, wall time drops, and each worker
+        gets its own DB session.
+        """
+        monkeypatch.setitem(test_app.config, "HUBSPOT_BULK_CONCURRENCY", 4)
+        main_session = db.session()
+        sessions = set()
+
+        def slow_upsert(self, deal):
+            time.sleep(0.2)
+            sessions.add(id(db.session()))
+            return {"id": f"DEAL_{deal['dealname']}"}
+
+        deals = [{"dealname": str(i)} for i in range(8)]
+        with patch.object(HubSpotService, "upsert_deal", slow_upsert):
+            started = time.monotonic()
+            results = HubSpotService().upsert_deals(deals)
+            elapsed = time.monotonic() - started
+
+        assert [r["id"] for r in results] == [f"DEAL_{i}" for i in range(8)]
+        assert elapsed < 0.2 * 8 / 2
+        assert id(main_session) not in sessions
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_create_tickets_aggregates_item_errors(
+        self, test_app, monkeypatch, concurrency
+    ):
+        """
+        A failing ticket does not stop the rest; the failures are reported
+        together, by input index, once every ticket has been attempted.
+        """
+        monkeypatch.setitem(test_app.config, "HUBSPOT_BULK_CONCURRENCY", concurrency)
+
+        def create(self, ticket):
+            if ticket["subject"] in ("B", "D"):
+                raise ValueError(f"bad {ticket['subject']}")
+            return {"id": ticket["subject"]}
+
+        tickets = [{"subject": s} for s in "ABCDE"]
+        with patch.object(HubSpotService, "create_ticket", create):
+            with pytest.raises(BulkOperationError) as exc:
+                HubSpotService().create_tickets(tickets)
+
+        assert exc.value.httpCode == 207
+        assert exc.value.results == [{"id": "A"}, None, {"id": "C"}, None, {"id": "E"}]
+        assert exc.value.errors == [
+            {"index": 1, "error": "bad B"},
+            {"index": 3, "error": "bad D"},
+        ]
+
+    def test_run_bulk_rolls_back_after_a_failed_item(self, db_session, monkeypatch):
+        """
+        A database error in one item does not leave the shared session
+        aborted for the items after it.
+        """
+        monkeypatch.setitem(current_app.config, "HUBSPOT_BULK_CONCURRENCY", 1)
+
+        def create(self, ticket):
+            db.session.execute(text(f"SELECT 1 / {ticket['divisor']}"))
+            return {"id": ticket["divisor"]}
+
+        tickets = [{"divisor": d} for d in (1, 0, 2)]
+        with patch.object(HubSpotService, "create_ticket", create):
+            with pytest.raises(BulkOperationError) as exc:
+                HubSpotService().create_tickets(tickets)
+
+        assert exc.value.results == [{"id": 1}, None, {"id": 2}]
+        assert [e["index"] for e in exc.value.errors] == [1]
+
+    @pytest.mark.parametrize("concurrency", [1, 4])
+    def test_run_bulk_all_failed_is_an_error(self, test_app, monkeypatch, concurrency):
+        """
+        When no item succeeds the bulk result is a 502, not a partial success.
+        """
+        monkeypatch.setitem(test_app.config, "HUBSPOT_BULK_CONCURRENCY", concurrency)
+
+        def create(self, ticket):
+            raise ValueError(f"bad {ticket['subject']}")
+
+        with patch.object(HubSpotService, "create_ticket", create):
+            with pytest.raises(BulkOperationError) as exc:
+                HubSpotService().create_tickets([{"subject": s} for s in "AB"])
+
+        assert exc.value.all_failed
+        assert exc.value.httpCode == 502
+        assert exc.value.results == [None, None]
+
+    def test_store_created_crm_object_maintains_counts(self, db_session):
+        """
+        New tracked objects bump crm_object_counts; updates of an existing
+        object leave the counter alone.
+        """
+        service = HubSpotService()
+        before = service.get_object_counts().get("tickets", 0)
+
+        service._store_created_crm_object("COUNT_T1", "tickets", "First")
+        service._store_created_crm_object("COUNT_T2", "tickets", "Second")
+        service._store_created_crm_object("COUNT_T1", "tickets", "First, renamed")
+
+        assert service.get_object_counts()["tickets"] == before + 2
+        _, total = service.get_new_objects_from_db("tickets", 1, 10)
+        assert total == before + 2
+
+    def test_get_new_objects_from_db_total_modes(self, db_session):
+        """
+        total_mode="none" skips counting, "estimated" asks the planner.
+        """
+        service = HubSpotService()
+        service._store_created_crm_object("COUNT_D1", "deals", "Estimate Me")
+
+        results, total = service.get_new_objects_from_db("deals", 1, 10, "none")
+        assert total is None
+        assert len(results) >= 1
+
+        _, estimated = service.get_new_objects_from_db("deals", 1, 10, "estimated")
+        assert isinstance(estimated, int)
+        assert estimated >= 0
+
+    def test_get_changes_after_returns_updated_objects(self, db_session):
+        """
+        Updating a tracked object gives it a new change_seq, so it shows up
+        again after a cursor taken before the update.
+        """
+        service = HubSpotService()
+        service._store_created_crm_object("CHANGE_C1", "contacts", "a@example.com")
+        service._store_created_crm_object("CHANGE_C2", "contacts", "b@example.com")
+
+        changes = service.get_changes_after(0, "contacts", limit=1000)
+        cursor = changes[-1]["change_seq"]
+        assert [c["change_seq"] for c in changes] == sorted(
+            c["change_seq"] for c in changes
+        )
+
+        service._store_created_crm_object("CHANGE_C1", "contacts", "a2@example.com")
+
+        changes = service.get_changes_after(cursor, "contacts")
+        assert len(changes) == 1
+        assert changes[0]["external_id"] == "CHANGE_C1"
+        assert changes[0]["name"] == "a2@example.com"
+        assert changes[0]["change_seq"] > cursor
+
+    def test_get_changes_after_never_skips_late_commits(self, db_session):
+        """
+        A transaction that writes first but commits last must still land
+        after the cursor of a reader that already saw the earlier commit.
+        """
+        table = CreatedCRMObject.__table__
+        service = HubSpotService()
+        slow_conn, fast_conn = db.engine.connect(), db.engine.connect()
+        try:
+            slow = slow_conn.begin()
+            slow_conn.execute(
+                table.insert().values(
+                    external_id="LATE_SLOW", object_type="contacts", name="slow"
+                )
+            )
+            with fast_conn.begin():
+                fast_conn.execute(
+                    table.insert().values(
+                        external_id="LATE_FAST", object_type="contacts", name="fast"
+                    )
+                )
+
+            changes = service.get_changes_after(0, "contacts", limit=100000)
+            assert changes[-1]["external_id"] == "LATE_FAST"
+            cursor = changes[-1]["change_seq"]
+
+            slow.commit()
+            late = service.get_changes_after(cursor, "contacts")
+            assert [c["external_id"] for c in late] == ["LATE_SLOW"]
+        finally:
+            slow_conn.close()
+            fast_conn.close()
+            db_session.rollback()
+            db_session.execute(
+                table.delete().where(
+                    table.c.external_id.in_(["LATE_SLOW", "LATE_FAST"])
+                )
+            )
+            db_session.commit()
+
+    def test_get_new_objects_from_db_filters(self, db_session):
+        """
+        name_prefix, email_domain, external_ids and date filters narrow the
+        results; LIKE wildcards in user input match literally.
+        """
+        service = HubSpotService()
+        service._store_created_crm_object("FILTER_1", "contacts", "Ann@Acme.io")
+        service._store_created_crm_object("FILTER_2", "contacts", "bob@acme.io")
+        service._store_created_crm_object("FILTER_3", "contacts", "ann@other.io")
+        service._store_created_crm_object("FILTER_4", "contacts", "a_n@acme.io")
+
+        def external_ids(filters):
+            results, total = service.get_new_objects_from_db(
+                "contacts", 1, 50, filters=filters
+            )
+            assert total == len(results)
+            return sorted(r["external_id"] for r in results)
+
+        assert external_ids({"name_prefix": "ann@"}) == ["FILTER_1", "FILTER_3"]
+        assert external_ids({"name_prefix": "a_"}) == ["FILTER_4"]
+        assert external_ids({"email_domain": "ACME.io"}) == [
+            "FILTER_1",
+            "FILTER_2",
+            "FILTER_4",
+        ]
+        assert external_ids(
+            {"email_domain": "@acme.io", "external_ids": ["FILTER_2", "FILTER_3"]}
+        ) == ["FILTER_2"]
+
+        future = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+        assert external_ids({"updated_since": future, "name_prefix": "ann@"}) == []
+
+    def test_prefix_filters_can_use_indexes(self, db_session):
+        """
+        The name_prefix and email_domain predicates match the expression
+        indexes, so the planner can use them instead of scanning the table.
+        Postgres names the per-partition copies of an index after the
+        indexed expression (..._lower_idx, ..._reverse_idx).
+        """
+        service = HubSpotService()
+        db_session.execute(text("SET LOCAL enable_seqscan = off"))
+        for filters, index_suffix in [
+            ({"name_prefix": "ann"}, "_lower_idx"),
+            ({"email_domain": "acme.io"}, "_reverse_idx"),
+        ]:
+            query = service._apply_filters(CreatedCRMObject.query, None, filters)
+            compiled = query.statement.compile(dialect=db.engine.dialect)
+            plan = "\n".join(
+                row[0]
+                for row in db_session.connection().exec_driver_sql(
+                    f"EXPLAIN {compiled}", compiled.params
+                )
+            )
+            assert "Seq Scan" not in plan
+            assert index_suffix in plan
+        db_session.rollback()
@@ -0,0 +1,240 @@
+import csv
+import json
+import pytest
+from unittest.mock import patch
+
+import requests
+from sqlalchemy.exc import OperationalError
+
+from app.models import CreatedCRMObject, ImportCheckpoint
+from app.services.import_service import HubSpotImportService, _job_id
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def _read_results(path):
+    with open(path, newline="") as f:
+        return [row for row in csv.DictReader(f)]
+
+
+def _deal(name, contact_id=""):
+    return {
+        "dealname": name,
+        "amount": "100.5",
+        "dealstage": "appointmentscheduled",
+        "contact_id": contact_id,
+    }
+
+
+def _created(inputs, prefix):
+    """
+    Fake batch/create response, deliberately in reverse input order.
+    """
+    return {
+        "results": [
+            {"id": f"{prefix}{i}", "properties": item["properties"]}
+            for i, item in reversed(list(enumerate(inputs)))
+        ]
+    }
+
+
+@pytest.mark.usefixtures("test_app", "db_session")
+class TestHubSpotImportService:
+    """
+    The import runs against a mocked HubSpotAPI; checkpoints, tracking rows
+    and result files are real.
+    """
+
+    @pytest.fixture(autouse=True)
+    def _oauth(self):
+        with patch("app.services.import_service.HubspotOAuthService") as mock_oauth:
+            mock_oauth.return_value.get_access_token.return_value = "DUMMY_TOKEN"
+            yield
+
+    @patch("app.services.import_service.HubSpotAPI")
+    def test_import_deals_in_chunks_with_inline_associations(
+        self, mock_api_cls, tmp_path, db_session
+    ):
+        mock_api = mock_api_cls.return_value
+        mock_api.batch_create.side_effect = lambda object_type, inputs: _created(
+            inputs, f"IMP_{inputs[0]['properties']['dealname']}_"
+        )
+        path = _write_csv(
+            tmp_path / "deals.csv",
+            [
+                _deal("Import A", contact_id="501"),
+                _deal("Import B"),
+                {**_deal("Import Broken"), "amount": "not-a-number"},
+                _deal("Import C"),
+                _deal("Import D"),
+            ],
+        )
+
+        stats = HubSpotImportService(concurrency=2, chunk_size=2).run(path, "deals")
+
+        assert stats == {
+            "rows": 5,
+            "succeeded": 4,
+            "failed": 0,
+            "invalid": 1,
+            "results": f"{path}.results.csv",
+        }
+        assert mock_api.batch_create.call_count == 2
+        first_inputs = mock_api.batch_create.call_args_list[0].args[1]
+        assert first_inputs[0] == {
+            "properties": {
+                "dealname": "Import A",
+                "amount": 100.5,
+                "dealstage": "appointmentscheduled",
+            },
+            "associations": [
+                {
+                    "to": {"id": "501"},
+                    "types": [
+                        {
+                            "associationCategory": "HUBSPOT_DEFINED",
+                            "associationTypeId": 3,
+                        }
+                    ],
+                }
+            ],
+        }
+        assert "associations" not in first_inputs[1]
+
+        results = _read_results(stats["results"])
+        assert [(r["row"], r["status"]) for r in results] == [
+            ("1", "created"),
+            ("2", "created"),
+            ("3", "invalid"),
+            ("4", "created"),
+            ("5", "created"),
+        ]
+        assert results[0]["hubspot_id"] == "IMP_Import A_0"
+        assert results[1]["hubspot_id"] == "IMP_Import A_1"
+        assert "amount" in results[2]["error"]
+
+        tracked = (
+            db_session.query(CreatedCRMObject)
+            .filter(CreatedCRMObject.external_id.like("IMP_%"))
+            .count()
+        )
+        assert tracked == 4
+        checkpoint = db_session.get(ImportCheckpoint, _job_id(path, "deals"))
+        assert checkpoint.rows_done == 5
+        assert checkpoint.completed_at is not None
+
+    @patch("app.services.import_service.HubSpotAPI")
+    def test_import_resumes_after_checkpoint(self, mock_api_cls, tmp_path, db_session):
+        mock_api = mock_api_cls.return_value
+        mock_api.batch_create.side_effect = lambda object_type, inputs: _created(
+            inputs, "IMP_RESUME_"
+        )
+        path = _write_csv(
+            tmp_path / "resume.csv",
+            [_deal("Resume 1"), _deal("Resume 2"), _deal("Resume 3")],
+        )
+        results_path = f"{path}.results.csv"
+        with open(results_path, "w", newline="") as f:
+            f.write("row,status,hubspot_id,error\r\n1,created,X1,\r\n2,created,X2,\r\n")
+        db_session.add(
+            ImportCheckpoint(
+                job_id=_job_id(path, "deals"),
+                source=path,
+                object_type="deals",
+                rows_done=2,
+                succeeded=2,
+                failed=0,
+                invalid=0,
+            )
+        )
+        db_session.commit()
+
+        stats = HubSpotImportService(concurrency=1, chunk_size=2).run(path, "deals")
+
+        mock_api.batch_create.assert_called_once()
+        sent = mock_api.batch_create.call_args.args[1]
+        assert [item["properties"]["dealname"] for item in sent] == ["Resume 3"]
+        assert stats["rows"] == 3
+        assert stats["succeeded"] == 3
+        assert [r["row"] for r in _read_results(results_path)] == ["1", "2", "3"]
+
+    @patch("app.services.import_service.HubSpotAPI")
+    def test_failed_chunk_is_recorded_and_skipped(self, mock_api_cls, tmp_path):
+        mock_api_cls.return_value.batch_upsert.side_effect = requests.HTTPError(
+            "400 Client Error"
+        )
+        path = tmp_path / "contacts.ndjson"
+        path.write_text(
+            json.dumps(
+                {
+                    "email": "import@example.com",
+                    "firstname": "Imp",
+                    "lastname": "Ort",
+                    "phone": "123",
+                }
+            )
+            + "\n"
+            + "{not json\n"
+        )
+
+        stats = HubSpotImportService(concurrency=1).run(str(path), "contacts")
+
+        assert (stats["failed"], stats["invalid"], stats["rows"]) == (1, 1, 2)
+        upsert_inputs = mock_api_cls.return_value.batch_upsert.call_args.args[1]
+        assert upsert_inputs[0]["idProperty"] == "email"
+        assert upsert_inputs[0]["id"] == "import@example.com"
+        results = _read_results(stats["results"])
+        assert [(r["row"], r["status"]) for r in results] == [
+            ("1", "failed"),
+            ("2", "invalid"),
+        ]
+        assert "400 Client Error" in results[0]["error"]
+
+    @patch("app.services.import_service.HubSpotAPI")
+    def test_database_errors_are_recorded_per_chunk(self, mock_api_cls, tmp_path):
+        """
+        A chunk whose token lookup or tracking write fails is recorded in the
+        result file, and the import carries on with the next chunk.
+        """
+        mock_api_cls.return_value.batch_create.side_effect = (
+            lambda object_type, inputs: _created(inputs, "IMP_DBERR_")
+        )
+        path = _write_csv(
+            tmp_path / "dberr.csv",
+            [_deal("DB 1"), _deal("DB 2"), _deal("DB 3")],
+        )
+        calls = []
+
+        def flaky_token(*args):
+            calls.append(1)
+            if len(calls) == 1:
+                raise OperationalError("SELECT", {}, Exception("connection lost"))
+            return "DUMMY_TOKEN"
+
+        with patch("app.services.import_service.HubspotOAuthService") as mock_oauth:
+            mock_oauth.return_value.get_access_token.side_effect = flaky_token
+            with patch(
+                "app.services.import_service.HubSpotService"
+                "._store_created_crm_objects",
+                side_effect=OperationalError("INSERT", {}, Exception("disk full")),
+            ):
+                stats = HubSpotImportService(concurrency=1, chunk_size=1).run(
+                    path, "deals"
+                )
+
+        assert (stats["rows"], stats["failed"], stats["succeeded"]) == (3, 1, 2)
+        results = _read_results(stats["results"])
+        assert [(r["row"], r["status"]) for r in results] == [
+            ("1", "failed"),
+            ("2", "created"),
+            ("3", "created"),
+        ]
+        assert "connection lost" in results[0]["error"]
+        assert results[1]["hubspot_id"] == "IMP_DBERR_0"
+        assert results[1]["error"].startswith("Not tracked locally")
@@ -0,0 +1,140 @@
+import datetime
+import gzip
+import os
+import stat
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+
+from app.models import CreatedCRMObject
+from app.services.hubspot_service import HubSpotService
+from app.services.partition_service import CRMObjectPartitionService
+
+
+@pytest.mark.usefixtures("test_app", "db_session")
+class TestCRMObjectPartitionService:
+    """
+    Tests for monthly partition maintenance and retention of created_crm_objects.
+    """
+
+    def test_ensure_partitions_covers_upcoming_months(self):
+        service = CRMObjectPartitionService()
+        service.ensure_partitions(months_ahead=2)
+
+        now = datetime.datetime.utcnow()
+        partitions = service.list_partitions()
+        assert any(p["start"] <= now < p["end"] for p in partitions)
+        assert service.ensure_partitions(months_ahead=2) == []
+
+    def test_create_partition_moves_rows_from_default(self, db_session):
+        """
+        Rows that landed in the DEFAULT partition are moved into a partition
+        created later for their month.
+        """
+        db_session.add(
+            CreatedCRMObject(
+                external_id="PART_1",
+                object_type="deals",
+                name="Old deal",
+                created_date=datetime.datetime(1999, 5, 17),
+            )
+        )
+        db_session.commit()
+
+        service = CRMObjectPartitionService()
+        assert service.create_partition(datetime.date(1999, 5, 1)) is True
+        assert service.create_partition(datetime.date(1999, 5, 20)) is False
+
+        partition = db_session.execute(
+            text(
+                "SELECT tableoid::regclass::text FROM created_crm_objects "
+                "WHERE external_id = 'PART_1'"
+            )
+        ).scalar()
+        assert partition == "created_crm_objects_p199905"
+
+    def test_retention_archives_and_drops_expired_partitions(
+        self, db_session, tmp_path
+    ):
+        """
+        Expired partitions are written to a gzip CSV, dropped, and their rows
+        subtracted from the maintained counters.
+        """
+        hubspot = HubSpotService()
+        for i in range(3):
+            hubspot._store_created_crm_object(f"RET_{i}", "contacts", f"r{i}@x.io")
+        db_session.query(CreatedCRMObject).filter(
+            CreatedCRMObject.external_id.like("RET_%")
+        ).update({"created_date": datetime.datetime(1998, 3, 2)})
+        db_session.commit()
+
+        service = CRMObjectPartitionService()
+        service.create_partition(datetime.date(1998, 3, 1))
+        before = hubspot.get_object_counts()["contacts"]
+
+        assert [r["partition"] for r in service.apply_retention(12, dry_run=True)] == [
+            "created_crm_objects_p199803",
+            "created_crm_objects_p199905",
+        ]
+
+        results = service.apply_retention(12, archive_dir=str(tmp_path))
+        archived = {r["partition"]: r for r in results}
+        result = archived["created_crm_objects_p199803"]
+        assert result["rows"] == 3
+        assert result["counts"] == {"contacts": 3}
+
+        with gzip.open(result["archive"], "rt") as archive:
+            lines = archive.read().splitlines()
+        assert lines[0].startswith("id,external_id,object_type,name,created_date")
+        assert len(lines) == 4
+
+        assert hubspot.get_object_counts()["contacts"] == before - 3
+        assert (
+            db_session.query(CreatedCRMObject)
+            .filter(CreatedCRMObject.external_id.like("RET_%"))
+            .count()
+            == 0
+        )
+        names = [p["name"] for p in service.list_partitions()]
+        assert "created_crm_objects_p199803" not in names
+
+    def test_archive_is_synced_whole_before_the_drop(self, db_session, tmp_path):
+        """
+        The archive is fsynced only once its gzip trailer is written, and the
+        directory holding the renamed file is fsynced before the partition
+        is dropped.
+        """
+        hubspot = HubSpotService()
+        hubspot._store_created_crm_object("SYNCED_1", "contacts", "s@x.io")
+        db_session.query(CreatedCRMObject).filter(
+            CreatedCRMObject.external_id == "SYNCED_1"
+        ).update({"created_date": datetime.datetime(1997, 4, 2)})
+        db_session.commit()
+        service = CRMObjectPartitionService()
+        service.create_partition(datetime.date(1997, 4, 1))
+
+        synced = []
+        fsync = os.fsync
+        remove = service._remove_partition
+
+        def recording_fsync(fd):
+            if stat.S_ISDIR(os.fstat(fd).st_mode):
+                synced.append("dir")
+            else:
+                with open(f"/proc/self/fd/{fd}", "rb") as f:
+                    gzip.decompress(f.read())  # fails on a missing trailer
+                synced.append("file")
+            fsync(fd)
+
+        def recording_remove(name, drop):
+            synced.append("drop")
+            return remove(name, drop)
+
+        with (
+            patch("os.fsync", recording_fsync),
+            patch.object(service, "_remove_partition", recording_remove),
+        ):
+            service.archive_partition("created_crm_objects_p199704", str(tmp_path))
+
+        assert synced == ["file", "dir", "drop"]
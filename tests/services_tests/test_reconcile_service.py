@@ -0,0 +1,114 @@
+import pytest
+from unittest.mock import patch
+
+from app.models import CreatedCRMObject, CRMObjectCount
+from app.services.hubspot_service import HubSpotService
+from app.services.reconcile_service import CRMReconcileService
+
+TRACKED = {
+    "REC_OK": "Reconcile ok",
+    "REC_RENAMED": "Old deal name",
+    "REC_GONE": "Deleted in HubSpot",
+    "REC_OLD": "Merged away",
+    "REC_DUP": "Merged into tracked",
+}
+
+
+def _fake_batch_read(object_type, ids, properties):
+    """
+    HubSpot as seen by the test: REC_GONE was deleted, REC_OLD was merged
+    into REC_NEW and REC_DUP into REC_OK. Other deals are untouched.
+    """
+    survivors = {
+        "REC_OLD": ("REC_NEW", "Survivor", "REC_OLD"),
+        "REC_DUP": ("REC_OK", "Reconcile ok", "REC_DUP"),
+    }
+    results = {}
+    for object_id in ids:
+        if object_id == "REC_GONE":
+            continue
+        if object_id in survivors:
+            new_id, name, merged = survivors[object_id]
+        elif object_id == "REC_RENAMED":
+            new_id, name, merged = object_id, "New deal name", None
+        elif object_id == "REC_OK":
+            new_id, name, merged = object_id, "Reconcile ok", None
+        else:
+            new_id, name, merged = object_id, None, None
+        record = results.setdefault(new_id, {"id": new_id, "properties": {}})
+        if name:
+            record["properties"]["dealname"] = name
+        if merged:
+            existing = record["properties"].get("hs_merged_object_ids")
+            record["properties"]["hs_merged_object_ids"] = ";".join(
+                filter(None, [existing, merged])
+            )
+    return {"results": list(results.values())}
+
+
+def _rows(db_session):
+    return {
+        row.external_id: row
+        for row in db_session.query(CreatedCRMObject).filter(
+            CreatedCRMObject.object_type == "deals",
+            CreatedCRMObject.external_id.like("REC_%"),
+        )
+    }
+
+
+def _count(db_session):
+    return db_session.get(CRMObjectCount, "deals").total
+
+
+@pytest.mark.usefixtures("test_app", "db_session")
+class TestCRMReconcileService:
+    @pytest.fixture(autouse=True)
+    def _tracked(self, db_session):
+        HubSpotService()._store_created_crm_objects("deals", TRACKED)
+        yield
+        db_session.rollback()
+        leftovers = list(_rows(db_session).values())
+        for row in leftovers:
+            db_session.delete(row)
+        CRMObjectCount.adjust("deals", -len(leftovers))
+        db_session.commit()
+
+    @pytest.fixture(autouse=True)
+    def _api(self):
+        with (
+            patch("app.services.reconcile_service.HubspotOAuthService") as oauth,
+            patch("app.services.reconcile_service.HubSpotAPI") as api_cls,
+        ):
+            oauth.return_value.get_access_token.return_value = "DUMMY_TOKEN"
+            api_cls.return_value.batch_read.side_effect = _fake_batch_read
+            yield api_cls.return_value
+
+    def test_report_classifies_drift_without_changes(self, db_session, _api):
+        stats = CRMReconcileService(concurrency=2, chunk_size=2).reconcile("deals")
+
+        assert (stats["renamed"], stats["merged"], stats["missing"]) == (1, 2, 1)
+        assert stats["checked"] == stats["ok"] + 4
+        assert (stats["updated"], stats["removed"]) == (0, 0)
+        assert all(len(call.args[1]) <= 2 for call in _api.batch_read.call_args_list)
+        assert {k: r.name for k, r in _rows(db_session).items()} == TRACKED
+
+    def test_mark_sets_stale_date_on_missing_and_merged(self, db_session):
+        CRMReconcileService(concurrency=2).reconcile("deals", action="mark")
+
+        rows = _rows(db_session)
+        stale = {key for key, row in rows.items() if row.stale_date is not None}
+        assert stale == {"REC_GONE", "REC_OLD", "REC_DUP"}
+
+    def test_remove_deletes_missing_and_repairs_renames_and_merges(self, db_session):
+        before = _count(db_session)
+
+        stats = CRMReconcileService(concurrency=2, chunk_size=2).reconcile(
+            "deals", action="remove"
+        )
+
+        rows = _rows(db_session)
+        assert sorted(rows) == ["REC_NEW", "REC_OK", "REC_RENAMED"]
+        assert rows["REC_RENAMED"].name == "New deal name"
+        assert rows["REC_NEW"].name == "Survivor"
+        assert (stats["updated"], stats["removed"]) == (2, 2)
+        assert _count(db_session) == before - 2
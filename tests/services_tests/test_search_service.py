@@ -0,0 +1,109 @@
+import datetime
+import pytest
+from sqlalchemy import text
+
+from app.models import CRMMirrorObject, db
+from app.services.search_service import CRMSearchService
+
+
+def _mirror(object_type, hubspot_id, name, archived=False, **properties):
+    return CRMMirrorObject(
+        object_type=object_type,
+        hubspot_id=hubspot_id,
+        name=name,
+        properties=properties,
+        archived=archived,
+        synced_at=datetime.datetime.utcnow(),
+    )
+
+
+@pytest.fixture
+def search_rows(db_session):
+    rows = [
+        _mirror(
+            "contacts",
+            "SRCH_C1",
+            "zora.quill@searchco.io",
+            firstname="Zora",
+            lastname="Quill",
+        ),
+        _mirror("contacts", "SRCH_C2", "zoran.old@searchco.io", archived=True),
+        _mirror("deals", "SRCH_D1", "Searchco Renewal"),
+        _mirror(
+            "tickets",
+            "SRCH_T1",
+            "Printer jam",
+            content="Zora reports the searchco printer is stuck",
+        ),
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    yield rows
+    for row in rows:
+        db_session.delete(row)
+    db_session.commit()
+
+
+@pytest.mark.usefixtures("test_app", "db_session")
+class TestCRMSearchService:
+    """
+    Searches run against real mirror rows; nothing calls HubSpot.
+    """
+
+    @staticmethod
+    def _ids(results):
+        return [r["hubspot_id"] for r in results]
+
+    def test_auto_mode_matches_email_exactly(self, search_rows):
+        mode, results = CRMSearchService().search("Zora.Quill@SearchCo.io")
+        assert mode == "email"
+        assert self._ids(results) == ["SRCH_C1"]
+
+    def test_prefix_mode_skips_archived_unless_asked(self, search_rows):
+        service = CRMSearchService()
+        _, results = service.search("zor", mode="prefix", object_type="contacts")
+        assert self._ids(results) == ["SRCH_C1"]
+
+        _, results = service.search(
+            "zor", mode="prefix", object_type="contacts", include_archived=True
+        )
+        assert self._ids(results) == ["SRCH_C1", "SRCH_C2"]
+
+    def test_prefix_mode_treats_wildcards_literally(self, search_rows):
+        _, results = CRMSearchService().search("%", mode="prefix")
+        assert results == []
+
+    def test_fulltext_ranks_name_matches_first(self, search_rows):
+        """
+        Every word matches as a prefix; name and person-name words outrank
+        ticket content.
+        """
+        mode, results = CRMSearchService().search("zora searchc")
+        assert mode == "fulltext"
+        assert self._ids(results) == ["SRCH_C1", "SRCH_T1"]
+
+        _, results = CRMSearchService().search("renew", object_type="deals")
+        assert self._ids(results) == ["SRCH_D1"]
+
+    def test_fuzzy_mode_finds_name(self, search_rows):
+        mode, results = CRMSearchService().search("quill", mode="fuzzy")
+        assert mode in ("fuzzy", "fulltext")
+        assert "SRCH_C1" in self._ids(results)
+
+    def test_search_modes_can_use_indexes(self, search_rows, db_session):
+        db_session.execute(text("SET LOCAL enable_seqscan = off"))
+        for sql, index in [
+            (
+                "SELECT id FROM crm_mirror_objects WHERE lower(name) LIKE 'zor%'",
+                "ix_crm_mirror_objects_name_prefix",
+            ),
+            (
+                "SELECT id FROM crm_mirror_objects "
+                "WHERE search_vector @@ to_tsquery('simple', 'zora:*')",
+                "ix_crm_mirror_objects_search_vector",
+            ),
+        ]:
+            plan = "\n".join(
+                row[0] for row in db.session.execute(text(f"EXPLAIN {sql}"))
+            )
+            assert index in plan
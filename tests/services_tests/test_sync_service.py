@@ -0,0 +1,164 @@
+import datetime
+import pytest
+from unittest.mock import patch
+
+from app.models import CRMMirrorObject, SyncState, db
+from app.services.sync_service import HubSpotSyncService
+
+
+def _contact(contact_id, email, updated_at):
+    return {
+        "id": contact_id,
+        "properties": {"email": email, "firstname": "Sync"},
+        "createdAt": "2024-01-01T00:00:00.000Z",
+        "updatedAt": updated_at,
+        "archived": False,
+    }
+
+
+@pytest.mark.usefixtures("test_app", "db_session")
+class TestHubSpotSyncService:
+    """
+    Unit tests for the incremental HubSpot -> mirror sync.
+    HubSpotAPI is mocked; the mirror tables are real.
+    """
+
+    @patch("app.services.sync_service.HubspotOAuthService")
+    @patch("app.services.sync_service.HubSpotAPI")
+    def test_sync_pages_and_persists_high_water_mark(
+        self, mock_api_cls, mock_oauth_cls, db_session
+    ):
+        mock_oauth_cls.return_value.get_access_token.return_value = "DUMMY_TOKEN"
+        mock_api = mock_api_cls.return_value
+        mock_api.search_objects.side_effect = [
+            {
+                "results": [
+                    _contact("SYNC_1", "one@sync.io", "2024-02-01T10:00:00.000Z"),
+                    _contact("SYNC_2", "two@sync.io", "2024-02-02T10:00:00.000Z"),
+                ],
+                "paging": {"next": {"after": "2"}},
+            },
+            {
+                "results": [
+                    _contact("SYNC_3", "three@sync.io", "2024-02-03T10:00:00.000Z")
+                ],
+            },
+        ]
+
+        stats = HubSpotSyncService().sync("contacts", full=True)
+
+        assert stats["fetched"] == 3
+        assert stats["pages"] == 2
+        assert stats["high_water_mark"] == datetime.datetime(2024, 2, 3, 10)
+        first_call, second_call = mock_api.search_objects.call_args_list
+        assert first_call.kwargs["filter_groups"] == []
+        assert first_call.kwargs["sorts"] == [
+            {"propertyName": "lastmodifieddate", "direction": "ASCENDING"}
+        ]
+        assert second_call.kwargs["after"] == "2"
+
+        mirrored = (
+            db_session.query(CRMMirrorObject)
+            .filter(CRMMirrorObject.hubspot_id.like("SYNC_%"))
+            .order_by(CRMMirrorObject.hubspot_id)
+            .all()
+        )
+        assert [m.name for m in mirrored] == [
+            "one@sync.io",
+            "two@sync.io",
+            "three@sync.io",
+        ]
+        assert db.session.get(SyncState, "contacts").high_water_mark == (
+            datetime.datetime(2024, 2, 3, 10)
+        )
+
+    @patch("app.services.sync_service.HubspotOAuthService")
+    @patch("app.services.sync_service.HubSpotAPI")
+    def test_incremental_sync_filters_by_high_water_mark(
+        self, mock_api_cls, mock_oauth_cls, db_session
+    ):
+        """
+        The next run only asks for objects modified since the stored mark,
+        and a stale record never overwrites a newer mirrored one.
+        """
+        mock_oauth_cls.return_value.get_access_token.return_value = "DUMMY_TOKEN"
+        mock_api = mock_api_cls.return_value
+        mock_api.search_objects.return_value = {
+            "results": [
+                _contact("SYNC_2", "two-new@sync.io", "2024-03-01T00:00:00.000Z"),
+                _contact("SYNC_3", "three-stale@sync.io", "2024-01-01T00:00:00.000Z"),
+            ]
+        }
+
+        HubSpotSyncService().sync("contacts")
+
+        filters = mock_api.search_objects.call_args.kwargs["filter_groups"]
+        assert filters[0]["filters"][0] == {
+            "propertyName": "lastmodifieddate",
+            "operator": "GTE",
+            "value": str(
+                int(
+                    datetime.datetime(
+                        2024, 2, 3, 10, tzinfo=datetime.timezone.utc
+                    ).timestamp()
+                    * 1000
+                )
+            ),
+        }
+        names = dict(
+            db_session.query(CRMMirrorObject.hubspot_id, CRMMirrorObject.name)
+            .filter(CRMMirrorObject.hubspot_id.in_(["SYNC_2", "SYNC_3"]))
+            .all()
+        )
+        assert names == {"SYNC_2": "two-new@sync.io", "SYNC_3": "three@sync.io"}
+
+    @patch("app.services.sync_service.HUBSPOT_SEARCH_MAX_RESULTS", 2)
+    @patch("app.services.sync_service.HubspotOAuthService")
+    @patch("app.services.sync_service.HubSpotAPI")
+    def test_full_sync_restarts_from_its_own_progress_at_search_cap(
+        self, mock_api_cls, mock_oauth_cls, db_session
+    ):
+        """
+        A full resync that hits the search cap restarts from the newest
+        record it has fetched, not from a later mark stored by earlier runs,
+        and keeps that stored mark.
+        """
+        stored = datetime.datetime(2024, 6, 1)
+        db_session.add(SyncState(object_type="tickets", high_water_mark=stored))
+        db_session.commit()
+        mock_oauth_cls.return_value.get_access_token.return_value = "DUMMY_TOKEN"
+        mock_api = mock_api_cls.return_value
+        mock_api.search_objects.side_effect = [
+            {
+                "results": [
+                    _contact("SYNC_T1", "t1", "2024-01-01T00:00:00.000Z"),
+                    _contact("SYNC_T2", "t2", "2024-01-02T00:00:00.000Z"),
+                ],
+                "paging": {"next": {"after": "2"}},
+            },
+            {"results": [_contact("SYNC_T3", "t3", "2024-03-01T00:00:00.000Z")]},
+        ]
+
+        try:
+            stats = HubSpotSyncService().sync("tickets", full=True)
+
+            assert stats["fetched"] == 3
+            first_call, second_call = mock_api.search_objects.call_args_list
+            assert first_call.kwargs["filter_groups"] == []
+            assert second_call.kwargs["after"] is None
+            restart = second_call.kwargs["filter_groups"][0]["filters"][0]
+            assert restart["value"] == str(
+                int(
+                    datetime.datetime(
+                        2024, 1, 2, tzinfo=datetime.timezone.utc
+                    ).timestamp()
+                    * 1000
+                )
+            )
+            assert db.session.get(SyncState, "tickets").high_water_mark == stored
+        finally:
+            db_session.query(CRMMirrorObject).filter(
+                CRMMirrorObject.hubspot_id.like("SYNC_T%")
+            ).delete(synchronize_session=False)
+            db_session.query(SyncState).filter_by(object_type="tickets").delete()
+            db_session.commit()
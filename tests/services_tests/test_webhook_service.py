@@ -0,0 +1,146 @@
+import datetime
+import pytest
+import requests
+from unittest.mock import patch
+
+from app.models import CreatedCRMObject, CRMMirrorObject, WebhookEvent
+from app.services.hubspot_service import HubSpotService
+from app.services.webhook_service import WebhookService
+
+
+def _event(event_id, subscription_type, object_id, occurred_at, **extra):
+    return {
+        "eventId": event_id,
+        "subscriptionType": subscription_type,
+        "objectId": object_id,
+        "occurredAt": occurred_at,
+        **extra,
+    }
+
+
+def _ticket(ticket_id, subject):
+    return {
+        "id": ticket_id,
+        "properties": {"subject": subject, "hs_pipeline_stage": "1"},
+        "createdAt": "2024-03-01T00:00:00.000Z",
+        "updatedAt": "2024-03-05T00:00:00.000Z",
+        "archived": False,
+    }
+
+
+@pytest.mark.usefixtures("test_app", "db_session")
+class TestWebhookService:
+    """
+    Unit tests for the webhook queue processor.
+    HubSpotAPI is mocked; the queue and local tables are real.
+    """
+
+    @patch("app.services.webhook_service.HubspotOAuthService")
+    @patch("app.services.webhook_service.HubSpotAPI")
+    def test_process_collapses_events_and_applies_batch(
+        self, mock_api_cls, mock_oauth_cls, db_session
+    ):
+        mock_oauth_cls.return_value.get_access_token.return_value = "DUMMY_TOKEN"
+        mock_api = mock_api_cls.return_value
+        # WH_3 is missing from the batch read: deleted since the event.
+        mock_api.batch_read.return_value = {
+            "results": [_ticket("WH_1", "Renamed by webhook"), _ticket("WH_2", "Two")]
+        }
+        HubSpotService()._store_created_crm_object("WH_1", "tickets", "Old subject")
+        db_session.add(
+            CRMMirrorObject(
+                object_type="tickets",
+                hubspot_id="WH_4",
+                name="Going away",
+                properties={},
+                archived=False,
+                synced_at=datetime.datetime.utcnow(),
+            )
+        )
+        db_session.commit()
+
+        WebhookService.enqueue(
+            [
+                _event(9200001, "ticket.creation", "WH_1", 1718000000000),
+                _event(9200002, "ticket.propertyChange", "WH_1", 1718000001000),
+                _event(9200003, "ticket.propertyChange", "WH_2", 1718000002000),
+                _event(9200004, "ticket.propertyChange", "WH_3", 1718000003000),
+                _event(9200005, "ticket.propertyChange", "WH_4", 1718000004000),
+                _event(9200006, "ticket.deletion", "WH_4", 1718000005000),
+                _event(9200007, "company.creation", "WH_5", 1718000006000),
+            ]
+        )
+
+        stats = WebhookService().process_all()
+
+        assert stats["events"] == 7
+        assert stats["fetched"] == 2
+        assert stats["renamed"] == 1
+        mock_api.batch_read.assert_called_once()
+        object_type, ids, _ = mock_api.batch_read.call_args.args
+        assert object_type == "tickets"
+        assert ids == ["WH_1", "WH_2", "WH_3"]
+
+        mirrored = {
+            m.hubspot_id: m
+            for m in db_session.query(CRMMirrorObject).filter(
+                CRMMirrorObject.hubspot_id.like("WH_%")
+            )
+        }
+        assert mirrored["WH_1"].name == "Renamed by webhook"
+        assert mirrored["WH_2"].archived is False
+        assert mirrored["WH_4"].archived is True
+        assert "WH_3" not in mirrored
+
+        tracked = (
+            db_session.query(CreatedCRMObject)
+            .filter_by(object_type="tickets", external_id="WH_1")
+            .one()
+        )
+        assert tracked.name == "Renamed by webhook"
+        assert (
+            db_session.query(WebhookEvent)
+            .filter(WebhookEvent.processed_at.is_(None))
+            .count()
+            == 0
+        )
+
+    @patch("app.services.webhook_service.HubspotOAuthService")
+    @patch("app.services.webhook_service.HubSpotAPI")
+    def test_failed_batch_read_leaves_events_queued(
+        self, mock_api_cls, mock_oauth_cls, db_session
+    ):
+        mock_oauth_cls.return_value.get_access_token.return_value = "DUMMY_TOKEN"
+        mock_api_cls.return_value.batch_read.side_effect = RuntimeError("HubSpot down")
+        WebhookService.enqueue(
+            [_event(9200010, "deal.propertyChange", "WH_DEAL", 1718000010000)]
+        )
+
+        with pytest.raises(RuntimeError):
+            WebhookService().process_pending()
+
+        pending = db_session.query(WebhookEvent).filter_by(event_id=9200010).one()
+        assert pending.processed_at is None
+        db_session.delete(pending)
+        db_session.commit()
+
+    def test_process_webhooks_loop_survives_failed_batches(self, test_app):
+        """
+        `process-webhooks --loop` logs a failed batch and retries after the
+        interval instead of exiting.
+        """
+        outcomes = [
+            requests.Timeout("HubSpot timed out"),
+            {"events": 1, "fetched": 1, "archived": 0, "renamed": 0},
+            KeyboardInterrupt(),  # stands in for stopping the worker
+        ]
+        runner = test_app.test_cli_runner()
+        with patch.object(WebhookService, "process_all", side_effect=outcomes):
+            with patch("app.cli.time.sleep") as sleep:
+                result = runner.invoke(
+                    args=["hubspot", "process-webhooks", "--loop", "--interval", "7"]
+                )
+
+        assert "Processed 1 event(s)" in result.output
+        assert "Aborted" in result.output
+        assert [c.args for c in sleep.call_args_list] == [(7.0,), (7.0,)]
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import threading
+
+import pytest
+import requests
+from prometheus_client import REGISTRY
+
+from app.utils.adaptive_concurrency import (
+    AdaptiveConcurrencyLimiter,
+    FileState,
+    MemoryState,
+    async_concurrency_slot,
+    concurrency_slot,
+    get_concurrency_limiter,
+)
+from app.utils.rate_limit_handler import request_with_tenacity
+from benchmarks.hubspot_standin import StandinConfig, StandinServer
+
+
+def _limiter(initial=4, **kwargs):
+    return AdaptiveConcurrencyLimiter(MemoryState(initial), **kwargs)
+
+
+def test_additive_increase_multiplicative_decrease():
+    limiter = _limiter(initial=4, max_limit=5, decrease_cooldown=60)
+    assert limiter.try_acquire()
+    limiter.release(200, 0.1)
+    assert limiter.limit == pytest.approx(4.25)
+
+    limiter.try_acquire()
+    limiter.release(429, 0.1)
+    assert limiter.limit == pytest.approx(2.125)
+    limiter.try_acquire()
+    limiter.release(503, 0.1)
+    assert limiter.limit == pytest.approx(2.125)  # one cut per cooldown
+
+    for _ in range(50):
+        limiter.try_acquire()
+        limiter.release(200, 0.1)
+    assert limiter.limit == 5
+
+
+def test_latency_spike_and_min_limit():
+    limiter = _limiter(initial=2, latency_threshold=0.5, decrease_cooldown=0)
+    for _ in range(3):
+        limiter.try_acquire()
+        limiter.release(200, 2.0)
+    assert limiter.limit == 1
+
+
+def test_slots_are_bounded_by_limit():
+    limiter = _limiter(initial=2)
+    assert limiter.try_acquire()
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    released = threading.Timer(0.05, limiter.release, (200, 0.0))
+    released.start()
+    with concurrency_slot(limiter) as slot:
+        slot.status = 200
+    assert slot.waited > 0
+
+
+def test_file_state_is_shared_and_drops_dead_workers(tmp_path):
+    path = str(tmp_path / "aimd.json")
+    first = AdaptiveConcurrencyLimiter(FileState(path, 2))
+    second = AdaptiveConcurrencyLimiter(FileState(path, 2))
+
+    assert first.try_acquire()
+    assert second.try_acquire()
+    assert not first.try_acquire()
+    second.release(429, 0.1)
+    assert first.limit == 1
+
+    with open(path) as f:
+        state = json.load(f)
+    state["in_flight"] = {"999999999": 5}
+    with open(path, "w") as f:
+        json.dump(state, f)
+    assert second.try_acquire()
+
+
+@pytest.fixture
+def adaptive(test_app, monkeypatch):
+    monkeypatch.setitem(test_app.config, "HUBSPOT_ADAPTIVE_CONCURRENCY", "process")
+    monkeypatch.setitem(test_app.config, "HUBSPOT_ADAPTIVE_INITIAL", 8)
+    with test_app.app_context():
+        yield get_concurrency_limiter()
+    monkeypatch.undo()
+    with test_app.app_context():
+        assert get_concurrency_limiter() is None
+
+
+def test_async_slot_keeps_file_io_off_the_event_loop(tmp_path):
+    """
+    With shared state every poll and release touches the file, so they run
+    in worker threads rather than on the loop's thread.
+    """
+    state = FileState(str(tmp_path / "limit.json"), 1)
+    limiter = AdaptiveConcurrencyLimiter(state)
+    update_threads = []
+    update = state.update
+
+    def recording_update(func):
+        update_threads.append(threading.get_ident())
+        return update(func)
+
+    state.update = recording_update
+
+    async def two_calls():
+        async def call():
+            async with async_concurrency_slot(limiter) as slot:
+                await asyncio.sleep(0.02)
+                slot.status = 200
+
+        await asyncio.gather(call(), call())
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(two_calls())
+
+    assert len(update_threads) > 4  # the second call polled while waiting
+    assert loop_thread not in update_threads
+    assert json.loads((tmp_path / "limit.json").read_text())["in_flight"] == {}
+
+
+def test_429_cuts_limit_of_hubspot_calls(test_app, adaptive):
+    server = StandinServer(StandinConfig(rate_limit=1, rate_window=1.0)).start()
+    url = f"{server.base_url}/crm/v3/objects/contacts/search"
+    cuts = REGISTRY.get_sample_value(
+        "hubspot_concurrency_decreases_total", {"reason": "429"}
+    )
+    try:
+        requests.post(url, json={}, timeout=5)
+        with test_app.app_context():
+            request_with_tenacity("POST", url, json={}, timeout=5)
+    finally:
+        server.stop()
+
+    assert adaptive.limit == pytest.approx(4 + 1 / 4)
+    assert REGISTRY.get_sample_value("hubspot_concurrency_limit") == adaptive.limit
+    assert REGISTRY.get_sample_value("hubspot_in_flight_calls") == 0
+    assert (
+        REGISTRY.get_sample_value(
+            "hubspot_concurrency_decreases_total", {"reason": "429"}
+        )
+        == (cuts or 0) + 1
+    )
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from app.services.hubspot_service import HubSpotService
+from app.utils.change_feed import current_generation, wait_for_change
+
+
+@pytest.mark.usefixtures("test_app", "db_session")
+class TestChangeFeed:
+    def test_listener_wakes_on_committed_write(self, test_app):
+        """
+        A write committed from another thread wakes a waiter through
+        LISTEN/NOTIFY well before the wait times out.
+        """
+        # Let the listener connect (it wakes waiters once on connect).
+        wait_for_change(current_generation(), 2)
+        generation = current_generation()
+
+        def write():
+            time.sleep(0.2)
+            with test_app.app_context():
+                HubSpotService()._store_created_crm_object(
+                    "FEED_T1", "tickets", "Feed ticket"
+                )
+
+        writer = threading.Thread(target=write)
+        started = time.monotonic()
+        writer.start()
+        assert wait_for_change(generation, 10) is True
+        writer.join()
+        assert time.monotonic() - started < 5
+
+    def test_wait_times_out_without_writes(self):
+        wait_for_change(current_generation(), 2)
+        assert wait_for_change(current_generation(), 0.2) is False
+
+    def test_long_poll_returns_rows_after_cursor(self, test_app, test_client):
+        service = HubSpotService()
+        service._store_created_crm_object("FEED_D1", "deals", "Feed deal")
+
+        resp = test_client.get("/api/new-crm-objects/changes?objectType=deals")
+        data = resp.get_json()["data"]
+        assert resp.status_code == 200
+        assert data["results"][-1]["external_id"] == "FEED_D1"
+        cursor = data["cursor"]
+
+        started = time.monotonic()
+        resp = test_client.get(
+            f"/api/new-crm-objects/changes?objectType=deals&after={cursor}&wait=0.3"
+        )
+        data = resp.get_json()["data"]
+        assert data["results"] == []
+        assert data["cursor"] == cursor
+        assert time.monotonic() - started >= 0.25
+
+    def test_sse_stream_emits_events(self, test_app, test_client):
+        HubSpotService()._store_created_crm_object("FEED_T2", "tickets", "SSE ticket")
+        original = test_app.config["CRM_CHANGE_FEED_STREAM_SECONDS"]
+        test_app.config["CRM_CHANGE_FEED_STREAM_SECONDS"] = 0.3
+        try:
+            resp = test_client.get("/api/new-crm-objects/stream?objectType=tickets")
+            body = resp.get_data(as_text=True)
+        finally:
+            test_app.config["CRM_CHANGE_FEED_STREAM_SECONDS"] = original
+
+        assert resp.mimetype == "text/event-stream"
+        assert "event: crm_object" in body
+        assert '"external_id": "FEED_T2"' in body
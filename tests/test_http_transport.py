@@ -0,0 +1,105 @@
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app.utils.http_transport import get_transport, transport_stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.dumps({"echo": json.loads(self.rfile.read(length) or b"{}")})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def use_transport(test_app, monkeypatch):
+    def use(name, pool_size=4):
+        monkeypatch.setitem(test_app.config, "HUBSPOT_HTTP_TRANSPORT", name)
+        monkeypatch.setitem(test_app.config, "HUBSPOT_HTTP_POOL_SIZE", pool_size)
+        return get_transport()
+
+    yield use
+    test_app.config["HUBSPOT_HTTP_TRANSPORT"] = "http1"
+    get_transport()
+
+
+def _post_many(transport, url, count=20):
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        return list(
+            pool.map(
+                lambda i: transport.request("POST", url, json={"i": i}, timeout=5),
+                range(count),
+            )
+        )
+
+
+def test_plain_transport_opens_a_connection_per_call(use_transport, server_url):
+    transport = use_transport("http1")
+    responses = _post_many(transport, server_url)
+
+    assert [r.json()["echo"]["i"] for r in responses] == list(range(20))
+    stats = transport_stats()
+    assert stats["transport"] == "http1"
+    assert stats["connections_opened"] == stats["requests"] == 20
+
+
+def test_pooled_transport_reuses_connections(use_transport, server_url):
+    transport = use_transport("http1-pooled", pool_size=4)
+    responses = _post_many(transport, server_url)
+
+    assert all(r.status_code == 200 for r in responses)
+    stats = transport_stats()
+    assert stats["requests"] == 20
+    assert stats["connections_opened"] <= 4
+    assert stats["max_in_flight"] <= 4
+
+
+def test_http2_transport_returns_requests_responses(use_transport, server_url):
+    """
+    A plain-HTTP server cannot negotiate HTTP/2, so httpx falls back to
+    HTTP/1.1; the response and error types must still be the requests ones.
+    """
+    pytest.importorskip("h2")
+    transport = use_transport("http2")
+    responses = _post_many(transport, server_url)
+
+    assert all(isinstance(r, requests.Response) for r in responses)
+    assert responses[3].json() == {"echo": {"i": 3}}
+    stats = transport_stats()
+    assert stats["transport"] == "http2"
+    assert stats["http_versions"] == {"HTTP/1.1": 20}
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_port = sock.getsockname()[1]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.request("GET", f"http://127.0.0.1:{closed_port}/", timeout=2)
+
+
+def test_unknown_transport_is_rejected(use_transport):
+    with pytest.raises(ValueError):
+        use_transport("http3")
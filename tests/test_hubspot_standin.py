@@ -0,0 +1,133 @@
+import random
+import time
+
+import pytest
+import requests
+
+from app.integrations.hubspot_api import HubSpotAPI
+from app.utils.rate_limit_handler import request_with_tenacity
+from benchmarks.hubspot_standin import LatencyModel, StandinConfig, StandinServer
+
+
+@pytest.fixture
+def standin(test_app, monkeypatch):
+    servers = []
+
+    def start(**config):
+        server = StandinServer(StandinConfig(**config)).start()
+        servers.append(server)
+        monkeypatch.setitem(test_app.config, "HUBSPOT_API_BASE_URL", server.base_url)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def _stats(server):
+    return requests.get(f"{server.base_url}/__standin/stats", timeout=5).json()
+
+
+def test_crud_search_and_associations(test_app, standin):
+    server = standin(seed_objects=3)
+    with test_app.app_context():
+        api = HubSpotAPI("token")
+        contact = api.create_contact({"email": "Standin@Example.com"})
+        assert api.find_contact_by_email("standin@example.com")["id"] == contact["id"]
+
+        updated = api.update_contact(contact["id"], {"firstname": "Stan"})
+        assert updated["properties"]["firstname"] == "Stan"
+        assert updated["updatedAt"] > contact["updatedAt"]
+
+        deal = api.create_deal({"dealname": "Standin deal"})
+        assert api.associate_contact_and_deal(contact["id"], deal["id"])
+
+        page = api.search_objects(
+            "contacts",
+            [{"filters": [{"propertyName": "email", "operator": "HAS_PROPERTY"}]}],
+            ["email"],
+            sorts=[{"propertyName": "createdate", "direction": "DESCENDING"}],
+            limit=2,
+        )
+        assert page["total"] == 4
+        assert page["results"][0]["id"] == contact["id"]
+        assert page["paging"]["next"]["after"] == "2"
+
+    stats = _stats(server)
+    assert stats["objects"] == {"contacts": 4, "deals": 4, "tickets": 3}
+    assert stats["associations"] == 1
+    assert stats["counters"]["POST /crm/v3/objects/contacts/search"] == 2
+
+
+def test_batch_endpoints(test_app, standin):
+    standin()
+    with test_app.app_context():
+        api = HubSpotAPI("token")
+        created = api.batch_create(
+            "tickets", [{"properties": {"subject": f"T{i}"}} for i in range(3)]
+        )
+        ids = [r["id"] for r in created["results"]]
+
+        read = api.batch_read("tickets", ids + ["999999"], ["subject"])
+        assert [r["properties"]["subject"] for r in read["results"]] == [
+            "T0",
+            "T1",
+            "T2",
+        ]
+        assert read["errors"][0]["context"]["ids"] == ["999999"]
+
+        upserted = api.batch_upsert(
+            "contacts",
+            [
+                {"idProperty": "email", "id": "a@example.com", "properties": {}},
+                {"idProperty": "email", "id": "a@example.com", "properties": {}},
+            ],
+        )
+        assert [r["new"] for r in upserted["results"]] == [True, False]
+
+
+def test_rate_limit_headers_and_retry(test_app, standin):
+    server = standin(rate_limit=2, rate_window=1.0)
+    url = f"{server.base_url}/crm/v3/objects/contacts"
+    headers = {"Authorization": "Bearer t"}
+
+    first = requests.get(url, headers=headers, timeout=5)
+    assert first.headers["X-HubSpot-RateLimit-Max"] == "2"
+    assert first.headers["X-HubSpot-RateLimit-Remaining"] == "1"
+    requests.get(url, headers=headers, timeout=5)
+
+    with test_app.app_context():
+        started = time.monotonic()
+        resp = request_with_tenacity("GET", url, headers=headers, timeout=5)
+    assert resp.status_code == 200
+    assert time.monotonic() - started >= 1
+    assert _stats(server)["counters"]["rate_limited_429"] == 1
+
+
+def test_fault_injection_and_reset(standin):
+    server = standin(error_rate_5xx=1.0, seed=3)
+    resp = requests.get(f"{server.base_url}/crm/v3/objects/deals", timeout=5)
+    assert resp.status_code in (500, 502, 503, 504)
+
+    requests.post(f"{server.base_url}/__standin/reset", timeout=5)
+    assert "requests" not in _stats(server)["counters"]
+
+
+def test_token_refresh(standin):
+    server = standin(token_ttl=60)
+    resp = requests.post(
+        f"{server.base_url}/oauth/v1/token",
+        data={"grant_type": "refresh_token", "refresh_token": "r"},
+        timeout=5,
+    )
+    assert resp.json()["expires_in"] == 60
+    assert _stats(server)["counters"]["token_refreshes"] == 1
+
+
+def test_latency_model_is_seeded():
+    model = LatencyModel("lognormal:40:0.5")
+    first = [model.sample(random.Random(7)) for _ in range(3)]
+    assert first == [model.sample(random.Random(7)) for _ in range(3)]
+    assert LatencyModel("fixed:25").sample(random.Random()) == 0.025
+    with pytest.raises(ValueError):
+        LatencyModel("gamma:1")
@@ -0,0 +1,73 @@
+import io
+import json
+import logging
+import time
+
+from app.utils.errors import BadRequestError
+from app.utils.logging_config import RepeatSampler, _formatter, _QueueHandler
+
+
+def _record(msg="Got 429 from HubSpot: Rate limited.", level=logging.WARNING):
+    return logging.LogRecord("app.test", level, __file__, 1, msg, None, None)
+
+
+def test_sampler_lets_burst_through_then_reports_suppressed():
+    sampler = RepeatSampler(burst=2, window=0.05)
+    passed = [sampler.filter(_record()) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert sampler.filter(_record("another message"))
+
+    time.sleep(0.06)
+    record = _record()
+    assert sampler.filter(record)
+    assert record.suppressed == 3
+
+
+def test_sampler_never_drops_errors():
+    sampler = RepeatSampler(burst=1, window=60)
+    assert all(sampler.filter(_record(level=logging.ERROR)) for _ in range(3))
+
+
+def test_sampler_never_drops_info_or_debug():
+    sampler = RepeatSampler(burst=1, window=60)
+    for level in (logging.INFO, logging.DEBUG):
+        records = [_record("Request cost", level=level) for _ in range(5)]
+        assert all(sampler.filter(record) for record in records)
+        assert not any(hasattr(record, "suppressed") for record in records)
+
+
+def test_queue_record_formats_as_json_with_extras():
+    handler = _QueueHandler(None)
+    logger = logging.getLogger("app.test")
+    try:
+        raise ValueError("boom")
+    except ValueError as e:
+        record = logger.makeRecord(
+            "app.test",
+            logging.ERROR,
+            __file__,
+            1,
+            "Failed %s",
+            ("sync",),
+            (type(e), e, e.__traceback__),
+            extra={"endpoint": "hubspot.sync"},
+        )
+    prepared = handler.prepare(record)
+
+    line = json.loads(_formatter("json").format(prepared))
+    assert line["message"] == "Failed sync"
+    assert line["level"] == "ERROR"
+    assert line["endpoint"] == "hubspot.sync"
+    assert "ValueError: boom" in line["exc_info"]
+
+
+def test_base_error_does_not_log_on_construction():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    root = logging.getLogger()
+    root.addHandler(handler)
+    try:
+        BadRequestError(message="bad input")
+    finally:
+        root.removeHandler(handler)
+    assert stream.getvalue() == ""
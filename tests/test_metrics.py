@@ -0,0 +1,88 @@
+import pytest
+import requests
+from prometheus_client import REGISTRY
+
+from app.utils.metrics import endpoint_family, time_token_refresh
+from app.utils.rate_limit_handler import request_with_tenacity
+from benchmarks.hubspot_standin import StandinConfig, StandinServer
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.parametrize(
+    "url,family",
+    [
+        ("https://api.hubapi.com/crm/v3/objects/contacts/search", "contacts.search"),
+        ("https://api.hubapi.com/crm/v3/objects/deals/123", "deals.object"),
+        ("https://api.hubapi.com/crm/v3/objects/tickets", "tickets"),
+        ("https://api.hubapi.com/crm/v3/objects/deals/batch/read", "deals.batch_read"),
+        (
+            "https://api.hubapi.com/crm/v3/associations/Deals/Contacts/batch/create",
+            "associations",
+        ),
+        ("https://api.hubapi.com/oauth/v1/token", "oauth"),
+    ],
+)
+def test_endpoint_family(url, family):
+    assert endpoint_family(url) == family
+
+
+def test_request_and_db_metrics(test_client, db_session):
+    labels = {
+        "method": "GET",
+        "endpoint": "hubspot.get_new_crm_objects",
+        "status": "200",
+    }
+    before = _sample("http_request_duration_seconds_count", **labels)
+    queries = _sample(
+        "db_query_duration_seconds_count", endpoint="hubspot.get_new_crm_objects"
+    )
+
+    assert test_client.get("/api/new-crm-objects?objectType=deals").status_code == 200
+    resp = test_client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"].startswith("text/plain")
+    assert b"http_request_duration_seconds_bucket" in resp.data
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 1
+    assert (
+        _sample(
+            "db_query_duration_seconds_count", endpoint="hubspot.get_new_crm_objects"
+        )
+        > queries
+    )
+
+
+def test_hubspot_call_retry_and_429_metrics(test_app):
+    server = StandinServer(StandinConfig(rate_limit=1, rate_window=1.0)).start()
+    url = f"{server.base_url}/crm/v3/objects/contacts/search"
+    calls = {"family": "contacts.search", "method": "POST"}
+    before_ok = _sample("hubspot_request_duration_seconds_count", status="200", **calls)
+    before_429 = _sample("hubspot_rate_limited_total", family="contacts.search")
+    before_retries = _sample("hubspot_retries_total", reason="429")
+    try:
+        requests.post(url, json={}, timeout=5)
+        with test_app.app_context():
+            request_with_tenacity("POST", url, json={}, timeout=5)
+    finally:
+        server.stop()
+
+    assert (
+        _sample("hubspot_request_duration_seconds_count", status="200", **calls)
+        == before_ok + 1
+    )
+    assert _sample("hubspot_rate_limited_total", family="contacts.search") == (
+        before_429 + 1
+    )
+    assert _sample("hubspot_retries_total", reason="429") == before_retries + 1
+
+
+def test_token_refresh_metrics():
+    before = _sample("hubspot_token_refreshes_total", outcome="failure")
+    with pytest.raises(RuntimeError):
+        with time_token_refresh():
+            raise RuntimeError("refresh failed")
+    assert _sample("hubspot_token_refreshes_total", outcome="failure") == before + 1
+    assert _sample("hubspot_token_refresh_duration_seconds_count") >= 1
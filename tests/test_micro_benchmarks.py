@@ -0,0 +1,18 @@
+import json
+
+from benchmarks.micro import main, measure
+
+
+def test_measure_reports_time_and_peak_allocations():
+    result = measure("alloc", lambda: bytearray(256 * 1024), number=3, repeat=2)
+    assert result["calls"] == 6
+    assert 0 < result["best_us"] <= result["median_us"]
+    assert result["peak_kib"] >= 256
+
+
+def test_runs_schema_and_request_benchmarks(capsys):
+    assert main(["--skip-db", "--items", "10", "--repeat", "1", "--json"]) == 0
+    names = [r["name"] for r in json.loads(capsys.readouterr().out)]
+    assert "schema.Contact.many" in names
+    assert "request_with_tenacity.rate_limited" in names
+    assert not any(name.startswith("get_new_objects_from_db") for name in names)
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+ADMIN = {"Authorization": "Bearer admin-secret"}
+
+
+@pytest.fixture
+def profiling(test_app, tmp_path, monkeypatch):
+    monkeypatch.setitem(test_app.config, "ADMIN_API_TOKEN", "admin-secret")
+    monkeypatch.setitem(test_app.config, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_admin_endpoints_need_token(test_client, db_session, profiling):
+    assert test_client.get("/api/admin/profiles").status_code == 401
+    resp = test_client.get(
+        "/api/admin/profiles", headers={"Authorization": "Bearer wrong"}
+    )
+    assert resp.status_code == 401
+    assert test_client.get("/api/admin/profiles", headers=ADMIN).status_code == 200
+
+
+def test_profile_header_ignored_without_admin(test_client, db_session, profiling):
+    resp = test_client.get(
+        "/api/new-crm-objects?objectType=deals", headers={"X-Profile": "1"}
+    )
+    assert resp.status_code == 200
+    assert "X-Profile-Id" not in resp.headers
+    assert not list(profiling.iterdir())
+
+
+def test_admin_header_profiles_request(test_client, db_session, profiling):
+    pytest.importorskip("pyinstrument")
+    resp = test_client.get(
+        "/api/new-crm-objects?objectType=deals",
+        headers={**ADMIN, "X-Profile": "1", "X-Request-ID": "req-123"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["X-Profile-Id"] == "req-123"
+
+    listing = test_client.get("/api/admin/profiles", headers=ADMIN).get_json()
+    (profile,) = listing["data"]
+    assert profile["request_id"] == "req-123"
+    assert profile["path"] == "/api/new-crm-objects"
+    assert profile["status"] == 200
+    assert profile["trigger"] == "header"
+
+    resp = test_client.get("/api/admin/profiles/req-123", headers=ADMIN)
+    assert resp.status_code == 200
+    assert "speedscope" in json.loads(resp.data)["$schema"]
+    resp = test_client.get("/api/admin/profiles/missing", headers=ADMIN)
+    assert resp.status_code == 404
+
+
+def test_sampled_profiles_are_pruned(test_app, test_client, db_session, profiling):
+    pytest.importorskip("pyinstrument")
+    test_app.config["PROFILING_SAMPLE_RATE"] = 1.0
+    test_app.config["PROFILE_KEEP"] = 2
+    try:
+        ids = [
+            test_client.get("/api/new-crm-objects?objectType=deals").headers[
+                "X-Profile-Id"
+            ]
+            for _ in range(3)
+        ]
+    finally:
+        test_app.config["PROFILING_SAMPLE_RATE"] = 0.0
+        test_app.config["PROFILE_KEEP"] = 50
+
+    listing = test_client.get("/api/admin/profiles", headers=ADMIN).get_json()
+    assert {p["request_id"] for p in listing["data"]} <= set(ids[1:])
+    assert len(listing["data"]) == 2
+    assert all(p["trigger"] == "sampled" for p in listing["data"])
@@ -0,0 +1,102 @@
+import logging
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.utils.query_watch import repeated_statements, statement_shape
+from app.utils.request_stats import RequestStats
+
+ENDPOINT = "hubspot.get_new_crm_objects"
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def watch_log():
+    handler = _Records()
+    logger = logging.getLogger("app.utils.query_watch")
+    # alembic's fileConfig (run by the test_app fixture) disables it
+    disabled, logger.disabled = logger.disabled, False
+    logger.addHandler(handler)
+    yield handler.records
+    logger.removeHandler(handler)
+    logger.disabled = disabled
+
+
+def _sample(name):
+    return REGISTRY.get_sample_value(name, {"endpoint": ENDPOINT}) or 0.0
+
+
+@pytest.mark.parametrize(
+    "first,second",
+    [
+        (
+            "SELECT * FROM t WHERE id = %(id_1)s LIMIT 20",
+            "SELECT *\n  FROM t WHERE id = %(id_1)s LIMIT 50",
+        ),
+        (
+            "SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)",
+            "SELECT * FROM t WHERE id IN (%(id_1_1)s)",
+        ),
+        ("SELECT * FROM t WHERE name = 'a'", "SELECT * FROM t WHERE name = 'it''s'"),
+    ],
+)
+def test_statement_shape_ignores_values(first, second):
+    assert statement_shape(first) == statement_shape(second)
+
+
+def test_statement_shape_keeps_identifiers():
+    assert statement_shape("SELECT * FROM crm_objects_2024_01") == (
+        "SELECT * FROM crm_objects_2024_01"
+    )
+
+
+def test_repeated_statements():
+    stats = RequestStats()
+    for _ in range(3):
+        stats.count_shape("SELECT a")
+    stats.count_shape("SELECT b")
+    assert repeated_statements(stats, 3) == [("SELECT a", 3)]
+    assert repeated_statements(stats, 0) == []
+
+
+def test_slow_query_logged_with_plan(
+    test_app, test_client, db_session, watch_log, monkeypatch
+):
+    monkeypatch.setitem(test_app.config, "SLOW_QUERY_MS", 0.0001)
+    before = _sample("db_slow_queries_total")
+
+    resp = test_client.get("/api/new-crm-objects?objectType=deals")
+
+    assert resp.status_code == 200
+    assert "db.slow;" in resp.headers["Server-Timing"]
+    slow = [r for r in watch_log if r.getMessage().startswith("Slow query")]
+    assert slow
+    assert any("Scan" in r.plan or "Result" in r.plan for r in slow)
+    assert _sample("db_slow_queries_total") >= before + len(slow)
+
+
+def test_repeated_statements_flagged(
+    test_app, test_client, db_session, watch_log, monkeypatch
+):
+    monkeypatch.setitem(test_app.config, "N_PLUS_ONE_THRESHOLD", 1)
+    before = _sample("db_repeated_statements_total")
+
+    assert test_client.get("/api/new-crm-objects?objectType=deals").status_code == 200
+
+    flagged = [r for r in watch_log if r.getMessage().startswith("Possible N+1")]
+    assert flagged
+    assert all(r.endpoint == ENDPOINT for r in flagged)
+    assert _sample("db_repeated_statements_total") == before + len(flagged)
+
+
+def test_quiet_by_default(test_client, db_session, watch_log):
+    assert test_client.get("/api/new-crm-objects?objectType=deals").status_code == 200
+    assert not watch_log
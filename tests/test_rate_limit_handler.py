@@ -4,7 +4,11 @@ import requests
 from requests import Response
 from tenacity import RetryError
 
-from app.utils.rate_limit_handler import request_with_tenacity
+from app.utils.rate_limit_handler import (
+    TokenBucket,
+    get_rate_limiter,
+    request_with_tenacity,
+)
 from app.utils.errors import RateLimitExceededError, ServiceUnavailableError
 
 
@@ -118,3 +122,29 @@ def test_500_persistent_final_raises_httperror(mock_request):
 
     assert "500 Server Error" in str(exc.value)
     assert mock_request.call_count == 5
+
+
+def test_token_bucket_spends_burst_then_spaces_requests():
+    """
+    The first `burst` reservations are free; each further one waits 1/rate
+    longer than the previous.
+    """
+    bucket = TokenBucket(rate=10, burst=2)
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.02)
+    assert delays[3] == pytest.approx(0.2, abs=0.02)
+
+
+@patch("app.utils.rate_limit_handler.requests.request")
+def test_request_takes_token_from_shared_limiter(mock_request, test_app, monkeypatch):
+    monkeypatch.setitem(test_app.config, "HUBSPOT_RATE_LIMIT_PER_SECOND", 1000)
+    monkeypatch.setitem(test_app.config, "HUBSPOT_RATE_LIMIT_BURST", 7)
+    mock_request.return_value = _mock_response(200)
+
+    limiter = get_rate_limiter()
+    with patch.object(limiter, "acquire") as mock_acquire:
+        request_with_tenacity("GET", "https://example.com")
+
+    assert limiter.burst == 7
+    mock_acquire.assert_called_once()
@@ -0,0 +1,140 @@
+import logging
+
+import pytest
+
+from app.models import CreatedCRMObject, CRMObjectCount
+from app.services.oauth_service import HubspotOAuthService
+from benchmarks.endpoints import compare, percentile
+from benchmarks.hubspot_standin import StandinServer
+
+
+@pytest.fixture
+def standin(test_app, monkeypatch):
+    server = StandinServer().start()
+    monkeypatch.setitem(test_app.config, "HUBSPOT_API_BASE_URL", server.base_url)
+    monkeypatch.setitem(test_app.config, "HUBSPOT_RATE_LIMIT_PER_SECOND", 0)
+    monkeypatch.setattr(HubspotOAuthService, "get_access_token", lambda self: "t")
+    yield server
+    server.stop()
+
+
+def _untrack(db_session, object_type, external_id):
+    rows = CreatedCRMObject.query.filter_by(
+        object_type=object_type, external_id=external_id
+    ).all()
+    for row in rows:
+        db_session.delete(row)
+    CRMObjectCount.adjust(object_type, -len(rows))
+    db_session.commit()
+
+
+def test_headers_are_off_by_default(test_client, db_session):
+    resp = test_client.get("/api/new-crm-objects?objectType=deals")
+    assert "X-DB-Queries" not in resp.headers
+    assert "X-HubSpot-Calls" not in resp.headers
+
+
+def test_counts_hubspot_calls_and_queries(
+    test_app, test_client, db_session, standin, monkeypatch
+):
+    monkeypatch.setitem(test_app.config, "REQUEST_STATS_HEADERS", True)
+    resp = test_client.post(
+        "/api/contacts",
+        json={
+            "email": "stats@example.com",
+            "firstname": "Stats",
+            "lastname": "User",
+            "phone": "+1-555-0000",
+        },
+    )
+    assert resp.status_code == 200
+    # A search that finds nothing, then the create.
+    assert resp.headers["X-HubSpot-Calls"] == "2"
+    assert int(resp.headers["X-DB-Queries"]) > 0
+    _untrack(db_session, "contacts", resp.get_json()["data"]["contact"]["id"])
+
+
+def test_counts_work_on_bulk_worker_threads(
+    test_app, test_client, db_session, standin, monkeypatch
+):
+    monkeypatch.setitem(test_app.config, "REQUEST_STATS_HEADERS", True)
+    monkeypatch.setitem(test_app.config, "HUBSPOT_BULK_CONCURRENCY", 3)
+    deals = [
+        {"dealname": f"Stats deal {i}", "amount": 1, "dealstage": "closedwon"}
+        for i in range(3)
+    ]
+    resp = test_client.post("/api/deals/bulk", json={"deals": deals})
+    assert resp.status_code == 200
+    assert resp.headers["X-HubSpot-Calls"] == "6"
+    for deal in resp.get_json()["data"]["deals"]:
+        _untrack(db_session, "deals", deal["id"])
+
+
+def test_compare_flags_regressions():
+    baseline = {
+        "scenarios": {
+            "contacts": {
+                "p95_ms": 100.0,
+                "requests_per_second": 50.0,
+                "hubspot_calls": 2.0,
+            }
+        }
+    }
+    current = {
+        "scenarios": {
+            "contacts": {
+                "p95_ms": 105.0,
+                "requests_per_second": 40.0,
+                "hubspot_calls": 3.0,
+            }
+        }
+    }
+    assert compare(baseline, current, 0.10) == [
+        "contacts: hubspot_calls 2.0 -> 3.0",
+        "contacts: requests_per_second 50.0 -> 40.0",
+    ]
+    assert compare(baseline, baseline, 0.10) == []
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile([1, 2, 3, 4], 99) == 4
+
+
+def test_server_timing_and_cost_log(test_app, test_client, db_session, standin):
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    test_app.logger.addHandler(handler)
+    test_app.logger.setLevel(logging.INFO)
+    try:
+        resp = test_client.post(
+            "/api/deals",
+            json={"dealname": "Timed deal", "amount": 5, "dealstage": "closedwon"},
+        )
+    finally:
+        test_app.logger.removeHandler(handler)
+        test_app.logger.setLevel(logging.NOTSET)
+
+    assert resp.status_code == 200
+    timing = dict(
+        entry.split(";", 1) for entry in resp.headers["Server-Timing"].split(", ")
+    )
+    for name in ("validate", "token", "hubspot.deals.search", "hubspot.deals"):
+        assert timing[name].startswith("dur=")
+    assert timing["store"].startswith("dur=")
+    assert "desc=" in timing["db"]
+    assert "total" in timing
+
+    cost = [r for r in records if getattr(r, "http_path", None) == "/api/deals"]
+    assert len(cost) == 1
+    assert cost[0].hubspot_calls == 2
+    assert cost[0].hubspot_retries == 0
+    assert cost[0].db_queries > 0
+    assert set(cost[0].spans_ms) >= {"validate", "store", "hubspot.deals"}
+    _untrack(db_session, "deals", resp.get_json()["data"]["deal"]["id"])
+
+
+def test_server_timing_can_be_turned_off(
+    test_app, test_client, db_session, monkeypatch
+):
+    monkeypatch.setitem(test_app.config, "SERVER_TIMING_HEADER", False)
+    resp = test_client.get("/api/new-crm-objects?objectType=deals")
+    assert "Server-Timing" not in resp.headers
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+import requests
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+from app.utils import tracing  # noqa: E402
+from app.utils.rate_limit_handler import request_with_tenacity  # noqa: E402
+from benchmarks.hubspot_standin import StandinConfig, StandinServer  # noqa: E402
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def spans():
+    exporter = InMemorySpanExporter()
+    tracing.configure_tracing(exporter)
+
+    def finished():
+        tracing.force_flush()
+        return exporter.get_finished_spans()
+
+    yield finished
+    tracing.configure_tracing(None)
+
+
+def test_request_continues_caller_trace(test_client, db_session, spans):
+    resp = test_client.get(
+        "/api/new-crm-objects?objectType=deals", headers={"traceparent": TRACEPARENT}
+    )
+    assert resp.status_code == 200
+
+    finished = spans()
+    server = next(s for s in finished if s.name == "GET /api/new-crm-objects")
+    assert format(server.context.trace_id, "032x") == TRACE_ID
+    assert format(server.parent.span_id, "016x") == "00f067aa0ba902b7"
+    assert server.attributes["http.response.status_code"] == 200
+
+    queries = [s for s in finished if s.attributes.get("db.system") == "postgresql"]
+    assert queries
+    assert all(q.parent.span_id == server.context.span_id for q in queries)
+    assert any(q.name == "SELECT" for q in queries)
+
+
+def test_hubspot_attempts_are_traced(test_app, spans):
+    server = StandinServer(StandinConfig(rate_limit=1, rate_window=1.0)).start()
+    url = f"{server.base_url}/crm/v3/objects/contacts/search"
+    try:
+        requests.post(url, json={}, timeout=5)
+        with test_app.app_context():
+            request_with_tenacity("POST", url, json={}, timeout=5)
+    finally:
+        server.stop()
+
+    attempts = [s for s in spans() if s.name == "HubSpot contacts.search"]
+    assert [a.attributes["hubspot.attempt"] for a in attempts] == [1, 2]
+    assert [a.attributes["http.response.status_code"] for a in attempts] == [429, 200]
+    assert attempts[0].attributes["hubspot.backoff_slept_seconds"] == 0
+    assert attempts[1].attributes["hubspot.backoff_slept_seconds"] >= 1
+
+
+def test_sampling_keeps_caller_decision(test_client, db_session):
+    exporter = InMemorySpanExporter()
+    tracing.configure_tracing(exporter, sample_ratio=0.0)
+    try:
+        test_client.get("/api/new-crm-objects?objectType=deals")
+        tracing.force_flush()
+        assert not exporter.get_finished_spans()
+
+        test_client.get(
+            "/api/new-crm-objects?objectType=deals",
+            headers={"traceparent": TRACEPARENT},
+        )
+        tracing.force_flush()
+        assert exporter.get_finished_spans()
+    finally:
+        tracing.configure_tracing(None)
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = tracing._exporter_from_config(
+        {"TRACING_EXPORTER": "file", "TRACING_FILE": str(path)}
+    )
+    tracing.configure_tracing(exporter)
+    try:
+        with tracing.span("work", attributes={"items": 3}):
+            pass
+    finally:
+        tracing.configure_tracing(None)
+
+    (line,) = path.read_text().splitlines()
+    assert json.loads(line)["name"] == "work"
+    assert json.loads(line)["attributes"] == {"items": 3}